@@ -84,10 +84,66 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        "OPTIONS": {
+            # take the write lock when a transaction begins, so concurrent
+            # writers wait for it instead of failing with "database is locked"
+            "transaction_mode": "IMMEDIATE",
+            "timeout": 20,
+            # commits skip a sync, safe with the WAL journal set by migration 0018
+            "init_command": "PRAGMA synchronous=NORMAL;",
+        },
     }
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "howareyou",
+    },
+    # results of resource url checks, evicting the least recently used
+    # result once full (a CULL_FREQUENCY of MAX_ENTRIES culls one entry)
+    "url_checks": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "howareyou-url-checks",
+        "OPTIONS": {"MAX_ENTRIES": 10_000, "CULL_FREQUENCY": 10_000},
+    },
+}
+
+# Seconds a computed statistics payload is kept for its generation
+STATISTICS_CACHE_TIMEOUT = 60 * 60
+
+# Seconds resources recommended to students are kept in memory
+# before being reloaded (resources created in-process reload immediately)
+RESOURCE_POOL_TTL = 5 * 60
+
+# Seconds allowed to check a resource url is reachable,
+# and number of urls checked at once
+URL_CHECK_TIMEOUT = 2.5
+URL_CHECK_WORKERS = 8
+
+# Seconds a resource url check result is cached,
+# unreachable urls are re-checked sooner
+URL_CHECK_CACHE_TIMEOUT = 24 * 60 * 60
+URL_CHECK_NEGATIVE_CACHE_TIMEOUT = 5 * 60
+
+# Resources created in-process are verified in batches of up to this size,
+# waiting at most this many seconds for a batch to fill
+RESOURCE_VERIFICATION_BATCH_SIZE = 50
+RESOURCE_VERIFICATION_LINGER = 0.5
+
+# Maximum number of submissions accepted by POST /api/v1/students/bulk
+STUDENT_BULK_MAX_ITEMS = 10_000
+
+# Maximum number of resources accepted by POST /api/v1/resources/bulk,
+# and number of resources checked and inserted at once by bulk imports
+RESOURCE_BULK_MAX_ITEMS = 10_000
+RESOURCE_IMPORT_CHUNK_SIZE = 500
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
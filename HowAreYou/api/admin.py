@@ -9,7 +9,8 @@ class StudentResponseInline(admin.StackedInline):
 
     model = StudentResponse
     extra = 0
-    exclude = ["score"]
+    # age and gender are copied from the student on save
+    exclude = ["score", "gender", "age"]
 
 
 class StudentAdmin(admin.ModelAdmin):
@@ -23,6 +24,15 @@ class StudentAdmin(admin.ModelAdmin):
     ordering = ["age"]
     list_display = ["age", "gender"]
 
+    def get_readonly_fields(self, request, obj=None):
+        """
+        Age and gender of an existing student are copied into its responses
+        and statistics rollups, which edits would not update
+        """
+        if obj is None:
+            return super().get_readonly_fields(request, obj)
+        return ["age", "gender"]
+
 
 class ResourceAdmin(admin.ModelAdmin):
     """
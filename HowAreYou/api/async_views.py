@@ -0,0 +1,347 @@
+"""
+Async (ASGI) views of the API read endpoints and student creation.
+
+Handlers are coroutines using the async ORM and async cache, so under an
+ASGI server they do not hold a thread while waiting on the database.
+Parameters are validated and payloads built exactly as in `views.py`.
+"""
+
+import json
+from math import ceil
+from urllib.parse import urlencode
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponseNotModified, JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import serializers, status
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .cache import (
+    abump_statistics_generation,
+    aget_cached_statistics,
+    aget_statistics_generation,
+    etag_matches,
+    statistics_etag,
+)
+from .models import Resource, StudentResponse, StudentStatisticsRollup
+from .pagination import CreatedAtCursorPagination
+from .resource_pool import resource_pool
+from .serializers import (
+    CreateStudentRequestBodySerializer,
+    GetResourceParamSerializer,
+    GetStudentParamSerializer,
+    GetStudentResponseModelSerializer,
+    GetStudentStatisticsParamSerializer,
+    ResourceModelSerializer,
+)
+from .statistics import cohort_filters, format_statistics, statistics_rows
+from .views import (
+    CreateStudentView,
+    GetResourceView,
+    GetStudentStatisticsView,
+    GetStudentView,
+)
+
+
+def json_response(data, status: int = status.HTTP_200_OK, **kwargs) -> JsonResponse:
+    """
+    Render `data` with the encoder used by the REST framework views
+    """
+    return JsonResponse(data, status=status, encoder=JSONEncoder, safe=False, **kwargs)
+
+
+class AsyncGetResourceView(View):
+    """
+    Async view to get resources
+    """
+
+    validate_getResourcesParamHasOnlyType = (
+        GetResourceView.validate_getResourcesParamHasOnlyType
+    )
+    validate_getResourcesTypeParamHasOnlyOneValue = (
+        GetResourceView.validate_getResourcesTypeParamHasOnlyOneValue
+    )
+
+    async def get(self, request):
+        """
+        Return a list of all resources.
+        """
+        unaccepted_params, isOnlyTypeParamValidated = (
+            self.validate_getResourcesParamHasOnlyType(request.GET)
+        )
+
+        if not isOnlyTypeParamValidated:
+            return json_response(
+                {
+                    "error": f"You have passed in invalid parameter: ({', '.join(unaccepted_params)})"
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if not self.validate_getResourcesTypeParamHasOnlyOneValue(request.GET):
+            return json_response(
+                {
+                    "error": f"You have passed more than one acceptable values: ({', '.join(request.GET.getlist('type'))})"
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        resourceParamSerializer = GetResourceParamSerializer(data=request.GET)
+
+        if not resourceParamSerializer.is_valid():
+            return json_response(
+                resourceParamSerializer.errors, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        resources = Resource.objects.filter(status=Resource.VERIFIED).order_by(
+            "-created_at_utc"
+        )
+        if "type" in request.GET:
+            resources = resources.filter(type=request.GET["type"])
+
+        resources = [r async for r in resources]
+
+        return json_response(ResourceModelSerializer(resources, many=True).data)
+
+
+class AsyncGetStudentView(View):
+    """
+    Async view to get student and response
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    page_query_param = "page"
+
+    serialized_fields = GetStudentView.serialized_fields
+    validate_getStudentsAllowedParams = GetStudentView.validate_getStudentsAllowedParams
+    return_filtered_data = GetStudentView.return_filtered_data
+
+    async def paginate_by_page_number(self, queryset, request):
+        """
+        Return (results, next link, previous link) of the requested page,
+        or None if the page does not exist
+        """
+        try:
+            page = int(request.GET.get(self.page_query_param, 1))
+        except ValueError:
+            return None
+
+        count = await queryset.acount()
+        num_pages = max(ceil(count / self.page_size), 1)
+
+        if page < 1 or page > num_pages:
+            return None
+
+        offset = (page - 1) * self.page_size
+        results = [r async for r in queryset[offset : offset + self.page_size]]
+
+        url = request.build_absolute_uri()
+        next_link = (
+            replace_query_param(url, self.page_query_param, page + 1)
+            if page < num_pages
+            else None
+        )
+        if page == 1:
+            previous_link = None
+        elif page == 2:
+            previous_link = remove_query_param(url, self.page_query_param)
+        else:
+            previous_link = replace_query_param(url, self.page_query_param, page - 1)
+
+        return results, next_link, previous_link
+
+    async def get(self, request):
+        """
+        Get student and student response records.
+        Allowed optional parameters: [age_gte, age_lte, gender, page, cursor]
+        """
+        query_params = request.GET
+
+        isParamValid, unaccepted_params = self.validate_getStudentsAllowedParams(
+            query_params
+        )
+
+        if not isParamValid:
+            return json_response(
+                {
+                    "error": f"You have passed in invalid parameter: ({', '.join(unaccepted_params)})"
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if "page" in query_params and "cursor" in query_params:
+            return json_response(
+                {"error": "You have passed in both 'page' and 'cursor' parameter"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        getstudentParamSerializer = GetStudentParamSerializer(data=query_params)
+
+        if not getstudentParamSerializer.is_valid():
+            return json_response(
+                getstudentParamSerializer.errors, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        studentResponses = (
+            StudentResponse.objects.select_related("student")
+            .only(*self.serialized_fields)
+            .order_by("-created_at_utc", "-id")
+        )
+
+        if any(p in query_params for p in ["agelte", "agegte", "gender"]):
+            studentResponses = self.return_filtered_data(
+                getstudentParamSerializer.validated_data, studentResponses
+            )
+
+        if "cursor" in query_params:
+            paginator = CreatedAtCursorPagination()
+            try:
+                results = await paginator.apaginate_queryset(studentResponses, request)
+            except serializers.ValidationError as e:
+                return json_response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+            links = {
+                "next": paginator.get_next_link(),
+                "previous": paginator.get_previous_link(),
+            }
+        else:
+            page = await self.paginate_by_page_number(studentResponses, request)
+            if page is None:
+                return json_response(
+                    {"detail": "Invalid page."}, status=status.HTTP_404_NOT_FOUND
+                )
+            results, next_link, previous_link = page
+            links = {"next": next_link, "previous": previous_link}
+
+        return json_response(
+            {
+                "data": GetStudentResponseModelSerializer(results, many=True).data,
+                "links": links,
+            }
+        )
+
+
+class AsyncGetStudentStatisticsView(View):
+    """
+    Async view generating statistics of the range of depression among students.
+    Accept optional `gender`, `agegte`, `agelte`, `createdgte`, `createdlte` parameter
+    """
+
+    statistics_name = GetStudentStatisticsView.statistics_name
+    validate_getStudentStatisticsAllowedParams = (
+        GetStudentStatisticsView.validate_getStudentStatisticsAllowedParams
+    )
+
+    async def compute_statistics(self, validated_data: dict) -> dict:
+        """
+        Build statistics payload for the requested cohort,
+        as `GetStudentStatisticsView.compute_statistics()`
+        """
+        if "createdgte" in validated_data or "createdlte" in validated_data:
+            rows = statistics_rows(
+                StudentResponse.objects.filter(**cohort_filters(validated_data))
+            )
+        else:
+            rows = StudentStatisticsRollup.objects.filter(
+                count__gt=0, **cohort_filters(validated_data)
+            ).values_list("severity", "gender", "count")
+
+        return format_statistics([row async for row in rows])
+
+    async def get(self, request):
+        query_params = request.GET
+
+        isParamValid, unaccepted_params = (
+            self.validate_getStudentStatisticsAllowedParams(query_params)
+        )
+
+        if not isParamValid:
+            return json_response(
+                {
+                    "error": f"You have passed in invalid parameter: ({', '.join(unaccepted_params)})"
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        statisticsParamSerializer = GetStudentStatisticsParamSerializer(
+            data=query_params
+        )
+
+        if not statisticsParamSerializer.is_valid():
+            return json_response(
+                statisticsParamSerializer.errors, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        validated_data = statisticsParamSerializer.validated_data
+        cache_name = f"{self.statistics_name}?" + urlencode(
+            sorted((k, str(v)) for k, v in validated_data.items())
+        )
+
+        generation = await aget_statistics_generation()
+        etag = statistics_etag(self.statistics_name, generation)
+
+        if etag_matches(request, etag):
+            return HttpResponseNotModified(headers={"ETag": etag})
+
+        statistics_output = await aget_cached_statistics(
+            cache_name, generation, lambda: self.compute_statistics(validated_data)
+        )
+
+        return json_response(statistics_output, headers={"ETag": etag})
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncCreateStudentView(View):
+    """
+    Async view to create new student, evaluate responses to questions,
+    and return message and resources.
+    Exempt from csrf checks like the REST framework views.
+
+    The insert runs in a worker thread (the async ORM has no transactions),
+    and resources are recommended from the in-process pool on the event loop.
+    """
+
+    get_score_message = CreateStudentView.get_score_message
+
+    async def post(self, request):
+        try:
+            data = json.loads(request.body)
+        except ValueError:
+            return json_response(
+                {"detail": "JSON parse error."}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        studentRequestBodySerializer = CreateStudentRequestBodySerializer(data=data)
+
+        if not studentRequestBodySerializer.is_valid():
+            return json_response(
+                studentRequestBodySerializer.errors,
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            created_studentResponse = await sync_to_async(
+                studentRequestBodySerializer.save
+            )()
+        except Exception:
+            return json_response(
+                "Something wrong happened. Please try again.",
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+        await abump_statistics_generation()
+
+        score = created_studentResponse.score
+        resources = await resource_pool.arecommend(score, 3)
+
+        return json_response(
+            {
+                "message": self.get_score_message(score),
+                "resources": resources,
+                **studentRequestBodySerializer.data,
+            },
+            status=status.HTTP_201_CREATED,
+        )
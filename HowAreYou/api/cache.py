@@ -0,0 +1,103 @@
+"""
+Versioned cache for statistics payloads
+"""
+
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.http import parse_etags
+
+STATISTICS_GENERATION_KEY = "statistics:generation"
+
+
+def get_statistics_generation() -> int:
+    """
+    Return current statistics generation, initialising it if missing.
+
+    Generations start from the current time so that a cleared cache
+    never reissues an ETag a client may still hold.
+    """
+    generation = cache.get(STATISTICS_GENERATION_KEY)
+
+    if generation is None:
+        cache.add(STATISTICS_GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(STATISTICS_GENERATION_KEY)
+
+    return generation
+
+
+async def aget_statistics_generation() -> int:
+    """
+    Async version of `get_statistics_generation()`
+    """
+    generation = await cache.aget(STATISTICS_GENERATION_KEY)
+
+    if generation is None:
+        await cache.aadd(STATISTICS_GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = await cache.aget(STATISTICS_GENERATION_KEY)
+
+    return generation
+
+
+def bump_statistics_generation() -> None:
+    """
+    Invalidate every cached statistics payload.
+    Must be called after students or responses are written.
+    """
+    try:
+        cache.incr(STATISTICS_GENERATION_KEY)
+    except ValueError:
+        cache.add(STATISTICS_GENERATION_KEY, time.time_ns(), timeout=None)
+
+
+async def abump_statistics_generation() -> None:
+    """
+    Async version of `bump_statistics_generation()`
+    """
+    try:
+        await cache.aincr(STATISTICS_GENERATION_KEY)
+    except ValueError:
+        await cache.aadd(STATISTICS_GENERATION_KEY, time.time_ns(), timeout=None)
+
+
+def statistics_etag(name: str, generation: int) -> str:
+    """
+    Return ETag of statistics payload `name` at `generation`
+    """
+    return f'"{name}-{generation}"'
+
+
+def etag_matches(request, etag: str) -> bool:
+    """
+    Check `etag` against the request If-None-Match header
+    """
+    etags = parse_etags(request.headers.get("If-None-Match", ""))
+    return "*" in etags or etag in etags
+
+
+def get_cached_statistics(name: str, generation: int, compute) -> dict:
+    """
+    Return statistics payload `name` at `generation`, computing and caching it on miss
+    """
+    key = f"statistics:{name}:{generation}"
+    payload = cache.get(key)
+
+    if payload is None:
+        payload = compute()
+        cache.set(key, payload, timeout=settings.STATISTICS_CACHE_TIMEOUT)
+
+    return payload
+
+
+async def aget_cached_statistics(name: str, generation: int, acompute) -> dict:
+    """
+    Async version of `get_cached_statistics()`, `acompute` is a coroutine function
+    """
+    key = f"statistics:{name}:{generation}"
+    payload = await cache.aget(key)
+
+    if payload is None:
+        payload = await acompute()
+        await cache.aset(key, payload, timeout=settings.STATISTICS_CACHE_TIMEOUT)
+
+    return payload
@@ -0,0 +1,11 @@
+from typing import Any
+from django.core.management.base import BaseCommand
+from ...rollups import rebuild_daily_statistics
+
+
+class Command(BaseCommand):
+    help = "backfill daily statistics buckets used by trends from existing responses"
+
+    def handle(self, *args: Any, **options: Any) -> str | None:
+        buckets = rebuild_daily_statistics()
+        self.stdout.write(f"backfill_trends:: completed! ({buckets} daily bucket(s))")
@@ -0,0 +1,135 @@
+import time
+from pathlib import Path
+from typing import Any
+import pandas as pd
+from django.core.management.base import BaseCommand, CommandError
+from ...scripts.seed_db_script import RELATIVE_CSV_PATHS
+from ...scripts.synthetic_script import (
+    CSV_COLUMNS,
+    SyntheticModel,
+    write_csv,
+    write_db,
+    write_parquet,
+)
+
+# rows generated and written at once
+SYNTHETIC_CHUNK_SIZE = 100_000
+
+# seconds between progress reports
+PROGRESS_INTERVAL = 1
+
+OUTPUT_FORMATS = [".csv", ".parquet"]
+
+
+class Command(BaseCommand):
+    help = (
+        "generate synthetic students and responses with the answer distributions, "
+        "age and gender mix and correlations of a data.csv-shaped file, "
+        "into the database or into a csv or parquet file with --output"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "rows",
+            type=int,
+            help="number of rows to generate",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="random seed, the same seed generates the same rows",
+        )
+        parser.add_argument(
+            "--source",
+            default=RELATIVE_CSV_PATHS["data"],
+            help="data.csv-shaped file the distributions are fitted to",
+        )
+        parser.add_argument(
+            "--output",
+            help=f"file with extension {' or '.join(OUTPUT_FORMATS)} "
+            "to write rows to instead of the database, "
+            "parquet requires pyarrow",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=SYNTHETIC_CHUNK_SIZE,
+            help="number of rows generated and written at once",
+        )
+
+    def report_progress(self, rows: int, seconds: float) -> None:
+        """
+        Write rows generated so far and throughput, at most every PROGRESS_INTERVAL
+        """
+        if time.monotonic() - self.last_report < PROGRESS_INTERVAL:
+            return
+
+        self.last_report = time.monotonic()
+        self.stdout.write(
+            f"generate_synthetic:: {rows} rows in {seconds:.1f}s "
+            f"({rows / seconds:.0f} rows/s)"
+        )
+
+    def fit(self, source: str) -> SyntheticModel:
+        """
+        Fit model to `source` file
+        """
+        try:
+            df = pd.read_csv(source)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Cannot read {source}: {exc}")
+
+        missing = [column for column in CSV_COLUMNS[:-1] if column not in df.columns]
+        if missing:
+            raise CommandError(f"Missing column(s) in {source}: {', '.join(missing)}")
+        if df.empty:
+            raise CommandError(f"No row in {source}")
+
+        return SyntheticModel.fit(df)
+
+    def handle(self, *args: Any, **options: Any) -> str | None:
+        if options["rows"] < 1:
+            raise CommandError("rows must be at least 1")
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be at least 1")
+
+        output = options["output"]
+        if output is not None and Path(output).suffix not in OUTPUT_FORMATS:
+            raise CommandError(
+                f"Unknown format of {output}, expected {' or '.join(OUTPUT_FORMATS)}"
+            )
+        if output is not None and Path(output).suffix == ".parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise CommandError(
+                    "Writing parquet requires pyarrow: pip install pyarrow"
+                )
+
+        model = self.fit(options["source"])
+        frames = model.generate(options["rows"], options["seed"], options["chunk_size"])
+        self.last_report = time.monotonic()
+        start = time.perf_counter()
+
+        try:
+            if output is None:
+                totals = write_db(frames, options["seed"], self.report_progress)
+                summary = (
+                    f"seeded, {totals['created']} new, "
+                    f"{totals['rows'] - totals['created']} already seeded"
+                )
+            elif Path(output).suffix == ".csv":
+                write_csv(frames, output, self.report_progress)
+                summary = f"written to {output}"
+            else:
+                write_parquet(frames, output, self.report_progress)
+                summary = f"written to {output}"
+        except OSError as exc:
+            raise CommandError(f"Cannot write {output}: {exc}")
+
+        seconds = time.perf_counter() - start
+        self.stdout.write(
+            f"generate_synthetic:: {options['rows']} rows {summary} "
+            f"in {seconds:.1f}s ({options['rows'] / seconds:.0f} rows/s)"
+        )
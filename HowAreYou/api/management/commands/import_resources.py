@@ -0,0 +1,86 @@
+import csv
+from collections import Counter
+from pathlib import Path
+from typing import Any
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from ...resource_import import IMPORT_FORMATS, read_resources
+from ...models import Resource
+from ...serializers import CreateResourceRequestBodySerializer
+from ...verification import verification_worker
+
+
+class Command(BaseCommand):
+    help = "import resources in bulk from a csv or json file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="csv or json file of resources")
+        parser.add_argument(
+            "--format",
+            choices=IMPORT_FORMATS,
+            help="format of the file, guessed from its extension by default",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.RESOURCE_IMPORT_CHUNK_SIZE,
+            help="number of resources inserted at once",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> str | None:
+        path = Path(options["path"])
+        format = options["format"] or path.suffix.lstrip(".").lower()
+
+        if format not in IMPORT_FORMATS:
+            raise CommandError(
+                f"Cannot guess format of {path}, pass --format {' or '.join(IMPORT_FORMATS)}"
+            )
+
+        try:
+            with path.open(newline="", encoding="utf-8") as stream:
+                data = read_resources(stream, format)
+        except (OSError, ValueError, csv.Error) as exc:
+            raise CommandError(f"Cannot read {path}: {exc}")
+
+        serializer = CreateResourceRequestBodySerializer(
+            data=data,
+            many=True,
+            allow_empty=False,
+            context={"chunk_size": options["chunk_size"]},
+        )
+        if not serializer.is_valid():
+            raise CommandError(f"Invalid resources: {serializer.errors}")
+
+        statuses = serializer.save()
+
+        # created resources are verified in the background, wait for them
+        verification_worker.queue.join()
+        checked = dict(
+            Resource.objects.filter(
+                url__in=[
+                    resource["url"]
+                    for resource, status in zip(serializer.validated_data, statuses)
+                    if status == Resource.PENDING
+                ]
+            ).values_list("url", "status")
+        )
+        statuses = [
+            (
+                checked.get(resource["url"], status)
+                if status == Resource.PENDING
+                else status
+            )
+            for resource, status in zip(serializer.validated_data, statuses)
+        ]
+
+        for index, errors in enumerate(serializer.item_errors):
+            if errors:
+                self.stderr.write(f"import_resources:: resource {index}: {errors}")
+
+        counts = Counter(statuses)
+        self.stdout.write(
+            f"import_resources:: {counts['verified']} verified, "
+            f"{counts['broken']} broken, {counts['pending']} pending, "
+            f"{counts['duplicate']} duplicate, "
+            f"{counts['exists']} existing, {counts[None]} invalid"
+        )
@@ -0,0 +1,34 @@
+from typing import Any
+from django.core.management.base import BaseCommand, CommandError
+from ...rollups import find_rollup_drift, rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "recompute statistics rollups from scratch and report drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="only report drift, exit with an error if any is found",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> str | None:
+        drift = find_rollup_drift()
+
+        for d in drift:
+            self.stdout.write(
+                f"drift: severity={d['severity']} gender={d['gender']} age={d['age']} "
+                f"expected(count, score_sum)={d['expected']} actual(count, score_sum)={d['actual']}"
+            )
+
+        if options["check"]:
+            if drift:
+                raise CommandError(f"{len(drift)} rollup(s) drifted")
+            self.stdout.write("rebuild_rollups:: no drift found")
+            return
+
+        rebuild_rollups()
+        self.stdout.write(
+            f"rebuild_rollups:: completed! ({len(drift)} drifted rollup(s) fixed)"
+        )
@@ -1,15 +1,127 @@
+import time
 from typing import Any
 from django.core.management.base import BaseCommand, CommandError
 from ...scripts.seed_db_script import (
+    RELATIVE_CSV_PATHS,
+    SEED_CHUNK_SIZE,
+    resolve_csv_paths,
     seed_resources_db,
     seed_students_and_responses_db,
+    seed_students_and_responses_files,
 )
 
+# seconds between progress reports
+PROGRESS_INTERVAL = 1
+
 
 class Command(BaseCommand):
-    help = "seed resources, students and responses database"
+    help = (
+        "seed resources, students and responses database, "
+        "or only students and responses of data.csv-shaped files with --path. "
+        "rows already seeded are skipped"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            help="data.csv-shaped file, directory of files or glob pattern "
+            "of students and responses to ingest, resources are not seeded",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=SEED_CHUNK_SIZE,
+            help="number of rows read, validated and inserted at once",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="number of processes parsing files when --path matches "
+            "several files, the number of cpus by default",
+        )
+
+    def report_progress(self, rows: int, seconds: float) -> None:
+        """
+        Write rows seeded so far and throughput, at most every PROGRESS_INTERVAL
+        """
+        if time.monotonic() - self.last_report < PROGRESS_INTERVAL:
+            return
+
+        self.last_report = time.monotonic()
+        self.stdout.write(
+            f"seed_db:: {rows} rows in {seconds:.1f}s ({rows / seconds:.0f} rows/s)"
+        )
+
+    def report_file(self, path: str, totals: dict) -> None:
+        """
+        Write rows seeded from a file and time spent parsing and writing it
+        """
+        self.stdout.write(
+            f"seed_db:: {path}: {totals['rows']} rows, {totals['created']} new, "
+            f"parsed in {totals['parse_seconds']:.1f}s, "
+            f"written in {totals['write_seconds']:.1f}s"
+        )
+
+    def seed_files(self, paths: list[str], options: dict) -> None:
+        """
+        Seed several files, parsing them in parallel
+        """
+        start = time.perf_counter()
+
+        try:
+            totals = seed_students_and_responses_files(
+                paths,
+                options["chunk_size"],
+                options["workers"],
+                report=self.report_file,
+            )
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Cannot seed {exc}")
+
+        seconds = time.perf_counter() - start
+        self.stdout.write(
+            f"seed_db:: {totals['rows']} rows of {len(paths)} files seeded "
+            f"in {seconds:.1f}s ({totals['rows'] / seconds:.0f} rows/s), "
+            f"{totals['created']} new, "
+            f"{totals['rows'] - totals['created']} already seeded"
+        )
 
     def handle(self, *args: Any, **options: Any) -> str | None:
-        seed_students_and_responses_db()
-        seed_resources_db()
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be at least 1")
+        if options["workers"] is not None and options["workers"] < 1:
+            raise CommandError("--workers must be at least 1")
+
+        if options["path"] is not None:
+            paths = resolve_csv_paths(options["path"])
+            if not paths:
+                raise CommandError(f"No csv file found at {options['path']}")
+            if len(paths) > 1:
+                self.seed_files(paths, options)
+                print("seed_db completed!")
+                return
+
+        path = paths[0] if options["path"] is not None else RELATIVE_CSV_PATHS["data"]
+        self.last_report = time.monotonic()
+        start = time.perf_counter()
+
+        try:
+            totals = seed_students_and_responses_db(
+                path,
+                options["chunk_size"],
+                progress=self.report_progress,
+            )
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Cannot seed {path}: {exc}")
+
+        seconds = time.perf_counter() - start
+        self.stdout.write(
+            f"seed_db:: {totals['rows']} rows seeded in {seconds:.1f}s "
+            f"({totals['rows'] / seconds:.0f} rows/s), "
+            f"{totals['created']} new, "
+            f"{totals['rows'] - totals['created']} already seeded"
+        )
+
+        if options["path"] is None:
+            seed_resources_db()
         print("seed_db completed!")
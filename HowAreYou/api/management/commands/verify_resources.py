@@ -0,0 +1,40 @@
+import time
+from typing import Any
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from ...verification import verify_pending_resources
+
+
+class Command(BaseCommand):
+    help = "verify urls of pending resources and mark them verified or broken"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.RESOURCE_VERIFICATION_BATCH_SIZE,
+            help="number of urls checked per batch",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="keep running, verifying pending resources every --interval seconds",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=30,
+            help="seconds between runs with --loop",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> str | None:
+        while True:
+            totals = verify_pending_resources(options["batch_size"])
+            self.stdout.write(
+                f"verify_resources:: {totals['verified']} verified, "
+                f"{totals['broken']} broken"
+            )
+
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,98 @@
+# Generated by Django 5.1.4 on 2026-10-18 11:01
+
+import uuid
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+from api.statistics import severity_band_expression
+
+
+def backfill_rollups(apps, schema_editor):
+    """
+    Roll up existing responses, as `rollups.compute_rollups()` does,
+    reading age and gender from students as responses do not have them yet
+    """
+    StudentResponse = apps.get_model("api", "StudentResponse")
+    StudentStatisticsRollup = apps.get_model("api", "StudentStatisticsRollup")
+
+    rows = (
+        StudentResponse.objects.order_by()
+        .annotate(severity=severity_band_expression())
+        .values("severity", "student__gender", "student__age")
+        .annotate(count=Count("id"), score_sum=Sum("score"))
+        .values_list(
+            "severity", "student__gender", "student__age", "count", "score_sum"
+        )
+    )
+    StudentStatisticsRollup.objects.bulk_create(
+        StudentStatisticsRollup(
+            severity=severity,
+            gender=gender,
+            age=age,
+            count=count,
+            score_sum=score_sum,
+        )
+        for severity, gender, age, count, score_sum in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0009_rename_created_at_resource_created_at_utc_and_more"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="student",
+            name="id",
+            field=models.UUIDField(
+                db_index=True,
+                default=uuid.UUID("46208a2f-4217-463b-8343-8826d520dbe2"),
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.CreateModel(
+            name="StudentStatisticsRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "severity",
+                    models.CharField(
+                        choices=[
+                            ("none_minimal", "None - Minimal"),
+                            ("mild", "Mild"),
+                            ("moderate", "Moderate"),
+                            ("moderately_severe", "Moderately Severe"),
+                            ("severe", "Severe"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("gender", models.CharField(max_length=1)),
+                ("age", models.IntegerField()),
+                ("count", models.PositiveIntegerField(default=0)),
+                ("score_sum", models.PositiveIntegerField(default=0)),
+                ("updated_at_utc", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("severity", "gender", "age"),
+                        name="Rollup key constraint",
+                        violation_error_message="Rollup already exists for (severity, gender, age).",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
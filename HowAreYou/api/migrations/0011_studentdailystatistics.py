@@ -0,0 +1,91 @@
+# Generated by Django 5.1.4 on 2026-10-18 11:06
+
+import uuid
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+from api.statistics import severity_band_expression
+
+
+def backfill_daily_statistics(apps, schema_editor):
+    """
+    Bucket existing responses by day, as `rollups.rebuild_daily_statistics()` does
+    """
+    StudentResponse = apps.get_model("api", "StudentResponse")
+    StudentDailyStatistics = apps.get_model("api", "StudentDailyStatistics")
+
+    rows = (
+        StudentResponse.objects.order_by()
+        .annotate(date=TruncDate("created_at_utc"), severity=severity_band_expression())
+        .values("date", "severity")
+        .annotate(count=Count("id"), score_sum=Sum("score"))
+        .values_list("date", "severity", "count", "score_sum")
+    )
+    StudentDailyStatistics.objects.bulk_create(
+        StudentDailyStatistics(
+            date=date, severity=severity, count=count, score_sum=score_sum
+        )
+        for date, severity, count, score_sum in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0010_studentstatisticsrollup"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="student",
+            name="id",
+            field=models.UUIDField(
+                db_index=True,
+                default=uuid.UUID("1cfe5fc7-b899-4e15-a435-3b294c172f52"),
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.CreateModel(
+            name="StudentDailyStatistics",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                (
+                    "severity",
+                    models.CharField(
+                        choices=[
+                            ("none_minimal", "None - Minimal"),
+                            ("mild", "Mild"),
+                            ("moderate", "Moderate"),
+                            ("moderately_severe", "Moderately Severe"),
+                            ("severe", "Severe"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("count", models.PositiveIntegerField(default=0)),
+                ("score_sum", models.PositiveIntegerField(default=0)),
+                ("updated_at_utc", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("date", "severity"),
+                        name="Daily statistics key constraint",
+                        violation_error_message="Daily statistics already exists for (date, severity).",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_daily_statistics, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.4 on 2026-10-18 11:13
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0011_studentdailystatistics"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="student",
+            name="id",
+            field=models.UUIDField(
+                db_index=True,
+                default=uuid.UUID("1924a20a-ce7a-420f-a6af-25a4d0150046"),
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="studentresponse",
+            index=models.Index(
+                fields=["created_at_utc", "id"], name="response_created_id_idx"
+            ),
+        ),
+    ]
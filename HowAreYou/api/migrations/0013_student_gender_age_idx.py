@@ -0,0 +1,32 @@
+# Generated by Django 5.1.4 on 2026-10-18 11:17
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0012_studentresponse_created_id_idx"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="student",
+            name="id",
+            field=models.UUIDField(
+                db_index=True,
+                default=uuid.UUID("76124019-83ff-4400-9d50-42166eea2041"),
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="student",
+            index=models.Index(fields=["gender", "age"], name="student_gender_age_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="student",
+            index=models.Index(fields=["age"], name="student_age_idx"),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.1.4 on 2026-10-18 12:00
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_age_and_gender(apps, schema_editor):
+    """
+    Copy age and gender of every student onto its responses
+    """
+    Student = apps.get_model("api", "Student")
+    StudentResponse = apps.get_model("api", "StudentResponse")
+
+    student = Student.objects.filter(pk=OuterRef("student_id"))
+    StudentResponse.objects.update(
+        age=Subquery(student.values("age")[:1]),
+        gender=Subquery(student.values("gender")[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0013_student_gender_age_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="studentresponse",
+            name="age",
+            field=models.IntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name="studentresponse",
+            name="gender",
+            field=models.CharField(max_length=1, null=True),
+        ),
+        migrations.RunPython(backfill_age_and_gender, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="studentresponse",
+            name="age",
+            field=models.IntegerField(),
+        ),
+        migrations.AlterField(
+            model_name="studentresponse",
+            name="gender",
+            field=models.CharField(max_length=1),
+        ),
+        migrations.AddIndex(
+            model_name="studentresponse",
+            index=models.Index(
+                fields=["gender", "age"], name="response_gender_age_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="studentresponse",
+            index=models.Index(
+                fields=["gender", "created_at_utc", "id"],
+                name="response_gender_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.1.4 on 2026-10-18 11:25
+
+import api.models
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0014_studentresponse_age_gender"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="resource",
+            name="severities",
+            field=models.JSONField(default=api.models.all_severities),
+        ),
+        migrations.AddField(
+            model_name="resource",
+            name="weight",
+            field=models.PositiveSmallIntegerField(default=1),
+        ),
+        migrations.AlterField(
+            model_name="student",
+            name="id",
+            field=models.UUIDField(
+                db_index=True,
+                default=uuid.UUID("cce37401-ba05-4f17-b0b3-b923a796a301"),
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="resource",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("weight__gte", 1)),
+                name="Weight constraint",
+                violation_error_message="Weight must be at least 1.",
+            ),
+        ),
+    ]
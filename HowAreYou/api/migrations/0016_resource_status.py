@@ -0,0 +1,59 @@
+# Generated by Django 5.1.4 on 2026-10-18 12:15
+
+import uuid
+from django.db import migrations, models
+
+
+def mark_existing_resources_verified(apps, schema_editor):
+    """
+    Keep serving resources created before urls were verified in the background
+    """
+    Resource = apps.get_model("api", "Resource")
+    Resource.objects.update(status="verified")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0015_resource_severities_weight"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="resource",
+            name="checked_at_utc",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="resource",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("verified", "Verified"),
+                    ("broken", "Broken"),
+                ],
+                default="pending",
+                max_length=10,
+            ),
+        ),
+        migrations.RunPython(
+            mark_existing_resources_verified, migrations.RunPython.noop
+        ),
+        migrations.AlterField(
+            model_name="student",
+            name="id",
+            field=models.UUIDField(
+                db_index=True,
+                default=uuid.UUID("7acb42c0-e5e6-4ed8-b63f-236830d8390e"),
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="resource",
+            index=models.Index(
+                fields=["status", "-created_at_utc"], name="resource_status_created_idx"
+            ),
+        ),
+    ]
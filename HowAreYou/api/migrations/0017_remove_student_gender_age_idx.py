@@ -0,0 +1,32 @@
+# Generated by Django 5.1.4 on 2026-10-18 13:47
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0016_resource_status"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="student",
+            name="student_gender_age_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="student",
+            name="student_age_idx",
+        ),
+        migrations.AlterField(
+            model_name="student",
+            name="id",
+            field=models.UUIDField(
+                db_index=True,
+                default=uuid.UUID("fa0fd839-e001-4091-ae8c-dfa5adf391ea"),
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+    ]
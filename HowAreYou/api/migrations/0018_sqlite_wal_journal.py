@@ -0,0 +1,33 @@
+from django.db import migrations
+
+
+def set_journal_mode(mode: str):
+    """
+    Return migration function setting the journal mode of SQLite databases
+    """
+
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == "sqlite":
+            with schema_editor.connection.cursor() as cursor:
+                cursor.execute(f"PRAGMA journal_mode={mode}")
+
+    return run
+
+
+class Migration(migrations.Migration):
+    """
+    Switch SQLite databases to write-ahead logging, so readers do not block
+    the writer. The journal mode is stored in the database file, so it is
+    set once here instead of on every connection.
+    """
+
+    # the journal mode cannot be changed within a transaction
+    atomic = False
+
+    dependencies = [
+        ("api", "0017_remove_student_gender_age_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(set_journal_mode("WAL"), set_journal_mode("DELETE")),
+    ]
@@ -5,6 +5,7 @@ Define API data models
 from django.db import models
 from uuid import uuid4
 from django.db.models.functions import Length
+from .statistics import SEVERITY_BANDS
 
 # register length to validate charfield length > 0
 models.CharField.register_lookup(Length)
@@ -39,6 +40,9 @@ class Student(models.Model):
         """
         1. age_constraint: age >=12 and age <= 24
         2. gender_constraint: age is in ["m", "f", "o"]
+
+        Students are not indexed by gender or age, cohorts are filtered
+        on the copies of both fields on `StudentResponse`.
         """
 
         constraints = [
@@ -77,12 +81,26 @@ class StudentResponse(models.Model):
     student = models.ForeignKey(
         Student, related_name="student", on_delete=models.CASCADE
     )
+    # denormalized from `student` to filter responses without a join
+    gender = models.CharField(max_length=1, blank=False, null=False)
+    age = models.IntegerField(blank=False, null=False)
     created_at_utc = models.DateTimeField(auto_now_add=True)
     updated_at_utc = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"score: {self.score}"
 
+    def save(self, *args, **kwargs):
+        """
+        Copy age and gender from student when they are not provided.
+        `bulk_create()` does not call `save()`, callers must set them.
+        """
+        if not self.gender:
+            self.gender = self.student.gender
+        if self.age is None:
+            self.age = self.student.age
+        super().save(*args, **kwargs)
+
     class Meta:
         """
         1. q1_resp constraint: >= 0 and <= 3
@@ -95,8 +113,24 @@ class StudentResponse(models.Model):
         8. q8_resp constraint: >= 0 and <= 3
         9. q9_resp constraint: >= 0 and <= 3
         10. score constraint: >= 0 and <= 27
+
+        Indexes:
+        1. (created_at_utc, id): keyset pagination newest first
+        2. (gender, age): filter and aggregate by gender and age range
+        3. (gender, created_at_utc, id): filter by gender newest first
         """
 
+        indexes = [
+            models.Index(
+                fields=["created_at_utc", "id"], name="response_created_id_idx"
+            ),
+            models.Index(fields=["gender", "age"], name="response_gender_age_idx"),
+            models.Index(
+                fields=["gender", "created_at_utc", "id"],
+                name="response_gender_created_idx",
+            ),
+        ]
+
         constraints = [
             models.CheckConstraint(
                 check=models.Q(q1_resp__gte=0) & models.Q(q1_resp__lte=3),
@@ -151,6 +185,13 @@ class StudentResponse(models.Model):
         ]
 
 
+def all_severities() -> list[str]:
+    """
+    Default severity bands of a resource: every band
+    """
+    return [value for value, _, _, _ in SEVERITY_BANDS]
+
+
 class Resource(models.Model):
     """
     Normalized data model for resources
@@ -161,10 +202,24 @@ class Resource(models.Model):
         ("video", "Video"),
     ]
 
+    PENDING, VERIFIED, BROKEN = "pending", "verified", "broken"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (VERIFIED, "Verified"),
+        (BROKEN, "Broken"),
+    ]
+
     url = models.CharField(max_length=255, blank=False, null=False, unique=True)
     type = models.CharField(
         max_length=10, choices=TYPE_CHOICES, blank=False, null=False
     )
+    # severity bands the resource is recommended for
+    severities = models.JSONField(default=all_severities)
+    # relative likelihood of being recommended within a severity band
+    weight = models.PositiveSmallIntegerField(default=1)
+    # only verified resources are served, urls are checked in the background
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    checked_at_utc = models.DateTimeField(null=True, blank=True)
     created_at_utc = models.DateTimeField(auto_now_add=True)
     updated_at_utc = models.DateTimeField(auto_now=True)
 
@@ -175,8 +230,18 @@ class Resource(models.Model):
         """
         1. type_constraint: age is in ["article", "video"]
         2. url_constraint: url cannot be null or empty string
+        3. weight_constraint: weight >= 1
+
+        Indexes:
+        1. (status, created_at_utc): list verified resources newest first
         """
 
+        indexes = [
+            models.Index(
+                fields=["status", "-created_at_utc"], name="resource_status_created_idx"
+            ),
+        ]
+
         constraints = [
             models.CheckConstraint(
                 check=models.Q(type="article") | models.Q(type="video"),
@@ -188,4 +253,75 @@ class Resource(models.Model):
                 name="URL constraint",
                 violation_error_message="URL cannot be empty string.",
             ),
+            models.CheckConstraint(
+                check=models.Q(weight__gte=1),
+                name="Weight constraint",
+                violation_error_message="Weight must be at least 1.",
+            ),
+        ]
+
+
+class StudentStatisticsRollup(models.Model):
+    """
+    Pre-aggregated response counts and score sums per severity, gender and age
+    """
+
+    SEVERITY_CHOICES = [(value, label) for value, label, _, _ in SEVERITY_BANDS]
+
+    severity = models.CharField(
+        max_length=20, choices=SEVERITY_CHOICES, blank=False, null=False
+    )
+    gender = models.CharField(max_length=1, blank=False, null=False)
+    age = models.IntegerField(blank=False, null=False)
+    count = models.PositiveIntegerField(default=0)
+    score_sum = models.PositiveIntegerField(default=0)
+    updated_at_utc = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"severity: {self.severity} | gender: {self.gender} | age: {self.age} | count: {self.count}"
+
+    class Meta:
+        """
+        1. rollup_key_constraint: one row per (severity, gender, age)
+        """
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=["severity", "gender", "age"],
+                name="Rollup key constraint",
+                violation_error_message="Rollup already exists for (severity, gender, age).",
+            ),
+        ]
+
+
+class StudentDailyStatistics(models.Model):
+    """
+    Pre-aggregated response counts and score sums per creation date and severity
+    """
+
+    date = models.DateField(blank=False, null=False)
+    severity = models.CharField(
+        max_length=20,
+        choices=StudentStatisticsRollup.SEVERITY_CHOICES,
+        blank=False,
+        null=False,
+    )
+    count = models.PositiveIntegerField(default=0)
+    score_sum = models.PositiveIntegerField(default=0)
+    updated_at_utc = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"date: {self.date} | severity: {self.severity} | count: {self.count}"
+
+    class Meta:
+        """
+        1. daily_key_constraint: one row per (date, severity)
+        """
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "severity"],
+                name="Daily statistics key constraint",
+                violation_error_message="Daily statistics already exists for (date, severity).",
+            ),
         ]
@@ -0,0 +1,128 @@
+"""
+Keyset pagination for API list endpoints
+"""
+
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+# ids of a cursor must fit in a signed 64-bit database integer
+MIN_CURSOR_ID, MAX_CURSOR_ID = -(2**63), 2**63 - 1
+
+
+class CreatedAtCursorPagination:
+    """
+    Paginate newest first on (created_at_utc, id) using opaque cursors.
+
+    Every page is fetched with an index range scan on (created_at_utc, id)
+    instead of an OFFSET scan, and without counting the whole table.
+    Request the first page with an empty `cursor` parameter.
+    """
+
+    cursor_query_param = "cursor"
+    page_size = api_settings.PAGE_SIZE
+
+    def encode_cursor(self, instance, reverse: bool) -> str:
+        """
+        Encode position of `instance` and direction into an opaque cursor
+        """
+        position = [instance.created_at_utc.isoformat(), instance.id, reverse]
+        return urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+    def decode_cursor(self, cursor: str):
+        """
+        Decode cursor into (created_at_utc, id, reverse)
+        """
+        try:
+            position = json.loads(urlsafe_b64decode(cursor))
+        except ValueError:
+            position = None
+
+        if not (
+            isinstance(position, list)
+            and [type(value) for value in position] == [str, int, bool]
+        ):
+            raise serializers.ValidationError({"cursor": "Invalid cursor."})
+
+        created_at_utc, id, reverse = position
+        try:
+            if not MIN_CURSOR_ID <= id <= MAX_CURSOR_ID:
+                raise OverflowError(id)
+            return datetime.fromisoformat(created_at_utc), id, reverse
+        except (OverflowError, ValueError):
+            raise serializers.ValidationError({"cursor": "Invalid cursor."})
+
+    def get_page_queryset(self, queryset, request):
+        """
+        Return queryset of the requested page plus one extra row,
+        which tells whether another page follows
+        """
+        self.request = request
+        self.cursor = request.GET.get(self.cursor_query_param, "")
+
+        if not self.cursor:
+            position, self.reverse = None, False
+        else:
+            created_at_utc, id, self.reverse = self.decode_cursor(self.cursor)
+            position = Q(created_at_utc=created_at_utc)
+
+            if self.reverse:
+                position = Q(created_at_utc__gt=created_at_utc) | (
+                    position & Q(id__gt=id)
+                )
+            else:
+                position = Q(created_at_utc__lt=created_at_utc) | (
+                    position & Q(id__lt=id)
+                )
+
+        if self.reverse:
+            queryset = queryset.order_by("created_at_utc", "id")
+        else:
+            queryset = queryset.order_by("-created_at_utc", "-id")
+
+        if position is not None:
+            queryset = queryset.filter(position)
+
+        return queryset[: self.page_size + 1]
+
+    def set_results(self, results: list) -> list:
+        """
+        Drop the extra row of the page and record which links exist
+        """
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+
+        if self.reverse:
+            results.reverse()
+            self.has_previous, self.has_next = has_more, True
+        else:
+            self.has_previous, self.has_next = self.cursor != "", has_more
+
+        self.results = results
+        return results
+
+    def paginate_queryset(self, queryset, request, view=None) -> list:
+        return self.set_results(list(self.get_page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None) -> list:
+        page_queryset = self.get_page_queryset(queryset, request)
+        return self.set_results([r async for r in page_queryset])
+
+    def get_link(self, cursor: str) -> str:
+        url = remove_query_param(self.request.build_absolute_uri(), "page")
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next or not self.results:
+            return None
+        return self.get_link(self.encode_cursor(self.results[-1], reverse=False))
+
+    def get_previous_link(self) -> str | None:
+        if not self.has_previous or not self.results:
+            return None
+        return self.get_link(self.encode_cursor(self.results[0], reverse=True))
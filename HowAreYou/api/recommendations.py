@@ -0,0 +1,115 @@
+"""
+Severity-aware resource recommendations
+"""
+
+from random import Random
+
+from .statistics import SEVERITY_BANDS
+
+
+class AliasTable:
+    """
+    Vose's alias method: O(n) to build, O(1) to draw an index
+    with probability proportional to its weight
+    """
+
+    def __init__(self, weights: list[int]):
+        n = len(weights)
+        total = sum(weights)
+        probabilities = [w * n / total for w in weights]
+        aliases = list(range(n))
+
+        small = [i for i, p in enumerate(probabilities) if p < 1]
+        large = [i for i, p in enumerate(probabilities) if p >= 1]
+
+        while small and large:
+            s, l = small.pop(), large.pop()
+            aliases[s] = l
+            probabilities[l] -= 1 - probabilities[s]
+            (small if probabilities[l] < 1 else large).append(l)
+
+        # leftovers are 1 up to floating point error
+        for i in small + large:
+            probabilities[i] = 1.0
+
+        self.n = n
+        self.probabilities = probabilities
+        self.aliases = aliases
+
+    def draw(self, rng: Random) -> int:
+        i = int(rng.random() * self.n)
+        return i if rng.random() < self.probabilities[i] else self.aliases[i]
+
+
+class RecommendationIndex:
+    """
+    Immutable per-severity candidate lists and alias tables of resources.
+
+    `resources` is a tuple of (url, type, severities, weight).
+    """
+
+    def __init__(self, resources: tuple, rng: Random | None = None):
+        self.resources = resources
+        self.rng = rng or Random()
+        self.candidates = {}
+        self.tables = {}
+
+        for severity, _, _, _ in SEVERITY_BANDS:
+            candidates = tuple(r for r in resources if severity in r[2])
+            self.candidates[severity] = candidates
+            if candidates:
+                self.tables[severity] = AliasTable([r[3] for r in candidates])
+
+        # resources of every band, used to top up bands with too few candidates
+        self.candidates[None] = resources
+        if resources:
+            self.tables[None] = AliasTable([r[3] for r in resources])
+
+    def __len__(self) -> int:
+        return len(self.resources)
+
+    def pick(self, severity: str | None, k: int, exclude: set) -> list:
+        """
+        Draw up to `k` distinct resources of `severity` not in `exclude`
+        """
+        candidates = self.candidates.get(severity, ())
+
+        # only small bands are scanned, large bands are sampled in O(k)
+        if len(candidates) <= k + len(exclude):
+            available = [r for r in candidates if r[0] not in exclude]
+            if len(available) <= k:
+                self.rng.shuffle(available)
+                return available
+
+        table = self.tables[severity]
+        picked, urls = [], set(exclude)
+
+        # rejection sampling: duplicates are rare while k is small
+        # compared to the candidates, bound attempts for skewed weights
+        for _ in range(k * 16):
+            resource = candidates[table.draw(self.rng)]
+            if resource[0] not in urls:
+                picked.append(resource)
+                urls.add(resource[0])
+                if len(picked) == k:
+                    return picked
+
+        remaining = [r for r in candidates if r[0] not in urls]
+        while len(picked) < k:
+            resource = self.rng.choices(remaining, weights=[r[3] for r in remaining])[0]
+            remaining.remove(resource)
+            picked.append(resource)
+
+        return picked
+
+    def recommend(self, severity: str, k: int = 3) -> list[dict]:
+        """
+        Return `k` distinct resources targeted at `severity`,
+        topped up with resources of other bands if needed
+        """
+        picked = self.pick(severity, k, set())
+
+        if len(picked) < k:
+            picked += self.pick(None, k - len(picked), {r[0] for r in picked})
+
+        return [{"url": url, "type": type} for url, type, _, _ in picked]
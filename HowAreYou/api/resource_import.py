@@ -0,0 +1,65 @@
+"""
+Read resources imported in bulk from csv or json
+"""
+
+import codecs
+import csv
+import json
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+IMPORT_FORMATS = ["csv", "json"]
+
+# separates severity bands within the `severities` column of a csv
+SEVERITIES_SEPARATOR = "|"
+
+
+def read_resources_csv(lines) -> list[dict]:
+    """
+    Read resources from csv `lines` with a header row of
+    `url`, `type` and optional `severities` and `weight` columns.
+    Empty cells are left out so their fields take default values.
+    """
+    resources = []
+
+    for row in csv.DictReader(lines):
+        resource = {
+            field: value.strip()
+            for field, value in row.items()
+            if field is not None and value and value.strip()
+        }
+        if "severities" in resource:
+            resource["severities"] = [
+                severity.strip()
+                for severity in resource["severities"].split(SEVERITIES_SEPARATOR)
+                if severity.strip()
+            ]
+        resources.append(resource)
+
+    return resources
+
+
+def read_resources(stream, format: str) -> list:
+    """
+    Read resources from a text `stream` in csv or json `format`
+    """
+    if format == "csv":
+        return read_resources_csv(stream)
+    return json.load(stream)
+
+
+class ResourceCSVParser(BaseParser):
+    """
+    Parse a csv request body into a list of resources
+    """
+
+    media_type = "text/csv"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get("encoding", "utf-8")
+
+        try:
+            return read_resources_csv(codecs.getreader(encoding)(stream))
+        except (csv.Error, UnicodeDecodeError) as exc:
+            raise ParseError(f"CSV parse error - {exc}")
@@ -0,0 +1,91 @@
+"""
+In-process pool of resources recommended to students
+"""
+
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+
+from .models import Resource
+from .recommendations import RecommendationIndex
+from .statistics import severity_band
+
+
+class ResourcePool:
+    """
+    Recommendation index over (url, type, severities, weight) of every resource.
+
+    Reloaded when a resource is created in this process,
+    and otherwise at most every `ttl` seconds.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.resources: RecommendationIndex | None = None
+        self.loaded_at = 0.0
+
+    def load(self) -> RecommendationIndex:
+        return RecommendationIndex(
+            tuple(
+                Resource.objects.filter(status=Resource.VERIFIED)
+                .order_by("id")
+                .values_list("url", "type", "severities", "weight")
+            )
+        )
+
+    def get(self) -> RecommendationIndex:
+        """
+        Return recommendation index, rebuilding it if missing or expired
+        """
+        resources = self.resources
+        if resources is not None and time.monotonic() - self.loaded_at < self.ttl:
+            return resources
+
+        with self.lock:
+            if self.resources is None or time.monotonic() - self.loaded_at >= self.ttl:
+                self.resources = self.load()
+                self.loaded_at = time.monotonic()
+            return self.resources
+
+    async def aget(self) -> RecommendationIndex:
+        """
+        Async version of `get()`, only leaving the event loop to reload
+        """
+        resources = self.resources
+        if resources is not None and time.monotonic() - self.loaded_at < self.ttl:
+            return resources
+
+        return await sync_to_async(self.get)()
+
+    def invalidate(self) -> None:
+        """
+        Drop pooled resources so the next `get()` reloads them
+        """
+        self.resources = None
+
+    def invalidate_on_commit(self) -> None:
+        """
+        Invalidate now and again once the current transaction commits,
+        so a reload racing the transaction cannot keep stale resources
+        """
+        self.invalidate()
+        transaction.on_commit(self.invalidate)
+
+    def recommend(self, score: int, k: int) -> list[dict]:
+        """
+        Pick `k` distinct resources weighted towards the severity band of `score`
+        """
+        return self.get().recommend(severity_band(score), k)
+
+    async def arecommend(self, score: int, k: int) -> list[dict]:
+        """
+        Async version of `recommend()`
+        """
+        return (await self.aget()).recommend(severity_band(score), k)
+
+
+resource_pool = ResourcePool(ttl=settings.RESOURCE_POOL_TTL)
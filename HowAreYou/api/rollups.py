@@ -0,0 +1,186 @@
+"""
+Maintain pre-aggregated statistics rollups
+"""
+
+from collections import defaultdict
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Greatest, TruncDate
+
+from .cache import bump_statistics_generation
+from .models import StudentResponse, StudentStatisticsRollup, StudentDailyStatistics
+from .statistics import severity_band, severity_band_expression
+
+
+def record_responses(responses, sign: int = 1) -> None:
+    """
+    Add (sign=1) or remove (sign=-1) responses from the rollup tables.
+
+    `responses` is an iterable of (score, gender, age, created date) tuples.
+    Must be called inside the transaction writing the responses.
+    """
+    record_response_groups(
+        ((score, gender, age, date, 1) for score, gender, age, date in responses), sign
+    )
+
+
+def record_response_groups(groups, sign: int = 1) -> None:
+    """
+    Add (sign=1) or remove (sign=-1) groups of identical responses from the rollup tables.
+
+    `groups` is an iterable of (score, gender, age, created date, count) tuples.
+    Must be called inside the transaction writing the responses.
+    """
+    rollup_deltas = defaultdict(lambda: [0, 0])
+    daily_deltas = defaultdict(lambda: [0, 0])
+
+    for score, gender, age, date, count in groups:
+        severity = severity_band(score)
+
+        for delta in (
+            rollup_deltas[(severity, gender, age)],
+            daily_deltas[(date, severity)],
+        ):
+            delta[0] += sign * count
+            delta[1] += sign * count * score
+
+    for (severity, gender, age), (count, score_sum) in rollup_deltas.items():
+        apply_delta(
+            StudentStatisticsRollup,
+            {"severity": severity, "gender": gender, "age": age},
+            count,
+            score_sum,
+        )
+
+    for (date, severity), (count, score_sum) in daily_deltas.items():
+        apply_delta(
+            StudentDailyStatistics,
+            {"date": date, "severity": severity},
+            count,
+            score_sum,
+        )
+
+
+def apply_delta(model, key: dict, count: int, score_sum: int) -> None:
+    """
+    Increment a single rollup row of `model`, creating it if it does not exist yet.
+    Decrements are floored at zero, a row lower than the responses it counts
+    is drift left for the rebuild commands and must not fail the write.
+    """
+    rollup = model.objects.filter(**key)
+    if count < 0:
+        updated = rollup.update(
+            count=Greatest(F("count") + count, 0),
+            score_sum=Greatest(F("score_sum") + score_sum, 0),
+        )
+    else:
+        updated = rollup.update(
+            count=F("count") + count, score_sum=F("score_sum") + score_sum
+        )
+
+    # a missing row can only be created by a positive delta,
+    # removing from a missing row is drift left for the rebuild commands
+    if updated or count <= 0:
+        return
+
+    try:
+        with transaction.atomic():
+            model.objects.create(**key, count=count, score_sum=score_sum)
+    except IntegrityError:
+        # row was created by a concurrent writer
+        rollup.update(count=F("count") + count, score_sum=F("score_sum") + score_sum)
+
+
+def compute_rollups() -> dict[tuple, tuple]:
+    """
+    Recompute rollups from `StudentResponse` in a single grouped query
+    """
+    rows = (
+        StudentResponse.objects.order_by()
+        .annotate(severity=severity_band_expression())
+        .values("severity", "gender", "age")
+        .annotate(count=Count("id"), score_sum=Sum("score"))
+        .values_list("severity", "gender", "age", "count", "score_sum")
+    )
+
+    return {
+        (severity, gender, age): (count, score_sum)
+        for severity, gender, age, count, score_sum in rows
+    }
+
+
+def find_rollup_drift() -> list[dict]:
+    """
+    Compare stored rollups against recomputed rollups and return differences
+    """
+    expected = compute_rollups()
+    rows = StudentStatisticsRollup.objects.filter(count__gt=0).values_list(
+        "severity", "gender", "age", "count", "score_sum"
+    )
+    actual = {
+        (severity, gender, age): (count, score_sum)
+        for severity, gender, age, count, score_sum in rows
+    }
+
+    drift = []
+    for key in sorted(expected.keys() | actual.keys()):
+        if expected.get(key) != actual.get(key):
+            drift.append(
+                {
+                    "severity": key[0],
+                    "gender": key[1],
+                    "age": key[2],
+                    "expected": expected.get(key, (0, 0)),
+                    "actual": actual.get(key, (0, 0)),
+                }
+            )
+
+    return drift
+
+
+def rebuild_rollups() -> None:
+    """
+    Replace the rollup table with rollups recomputed from scratch
+    """
+    with transaction.atomic():
+        rollups = [
+            StudentStatisticsRollup(
+                severity=severity,
+                gender=gender,
+                age=age,
+                count=count,
+                score_sum=score_sum,
+            )
+            for (severity, gender, age), (count, score_sum) in compute_rollups().items()
+        ]
+        StudentStatisticsRollup.objects.all().delete()
+        StudentStatisticsRollup.objects.bulk_create(rollups)
+
+    bump_statistics_generation()
+
+
+def rebuild_daily_statistics() -> int:
+    """
+    Replace the daily statistics table with buckets recomputed from scratch.
+    Return number of buckets written.
+    """
+    rows = (
+        StudentResponse.objects.order_by()
+        .annotate(date=TruncDate("created_at_utc"), severity=severity_band_expression())
+        .values("date", "severity")
+        .annotate(count=Count("id"), score_sum=Sum("score"))
+        .values_list("date", "severity", "count", "score_sum")
+    )
+
+    with transaction.atomic():
+        buckets = [
+            StudentDailyStatistics(
+                date=date, severity=severity, count=count, score_sum=score_sum
+            )
+            for date, severity, count, score_sum in rows
+        ]
+        StudentDailyStatistics.objects.all().delete()
+        StudentDailyStatistics.objects.bulk_create(buckets)
+
+    bump_statistics_generation()
+    return len(buckets)
@@ -0,0 +1,95 @@
+"""
+Benchmark analytics computed from the columnar snapshot against the ORM path
+
+Usage:
+    python manage.py runscript benchmark_analytics --script-args 10000 100000 1000000
+"""
+
+from collections import Counter
+
+from ..models import StudentResponse
+from ..snapshot import ResponseSnapshot, compute_analytics
+from ..statistics import QUESTION_FIELDS, severity_band
+from .benchmark_utils import (
+    benchmark_database,
+    insert_synthetic_responses,
+    parse_sizes,
+    timed,
+)
+
+PERCENTILES = [10, 25, 50, 75, 90]
+
+
+def orm_analytics() -> dict:
+    """
+    Compute the same analytics iterating model instances one row at a time
+    """
+    n = 0
+    sums = [0] * 9
+    products = [[0] * 9 for _ in range(9)]
+    scores = []
+    crosstab = Counter()
+
+    for r in StudentResponse.objects.select_related("student"):
+        answers = [getattr(r, q) for q in QUESTION_FIELDS]
+        n += 1
+        for i in range(9):
+            sums[i] += answers[i]
+            for j in range(9):
+                products[i][j] += answers[i] * answers[j]
+        scores.append(r.score)
+        crosstab[(r.student.age, r.student.gender, severity_band(r.score))] += 1
+
+    correlations = [[None] * 9 for _ in range(9)]
+    for i in range(9):
+        for j in range(9):
+            cov_ij = products[i][j] / n - sums[i] * sums[j] / n**2
+            var_i = products[i][i] / n - (sums[i] / n) ** 2
+            var_j = products[j][j] / n - (sums[j] / n) ** 2
+            if var_i > 0 and var_j > 0:
+                correlations[i][j] = cov_ij / (var_i * var_j) ** 0.5
+
+    scores.sort()
+    percentiles = {
+        str(p): scores[min(int(p / 100 * (n - 1)), n - 1)] for p in PERCENTILES
+    }
+
+    return {
+        "correlations": correlations,
+        "percentiles": percentiles,
+        "crosstab": crosstab,
+    }
+
+
+def run(*args):
+    sizes = parse_sizes(args, [10_000, 100_000, 1_000_000])
+
+    print(
+        f"{'rows':>10} {'orm (s)':>10} {'cold (s)':>10} {'warm (s)':>10} {'+1k rows (s)':>13}"
+    )
+
+    with benchmark_database():
+        inserted = 0
+        for size in sizes:
+            insert_synthetic_responses(size - inserted, seed=size)
+            inserted = size
+
+            _, orm_seconds = timed(orm_analytics)
+
+            snapshot = ResponseSnapshot()
+
+            def snapshot_analytics():
+                snapshot.refresh()
+                return compute_analytics(snapshot, {}, PERCENTILES)
+
+            _, cold_seconds = timed(snapshot_analytics)
+            _, warm_seconds = timed(snapshot_analytics, repeat=3)
+
+            insert_synthetic_responses(1_000, seed=size + 1, days=0)
+            inserted += 1_000
+            _, incremental_seconds = timed(snapshot_analytics)
+
+            print(
+                f"{size:>10} {orm_seconds:>10.3f} {cold_seconds:>10.3f} "
+                f"{warm_seconds:>10.3f} {incremental_seconds:>13.3f}"
+            )
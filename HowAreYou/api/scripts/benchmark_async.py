@@ -0,0 +1,86 @@
+"""
+Benchmark throughput of the sync and async views at 500 concurrent
+connections, served in-process by Django's ASGI handler
+
+Usage:
+    python manage.py runscript benchmark_async --script-args 500
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+
+from django.test import AsyncClient
+
+from ..rollups import rebuild_rollups
+from ..scripts.seed_db_script import seed_resources_db
+from .benchmark_utils import (
+    benchmark_database,
+    insert_synthetic_responses,
+    parse_sizes,
+    synthetic_submissions,
+)
+
+ROWS = 100_000
+
+REQUESTS = 2_000
+
+ENDPOINTS = {
+    "resources": ("get", "resources"),
+    "students (page)": ("get", "students?gender=f&agegte=14"),
+    "students (cursor)": ("get", "students?gender=f&cursor="),
+    "students/stats": ("get", "students/stats?gender=m"),
+    "students/create": ("post", "students/create"),
+}
+
+
+async def throughput(method: str, url: str, concurrency: int) -> float:
+    """
+    Send REQUESTS requests with `concurrency` in flight and return requests per second
+    """
+    client = AsyncClient()
+    semaphore = asyncio.Semaphore(concurrency)
+    submissions = iter(synthetic_submissions(REQUESTS))
+
+    async def request():
+        async with semaphore:
+            if method == "post":
+                response = await client.post(
+                    url, next(submissions), content_type="application/json"
+                )
+            else:
+                response = await client.get(url)
+            assert response.status_code < 300, response.content
+
+    start = time.perf_counter()
+    await asyncio.gather(*[request() for _ in range(REQUESTS)])
+    return REQUESTS / (time.perf_counter() - start)
+
+
+def run(*args):
+    concurrencies = parse_sizes(args, [500])
+
+    with tempfile.TemporaryDirectory() as directory:
+        with benchmark_database(os.path.join(directory, "benchmark.sqlite3")):
+            seed_resources_db()
+            insert_synthetic_responses(ROWS)
+            rebuild_rollups()
+
+            print(
+                f"{'connections':>12} {'endpoint':<18} {'sync (req/s)':>13} "
+                f"{'async (req/s)':>14} {'speedup':>8}"
+            )
+
+            for concurrency in concurrencies:
+                for name, (method, path) in ENDPOINTS.items():
+                    sync_rps = asyncio.run(
+                        throughput(method, f"/api/v1/{path}", concurrency)
+                    )
+                    async_rps = asyncio.run(
+                        throughput(method, f"/api/v1/async/{path}", concurrency)
+                    )
+                    print(
+                        f"{concurrency:>12} {name:<18} {sync_rps:>13.1f} "
+                        f"{async_rps:>14.1f} {async_rps / sync_rps:>7.1f}x"
+                    )
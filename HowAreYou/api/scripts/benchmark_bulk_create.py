@@ -0,0 +1,52 @@
+"""
+Benchmark POST /api/v1/students/bulk against posting every submission
+to POST /api/v1/students/create
+
+Usage:
+    python manage.py runscript benchmark_bulk_create --script-args 1000 10000
+"""
+
+from rest_framework.test import APIClient
+
+from ..scripts.seed_db_script import seed_resources_db
+from .benchmark_utils import (
+    benchmark_database,
+    parse_sizes,
+    synthetic_submissions,
+    timed,
+)
+
+# submissions posted one by one to extrapolate the cost of POST /students/create
+SINGLE_SAMPLE = 200
+
+
+def run(*args):
+    sizes = parse_sizes(args, [1_000, 10_000])
+    client = APIClient()
+
+    with benchmark_database():
+        seed_resources_db()
+
+        single = synthetic_submissions(SINGLE_SAMPLE, seed=0)
+        _, single_seconds = timed(
+            lambda: [
+                client.post("/api/v1/students/create", s, format="json") for s in single
+            ]
+        )
+
+        print(
+            f"{'submissions':>12} {'create x n (s)':>15} {'bulk (s)':>9} {'speedup':>8}"
+        )
+
+        for size in sizes:
+            submissions = synthetic_submissions(size, seed=size)
+            response, bulk_seconds = timed(
+                lambda: client.post("/api/v1/students/bulk", submissions, format="json")
+            )
+            assert response.data["created"] == size, response.data
+
+            create_seconds = single_seconds / SINGLE_SAMPLE * size
+            print(
+                f"{size:>12} {create_seconds:>15.2f} {bulk_seconds:>9.2f} "
+                f"{create_seconds / bulk_seconds:>7.1f}x"
+            )
@@ -0,0 +1,72 @@
+"""
+Benchmark POST /api/v1/students/create latency (p50/p99) under concurrent load
+against a live threaded server and a file-backed SQLite database
+
+Usage:
+    python manage.py runscript benchmark_create_latency --script-args 1 8 32
+"""
+
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+from ..scripts.seed_db_script import seed_resources_db
+from .benchmark_utils import (
+    benchmark_database,
+    live_server,
+    parse_sizes,
+    synthetic_submissions,
+)
+
+REQUESTS_PER_CLIENT = 100
+
+
+def run(*args):
+    concurrencies = parse_sizes(args, [1, 8, 32])
+    sessions = threading.local()
+
+    def post(url: str, submission: dict) -> float:
+        if not hasattr(sessions, "session"):
+            sessions.session = requests.Session()
+
+        start = time.perf_counter()
+        response = sessions.session.post(url, json=submission)
+        elapsed = time.perf_counter() - start
+
+        assert response.status_code == 201, response.text
+        return elapsed
+
+    with tempfile.TemporaryDirectory() as directory:
+        with benchmark_database(os.path.join(directory, "benchmark.sqlite3")):
+            seed_resources_db()
+
+            print(
+                f"{'clients':>8} {'requests':>9} {'req/s':>8} "
+                f"{'p50 (ms)':>9} {'p99 (ms)':>9}"
+            )
+
+            with live_server() as base_url:
+                url = f"{base_url}/api/v1/students/create"
+
+                for concurrency in concurrencies:
+                    submissions = synthetic_submissions(
+                        concurrency * REQUESTS_PER_CLIENT, seed=concurrency
+                    )
+
+                    start = time.perf_counter()
+                    with ThreadPoolExecutor(concurrency) as executor:
+                        latencies = list(
+                            executor.map(lambda s: post(url, s), submissions)
+                        )
+                    elapsed = time.perf_counter() - start
+
+                    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+                    print(
+                        f"{concurrency:>8} {len(latencies):>9} "
+                        f"{len(latencies) / elapsed:>8.1f} {p50:>9.2f} {p99:>9.2f}"
+                    )
@@ -0,0 +1,69 @@
+"""
+Benchmark filtering responses by student age and gender through the join
+against the denormalized columns on StudentResponse
+
+Usage:
+    python manage.py runscript benchmark_denormalization --script-args 100000 1000000
+"""
+
+from django.db.models import Count
+
+from ..models import StudentResponse
+from ..statistics import severity_band_expression
+from .benchmark_utils import (
+    benchmark_database,
+    insert_synthetic_responses,
+    parse_sizes,
+    timed,
+)
+
+
+def cohort_queries(age_field: str, gender_field: str) -> dict:
+    """
+    Querysets issued by GET /students and the stats views for one cohort
+    """
+    cohort = StudentResponse.objects.filter(
+        **{
+            gender_field: "f",
+            f"{age_field}__gte": 14,
+            f"{age_field}__lte": 18,
+        }
+    )
+    ordered = cohort.order_by("-created_at_utc", "-id")
+
+    return {
+        "first page": lambda: list(ordered.values_list("id")[:10]),
+        "page 100 (offset)": lambda: list(ordered.values_list("id")[990:1000]),
+        "count": lambda: cohort.count(),
+        "severity x gender": lambda: list(
+            StudentResponse.objects.filter(**{f"{age_field}__gte": 14})
+            .annotate(severity=severity_band_expression())
+            .values("severity", gender_field)
+            .annotate(count=Count("id"))
+        ),
+    }
+
+
+def run(*args):
+    sizes = parse_sizes(args, [100_000, 1_000_000])
+
+    print(
+        f"{'rows':>10} {'query':<20} {'join (ms)':>10} {'local (ms)':>11} {'speedup':>8}"
+    )
+
+    with benchmark_database():
+        inserted = 0
+        for size in sizes:
+            insert_synthetic_responses(size - inserted, seed=size)
+            inserted = size
+
+            join = cohort_queries("student__age", "student__gender")
+            local = cohort_queries("age", "gender")
+
+            for name in join:
+                _, join_seconds = timed(join[name], repeat=3)
+                _, local_seconds = timed(local[name], repeat=3)
+                print(
+                    f"{size:>10} {name:<20} {join_seconds * 1000:>10.2f} "
+                    f"{local_seconds * 1000:>11.2f} {join_seconds / local_seconds:>7.1f}x"
+                )
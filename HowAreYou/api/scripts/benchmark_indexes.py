@@ -0,0 +1,100 @@
+"""
+Benchmark query plans and latency of the student filter and ordering paths
+with and without the composite indexes
+
+Usage:
+    python manage.py runscript benchmark_indexes --script-args 1000000
+"""
+
+from datetime import timedelta
+
+from django.db import connection
+from django.utils import timezone
+
+from ..models import StudentResponse
+from ..statistics import aggregate_statistics
+from .benchmark_utils import (
+    benchmark_database,
+    insert_synthetic_responses,
+    parse_sizes,
+    timed,
+)
+
+# cohorts are filtered on age and gender denormalized onto responses
+INDEXED_MODELS = [StudentResponse]
+
+
+def benchmark_queries() -> dict:
+    """
+    Querysets issued by GET /students and GET /students/stats
+    """
+    ordered = StudentResponse.objects.select_related("student").order_by(
+        "-created_at_utc", "-id"
+    )
+    cohort = ordered.filter(gender="f", age__gte=14, age__lte=18)
+    last_week = timezone.now() - timedelta(days=7)
+
+    return {
+        "first page": lambda: list(ordered[:10]),
+        "first page (gender, age)": lambda: list(cohort[:10]),
+        "count (gender, age)": lambda: cohort.count(),
+        "page 1000 (offset)": lambda: list(ordered[9990:10000]),
+        "stats last 7 days": lambda: aggregate_statistics(
+            StudentResponse.objects.filter(created_at_utc__gte=last_week)
+        ),
+    }
+
+
+def explain(name: str) -> str:
+    """
+    Return query plan of benchmark query `name`
+    """
+    ordered = StudentResponse.objects.select_related("student").order_by(
+        "-created_at_utc", "-id"
+    )
+    querysets = {
+        "first page": ordered[:10],
+        "first page (gender, age)": ordered.filter(
+            gender="f", age__gte=14, age__lte=18
+        )[:10],
+        "page 1000 (offset)": ordered[9990:10000],
+    }
+    if name not in querysets:
+        return ""
+    return querysets[name].explain()
+
+
+def measure(label: str) -> None:
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+    print(f"\n--- {label} ---")
+    for name, query in benchmark_queries().items():
+        _, seconds = timed(query, repeat=5)
+        print(f"{name:<28} {seconds * 1000:>10.2f} ms")
+        plan = explain(name)
+        if plan:
+            print("    " + plan.replace("\n", "\n    "))
+
+
+def run(*args):
+    sizes = parse_sizes(args, [1_000_000])
+
+    with benchmark_database():
+        inserted = 0
+        for size in sizes:
+            insert_synthetic_responses(size - inserted, seed=size)
+            inserted = size
+            print(f"\n===== {size} rows =====")
+
+            with connection.schema_editor() as schema_editor:
+                for model in INDEXED_MODELS:
+                    for index in model._meta.indexes:
+                        schema_editor.remove_index(model, index)
+            measure("without indexes")
+
+            with connection.schema_editor() as schema_editor:
+                for model in INDEXED_MODELS:
+                    for index in model._meta.indexes:
+                        schema_editor.add_index(model, index)
+            measure("with indexes")
@@ -0,0 +1,73 @@
+"""
+Benchmark recommending resources from the precomputed alias tables
+against filtering and weighting every resource per request
+
+Usage:
+    python manage.py runscript benchmark_recommendations --script-args 100 10000 100000
+"""
+
+from random import Random
+
+from ..recommendations import RecommendationIndex
+from ..statistics import SEVERITY_BANDS
+from .benchmark_utils import parse_sizes, timed
+
+REQUESTS = 10_000
+
+
+def synthetic_resources(n: int, rng: Random) -> tuple:
+    """
+    Resources tagged with 1 to 3 random severity bands and weights in [1, 10]
+    """
+    bands = [value for value, _, _, _ in SEVERITY_BANDS]
+    return tuple(
+        (
+            f"https://www.example.com/{i}",
+            rng.choice(["article", "video"]),
+            rng.sample(bands, rng.randint(1, 3)),
+            rng.randint(1, 10),
+        )
+        for i in range(n)
+    )
+
+
+def linear_recommend(resources: tuple, severity: str, k: int, rng: Random) -> list:
+    """
+    Filter candidates and draw without replacement with `random.choices`
+    """
+    candidates = [r for r in resources if severity in r[2]]
+    picked = []
+    while candidates and len(picked) < k:
+        resource = rng.choices(candidates, weights=[r[3] for r in candidates])[0]
+        candidates.remove(resource)
+        picked.append({"url": resource[0], "type": resource[1]})
+    return picked
+
+
+def run(*args):
+    sizes = parse_sizes(args, [100, 10_000, 100_000])
+    rng = Random(0)
+    severities = [rng.choice(SEVERITY_BANDS)[0] for _ in range(REQUESTS)]
+
+    print(
+        f"{'resources':>10} {'build (ms)':>11} {'linear (us)':>12} "
+        f"{'alias (us)':>11} {'speedup':>8}"
+    )
+
+    for size in sizes:
+        resources = synthetic_resources(size, rng)
+
+        index, build_seconds = timed(lambda: RecommendationIndex(resources, rng))
+        _, linear_seconds = timed(
+            lambda: [linear_recommend(resources, s, 3, rng) for s in severities]
+        )
+        _, alias_seconds = timed(
+            lambda: [index.recommend(s, 3) for s in severities], repeat=3
+        )
+
+        linear_us = linear_seconds / REQUESTS * 1e6
+        alias_us = alias_seconds / REQUESTS * 1e6
+        print(
+            f"{size:>10} {build_seconds * 1000:>11.2f} {linear_us:>12.2f} "
+            f"{alias_us:>11.2f} {linear_us / alias_us:>7.1f}x"
+        )
@@ -0,0 +1,76 @@
+"""
+Benchmark seeding students and responses from `data.csv`-shaped files
+
+Rows of data/data.csv are resampled into a file of every size,
+seeded into a fresh file database, then seeded again. Memory while seeding
+should not grow with size, files are streamed `SEED_CHUNK_SIZE` rows at a time,
+and seeding again should only read the file and check which rows exist.
+
+Usage:
+    python manage.py runscript benchmark_seed --script-args 100000 1000000
+"""
+
+import os
+import tempfile
+
+import pandas as pd
+
+from ..models import StudentResponse
+from .benchmark_utils import benchmark_database, parse_sizes, timed
+from .seed_db_script import RELATIVE_CSV_PATHS, seed_students_and_responses_db
+
+# rows of the benchmark file written at once
+WRITE_PART_SIZE = 100_000
+
+
+def current_rss_mb() -> float:
+    """
+    Return resident memory of this process (Linux only)
+    """
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def write_sample(data: pd.DataFrame, path: str, size: int) -> None:
+    """
+    Write `size` rows resampled from `data`, in parts to keep memory bounded
+    """
+    for part, start in enumerate(range(0, size, WRITE_PART_SIZE)):
+        data.sample(
+            min(WRITE_PART_SIZE, size - start), replace=True, random_state=size + part
+        ).to_csv(path, mode="a", header=part == 0, index=False)
+
+
+def run(*args):
+    sizes = parse_sizes(args, [10_000, 100_000])
+    data = pd.read_csv(RELATIVE_CSV_PATHS["data"])
+
+    print(
+        f"{'rows':>10} {'seconds':>8} {'rows/s':>9} {'max rss (MB)':>13} "
+        f"{'reseed (s)':>11}"
+    )
+
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "data.csv")
+            write_sample(data, path, size)
+            samples = []
+
+            # a fresh file database per size, as in production
+            with benchmark_database(os.path.join(directory, "db.sqlite3")):
+                _, seconds = timed(
+                    lambda: seed_students_and_responses_db(
+                        path, progress=lambda rows, _: samples.append(current_rss_mb())
+                    )
+                )
+                assert StudentResponse.objects.count() == size
+
+                totals, reseed_seconds = timed(
+                    lambda: seed_students_and_responses_db(path)
+                )
+                assert totals["created"] == 0
+
+        print(
+            f"{size:>10} {seconds:>8.2f} {size / seconds:>9.0f} "
+            f"{max(samples):>13.0f} {reseed_seconds:>11.2f}"
+        )
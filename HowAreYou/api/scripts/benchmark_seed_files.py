@@ -0,0 +1,47 @@
+"""
+Benchmark seeding a directory of `data.csv`-shaped files one after another
+against parsing them in a process pool while a single writer inserts them
+
+Usage:
+    python manage.py runscript benchmark_seed_files --script-args 8 100000
+    (number of files, rows per file)
+"""
+
+import os
+import tempfile
+
+import pandas as pd
+
+from .benchmark_seed import write_sample
+from .benchmark_utils import benchmark_database, timed
+from .seed_db_script import (
+    RELATIVE_CSV_PATHS,
+    resolve_csv_paths,
+    seed_students_and_responses_db,
+    seed_students_and_responses_files,
+)
+
+
+def run(*args):
+    files, rows = (int(arg) for arg in args) if args else (8, 50_000)
+    data = pd.read_csv(RELATIVE_CSV_PATHS["data"])
+
+    with tempfile.TemporaryDirectory() as directory:
+        for i in range(files):
+            # a different size per file so that samples differ
+            write_sample(data, os.path.join(directory, f"{i:03}.csv"), rows + i)
+        paths = resolve_csv_paths(directory)
+        total_rows = sum(rows + i for i in range(files))
+
+        print(f"{files} files, {total_rows} rows, {os.cpu_count()} cpu(s)")
+        print(f"{'mode':>12} {'seconds':>8} {'rows/s':>9}")
+
+        runs = {
+            "sequential": lambda: [seed_students_and_responses_db(p) for p in paths],
+            "pool": lambda: seed_students_and_responses_files(paths),
+        }
+        for mode, seed in runs.items():
+            database = os.path.join(directory, f"{mode}.sqlite3")
+            with benchmark_database(database):
+                _, seconds = timed(seed)
+            print(f"{mode:>12} {seconds:>8.2f} {total_rows / seconds:>9.0f}")
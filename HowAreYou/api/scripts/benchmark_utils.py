@@ -0,0 +1,157 @@
+"""
+Helpers shared by benchmark scripts
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from uuid import uuid4
+
+import numpy as np
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.core.wsgi import get_wsgi_application
+from django.db import connection, transaction
+from django.utils import timezone
+
+from ..models import Student, StudentResponse
+
+
+@contextmanager
+def benchmark_database(name: str | None = None):
+    """
+    Run the benchmark against a throwaway test database.
+
+    Pass a file `name` when other threads must share the database,
+    SQLite test databases are in memory by default.
+    """
+    test_settings = connection.settings_dict["TEST"]
+    old_test_name = test_settings["NAME"]
+    test_settings["NAME"] = name or old_test_name
+
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        test_settings["NAME"] = old_test_name
+
+
+class QuietWSGIRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def live_server():
+    """
+    Serve the WSGI application from a thread and yield its base url
+    """
+    server = ThreadedWSGIServer(("127.0.0.1", 0), QuietWSGIRequestHandler)
+    server.set_app(get_wsgi_application())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@contextmanager
+def backdated_created_at():
+    """
+    Allow `bulk_create()` to keep explicit `created_at_utc` values
+    """
+    fields = [
+        Student._meta.get_field("created_at_utc"),
+        StudentResponse._meta.get_field("created_at_utc"),
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def insert_synthetic_responses(
+    n: int, seed: int = 0, batch_size: int = 10_000, days: int = 365
+) -> None:
+    """
+    Insert `n` random students and responses created over the last `days` days
+    """
+    rng = np.random.default_rng(seed)
+    now = timezone.now()
+
+    with transaction.atomic(), backdated_created_at():
+        for start in range(0, n, batch_size):
+            size = min(batch_size, n - start)
+            answers = rng.integers(0, 4, size=(size, 9)).tolist()
+            ages = rng.integers(12, 25, size=size).tolist()
+            genders = rng.choice(["m", "f", "o"], size=size, p=[0.45, 0.45, 0.1])
+            offsets = rng.integers(0, days * 24 * 60 * 60 + 1, size=size).tolist()
+
+            students, responses = [], []
+            for i in range(size):
+                created_at_utc = now - timedelta(seconds=offsets[i])
+                student = Student(
+                    id=uuid4(),
+                    age=ages[i],
+                    gender=str(genders[i]),
+                    created_at_utc=created_at_utc,
+                )
+                students.append(student)
+                responses.append(
+                    StudentResponse(
+                        **{f"q{q + 1}_resp": a for q, a in enumerate(answers[i])},
+                        score=sum(answers[i]),
+                        student=student,
+                        age=student.age,
+                        gender=student.gender,
+                        created_at_utc=created_at_utc,
+                    )
+                )
+
+            Student.objects.bulk_create(students, batch_size=batch_size)
+            StudentResponse.objects.bulk_create(responses, batch_size=batch_size)
+
+
+def timed(fn, repeat: int = 1) -> tuple:
+    """
+    Return result of `fn()` and its best wall time in seconds over `repeat` runs
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return result, best
+
+
+def parse_sizes(args, default: list[int]) -> list[int]:
+    """
+    Parse row counts passed with `--script-args`
+    """
+    return sorted(int(a) for a in args) if args else default
+
+
+def synthetic_submissions(n: int, seed: int = 0) -> list[dict]:
+    """
+    Return `n` random request bodies of POST /api/v1/students/create
+    """
+    rng = np.random.default_rng(seed)
+    answers = rng.integers(0, 4, size=(n, 9)).tolist()
+    ages = rng.integers(12, 25, size=n).tolist()
+    genders = rng.choice(["m", "f", "o"], size=n).tolist()
+
+    return [
+        {
+            "student": {"age": ages[i], "gender": genders[i]},
+            **{f"q{q + 1}_resp": a for q, a in enumerate(answers[i])},
+        }
+        for i in range(n)
+    ]
@@ -2,12 +2,27 @@
 Seed database script
 """
 
+import glob
+import os
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
 import pandas as pd
+import numpy as np
 from pathlib import Path as p
-import json
-from uuid import uuid4
+from uuid import UUID
+
+import django
+from django.db import connection, transaction
+from django.utils import timezone
 
 from ..models import Student, StudentResponse, Resource
+from ..cache import bump_statistics_generation
+from ..rollups import record_response_groups
+from ..resource_pool import resource_pool
+from ..statistics import QUESTION_FIELDS
 
 CURRENT_PATH = p.cwd()
 DATA_PATH = str(CURRENT_PATH.parent) + "/data"
@@ -17,95 +32,441 @@ RELATIVE_CSV_PATHS = {
     "resources": DATA_PATH + "/resources.csv",
 }
 
+# number of rows prepared and inserted at once
+SEED_CHUNK_SIZE = 10_000
+
+# SQLite page cache while seeding, negative values are in KiB
+SEED_SQLITE_CACHE_SIZE = -64 * 1024
+
+# map existing csv column names to column names suitable for model
+COLUMN_RENAME_MAPPING = {
+    "PHQ9 score": "score",
+    "Gender": "gender",
+    "Age": "age",
+    "q1": "q1_resp",
+    "q2": "q2_resp",
+    "q3": "q3_resp",
+    "q4": "q4_resp",
+    "q5": "q5_resp",
+    "q6": "q6_resp",
+    "q7": "q7_resp",
+    "q8": "q8_resp",
+    "q9": "q9_resp",
+}
+
+# map existing csv column values to values suitable for model
+CSV_GENDER_MAPPING = {"Female": "f", "Male": "m"}
+
+# keys (16 characters) of the two hashes making up ids of seeded students,
+# changing them changes every id and re-seeds every row
+CONTENT_ID_HASH_KEYS = ["howareyou-seed-1", "howareyou-seed-2"]
+
+# inclusive ranges of seeded values, checked before the model constraints
+SEED_VALUE_RANGES = {
+    "age": (12, 24),
+    **{field: (0, 3) for field in QUESTION_FIELDS},
+    "score": (0, 27),
+}
+
 
-def prepare_data(filename: str) -> list[dict]:
+def content_uuid_hex(content: pd.DataFrame) -> list[str]:
+    """
+    Return a deterministic UUID (version 8) as hex string for every row of `content`,
+    made of two 64-bit hashes of the row computed on whole columns
     """
-    Reads CSV file path, prepares data and
-      returns list of objects suitable for `bulk_create()`
+    halves = [
+        pd.util.hash_pandas_object(content, index=False, hash_key=key).to_numpy()
+        for key in CONTENT_ID_HASH_KEYS
+    ]
+    raw = np.column_stack(halves).astype(">u8").view(np.uint8).reshape(-1, 16).copy()
+    raw[:, 6] = raw[:, 6] & 0x0F | 0x80
+    raw[:, 8] = raw[:, 8] & 0x3F | 0x80
+    digits = raw.tobytes().hex()
+
+    return [digits[i : i + 32] for i in range(0, len(digits), 32)]
+
+
+class RowOccurrences:
+    """
+    Count rows of a file by content hash, to number identical rows.
+
+    Hashes seen so far are kept in sorted arrays of decreasing sizes,
+    merged like the digits of a binary counter, so that memory is 8 bytes
+    per row and counting a chunk takes a few binary searches per row.
+    """
+
+    def __init__(self):
+        self.levels: list[np.ndarray] = []
+
+    def record(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Record `hashes` of a chunk and return, for every row,
+        the number of identical rows before it in the file
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        occurrences = pd.Series(hashes).groupby(hashes).cumcount().to_numpy()
+
+        for level in self.levels:
+            occurrences += np.searchsorted(level, hashes, side="right")
+            occurrences -= np.searchsorted(level, hashes, side="left")
+
+        merged = np.sort(hashes)
+        while self.levels and len(self.levels[-1]) <= len(merged):
+            merged = np.sort(np.concatenate([self.levels.pop(), merged]))
+        self.levels.append(merged)
+
+        return occurrences
+
+
+def read_students_csv(path: str, chunk_size: int = SEED_CHUNK_SIZE):
+    """
+    Read a `data.csv`-shaped file `chunk_size` rows at a time
+    """
+    return pd.read_csv(path, chunksize=chunk_size)
+
+
+def prepare_students_frame(
+    df: pd.DataFrame, occurrences: RowOccurrences | None = None
+) -> pd.DataFrame:
+    """
+    Rename `data.csv` columns, validate values, map genders and derive hex ids,
+    operating on whole columns.
+
+    Ids are hashes of the row content and of the number of identical rows
+    before it in the file, counted by `occurrences` shared by the chunks of
+    a file, so that re-seeding a file with rows added or removed anywhere
+    derives the same ids for the rows already seeded. Identical rows are
+    different students. Columns that are not seeded, like `Institute`,
+    are hashed too.
+    """
+    df = df.rename(columns=COLUMN_RENAME_MAPPING)
+    missing = [
+        column for column in COLUMN_RENAME_MAPPING.values() if column not in df.columns
+    ]
+    if missing:
+        raise ValueError(f"Missing column(s) in csv: {', '.join(missing)}")
+
+    numbers = df[list(SEED_VALUE_RANGES)].apply(pd.to_numeric, errors="coerce")
+    genders = df["gender"].map(CSV_GENDER_MAPPING)
+    invalid = genders.isna()
+    for column, (low, high) in SEED_VALUE_RANGES.items():
+        invalid |= ~numbers[column].between(low, high)
+
+    if invalid.any():
+        # index counts data rows from 0, after the header line
+        lines = (df.index[invalid] + 2).tolist()
+        raise ValueError(
+            f"Invalid value(s) in csv on line(s): {', '.join(map(str, lines[:10]))}"
+            + (f" and {len(lines) - 10} more" if len(lines) > 10 else "")
+        )
+
+    frame = numbers.astype("int64").assign(gender=genders)
+    other_columns = sorted(
+        column for column in df.columns if column not in COLUMN_RENAME_MAPPING.values()
+    )
+    content = pd.concat(
+        [frame[["gender", *SEED_VALUE_RANGES]], df[other_columns].astype(str)],
+        axis=1,
+    )
+    occurrence = (occurrences or RowOccurrences()).record(
+        pd.util.hash_pandas_object(content, index=False).to_numpy()
+    )
+
+    return frame.assign(id=content_uuid_hex(content.assign(occurrence=occurrence)))
+
+
+def prepare_students_frames(chunks):
+    """
+    Prepare chunks of a `data.csv`-shaped file, see `prepare_students_frame()`,
+    numbering identical rows across chunks
+    """
+    occurrences = RowOccurrences()
+    for df in chunks:
+        yield prepare_students_frame(df, occurrences)
+
+
+# columns inserted by seeding, in the order of the rows built for them
+STUDENT_INSERT_FIELDS = ["id", "gender", "age", "created_at_utc", "updated_at_utc"]
+RESPONSE_INSERT_FIELDS = [
+    *QUESTION_FIELDS,
+    "score",
+    "student",
+    "gender",
+    "age",
+    "created_at_utc",
+    "updated_at_utc",
+]
+
+
+def prepare_student_rows(frame: pd.DataFrame) -> tuple[list, list, list]:
+    """
+    Return database-ready rows of students and their responses of a prepared frame,
+    in the order of the insert fields,
+    with (score, gender, age, created date, count) groups of the responses
+    """
+    created_at_utc = timezone.now()
+    now = Student._meta.get_field("created_at_utc").get_db_prep_save(
+        created_at_utc, connection
+    )
+    ids = db_student_ids(frame["id"].tolist())
+    genders = frame["gender"].tolist()
+    ages = frame["age"].tolist()
+    answers = frame[[*QUESTION_FIELDS, "score"]].to_numpy().tolist()
+
+    student_rows = [
+        (id, gender, age, now, now) for id, gender, age in zip(ids, genders, ages)
+    ]
+    response_rows = [
+        (*row_answers, id, gender, age, now, now)
+        for row_answers, id, gender, age in zip(answers, ids, genders, ages)
+    ]
+    date = timezone.localdate(created_at_utc)
+    response_groups = [
+        (score, gender, age, date, count)
+        for (score, gender, age), count in frame.groupby(["score", "gender", "age"])
+        .size()
+        .items()
+    ]
+
+    return student_rows, response_rows, response_groups
+
+
+def db_student_ids(ids: list[str]) -> list:
+    """
+    Return hex `ids` as stored by the database: hex strings,
+    or UUIDs on databases with a native uuid type
+    """
+    if connection.features.has_native_uuid_field:
+        return [UUID(id) for id in ids]
+    return ids
+
+
+def existing_student_ids(ids: list[str]) -> set[str]:
+    """
+    Return hex `ids` of students already in db, checked in batches
+    that fit the query parameter limit of the database
+    """
+    qn = connection.ops.quote_name
+    batch_size = connection.features.max_query_params or len(ids) or 1
+    existing = set()
+
+    with connection.cursor() as cursor:
+        for start in range(0, len(ids), batch_size):
+            batch = db_student_ids(ids[start : start + batch_size])
+            cursor.execute(
+                "SELECT {} FROM {} WHERE {} IN ({})".format(
+                    qn(Student._meta.pk.column),
+                    qn(Student._meta.db_table),
+                    qn(Student._meta.pk.column),
+                    ", ".join(["%s"] * len(batch)),
+                ),
+                batch,
+            )
+            existing.update(
+                id.hex if isinstance(id, UUID) else id for (id,) in cursor.fetchall()
+            )
+
+    return existing
+
+
+def insert_rows(model, field_names: list[str], rows: list[tuple]) -> None:
+    """
+    Insert database-ready `rows` of `field_names` into the table of `model`
+    with a single prepared statement
+    """
+    qn = connection.ops.quote_name
+    columns = [model._meta.get_field(name).column for name in field_names]
+    sql = "INSERT INTO {} ({}) VALUES ({})".format(
+        qn(model._meta.db_table),
+        ", ".join(qn(column) for column in columns),
+        ", ".join(["%s"] * len(columns)),
+    )
+
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
+
+
+@contextmanager
+def seeding_cache():
+    """
+    Enlarge the SQLite page cache while seeding, random UUID keys touch
+    index pages all over the tables and thrash the default 2 MB cache
+    """
+    if connection.vendor != "sqlite":
+        yield
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA cache_size")
+        (old_cache_size,) = cursor.fetchone()
+        cursor.execute(f"PRAGMA cache_size = {SEED_SQLITE_CACHE_SIZE}")
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA cache_size = {old_cache_size}")
+
+
+def prepare_data(filename: str) -> pd.DataFrame | list[Resource]:
+    """
+    Reads CSV file path and prepares data:
+        `data`: frame of students and responses, see `prepare_students_frame()`
+        `resources`: list of objects suitable for `bulk_create()`
     """
     df = pd.read_csv(RELATIVE_CSV_PATHS[filename])
 
     # prepare `data.csv`
     if filename == "data":
-        students_output: list[Student] = []
-        responses_output: list[StudentResponse] = []
-
-        # map existing csv column names to column names suitable for model
-        column_rename_mapping = {
-            "PHQ9 score": "score",
-            "Gender": "gender",
-            "Age": "age",
-            "q1": "q1_resp",
-            "q2": "q2_resp",
-            "q3": "q3_resp",
-            "q4": "q4_resp",
-            "q5": "q5_resp",
-            "q6": "q6_resp",
-            "q7": "q7_resp",
-            "q8": "q8_resp",
-            "q9": "q9_resp",
-        }
-
-        # map existing csv column values to values suitable for model
-        gender_mapping = {"Female": "f", "Male": "m"}
-
-        data_df_copy = df.copy()
-        data_df_copy.drop(["Institute"], axis=1, inplace=True)
-        data_df_copy = data_df_copy.rename(columns=column_rename_mapping)
-
-        # iterate through data
-        for ind, _ in data_df_copy.iterrows():
-            r = data_df_copy.iloc[ind,]
-
-            # format json
-            json_r = json.loads(r.to_json())
-            json_r["gender"] = gender_mapping[json_r["gender"]]
-            json_r["id"] = str(uuid4())
-            student_obj = Student(
-                id=json_r["id"], age=json_r["age"], gender=json_r["gender"]
-            )
-
-            # Add Student object
-            students_output.append(student_obj)
-
-            # Add StudentResponse object
-            responses_output.append(
-                StudentResponse(
-                    q1_resp=json_r["q1_resp"],
-                    q2_resp=json_r["q2_resp"],
-                    q3_resp=json_r["q3_resp"],
-                    q4_resp=json_r["q4_resp"],
-                    q5_resp=json_r["q5_resp"],
-                    q6_resp=json_r["q6_resp"],
-                    q7_resp=json_r["q7_resp"],
-                    q8_resp=json_r["q8_resp"],
-                    q9_resp=json_r["q9_resp"],
-                    score=json_r["score"],
-                    student=student_obj,
-                )
-            )
-        return students_output, responses_output
+        return prepare_students_frame(df)
 
     # prepare resources.csv
-    elif filename == "resources":
-        resources_output: list[Resource] = []
-        resources_df_copy = df.copy()
-        for ind, _ in resources_df_copy.iterrows():
-            r = resources_df_copy.iloc[ind,]
-            json_r = json.loads(r.to_json())
-            resources_output.append(Resource(url=json_r["url"], type=json_r["type"]))
-    return resources_output
+    # seeded resources are curated, they are served without verification
+    return [
+        Resource(url=url, type=type, status=Resource.VERIFIED)
+        for url, type in zip(df["url"].tolist(), df["type"].tolist())
+    ]
 
 
-def seed_students_and_responses_db() -> None:
+def write_students_frames(frames, progress=None) -> dict[str, int]:
     """
-    Seed students and responses database
+    Insert students and responses of prepared frames in a single transaction,
+    skipping rows already seeded.
+    `progress(rows, seconds)` is called after every frame.
+    Return number of rows read and of rows created.
+
+    Rows are inserted with `executemany()` rather than `bulk_create()`,
+    which spends most of its time preparing every value of every object.
     """
-    processed_data_students, processed_data_responses = prepare_data("data")
-    Student.objects.bulk_create(processed_data_students)
+    totals = {"rows": 0, "created": 0}
+    # recorded once at the end, there are few distinct groups
+    response_groups = Counter()
+    start = time.perf_counter()
+
+    with transaction.atomic(), seeding_cache():
+        for frame in frames:
+            rows = len(frame)
+            frame = frame[~frame["id"].isin(existing_student_ids(frame["id"].tolist()))]
+
+            if len(frame):
+                student_rows, response_rows, chunk_groups = prepare_student_rows(frame)
+                insert_rows(Student, STUDENT_INSERT_FIELDS, student_rows)
+                insert_rows(StudentResponse, RESPONSE_INSERT_FIELDS, response_rows)
+                for *group, count in chunk_groups:
+                    response_groups[tuple(group)] += count
+
+            totals["rows"] += rows
+            totals["created"] += len(frame)
+            if progress is not None:
+                progress(totals["rows"], time.perf_counter() - start)
 
-    StudentResponse.objects.bulk_create(processed_data_responses)
+        record_response_groups(
+            (*group, count) for group, count in response_groups.items()
+        )
+
+    if totals["created"]:
+        bump_statistics_generation()
+    return totals
+
+
+def seed_students_and_responses_db(
+    path: str = RELATIVE_CSV_PATHS["data"],
+    chunk_size: int = SEED_CHUNK_SIZE,
+    progress=None,
+) -> dict[str, int]:
+    """
+    Seed students and responses database from a `data.csv`-shaped file,
+    streaming it `chunk_size` rows at a time into a single transaction
+    so that memory does not grow with the file.
+    Rows already seeded are skipped, re-seeding an unchanged file inserts nothing.
+    `progress(rows, seconds)` is called after every chunk.
+    Return number of rows read and of rows created.
+    """
+    totals = write_students_frames(
+        prepare_students_frames(read_students_csv(path, chunk_size)), progress
+    )
     print("seed_students_and_responses_db:: completed!")
+    return totals
+
+
+def resolve_csv_paths(path: str) -> list[str]:
+    """
+    Return sorted csv files of `path`: a file, a directory or a glob pattern
+    """
+    if os.path.isdir(path):
+        return sorted(glob.glob(os.path.join(path, "*.csv")))
+    if os.path.isfile(path):
+        return [path]
+    return sorted(glob.glob(path))
+
+
+def parse_students_file(
+    path: str, chunk_size: int = SEED_CHUNK_SIZE
+) -> tuple[list[pd.DataFrame], float]:
+    """
+    Read and prepare every chunk of a `data.csv`-shaped file without touching
+    the database, so that it can run in a worker process.
+    Return prepared frames and seconds spent.
+    """
+    start = time.perf_counter()
+    try:
+        frames = list(prepare_students_frames(read_students_csv(path, chunk_size)))
+    except ValueError as exc:
+        raise ValueError(f"{path}: {exc}") from exc
+
+    return frames, time.perf_counter() - start
+
+
+def seed_students_and_responses_files(
+    paths: list[str],
+    chunk_size: int = SEED_CHUNK_SIZE,
+    workers: int | None = None,
+    report=None,
+) -> dict[str, int]:
+    """
+    Seed students and responses database from `data.csv`-shaped files.
+
+    Files are parsed and validated by a pool of `workers` processes,
+    while this process alone writes them in order, one transaction per file.
+    At most twice as many files as workers are parsed ahead of the writer,
+    so memory grows with the largest files rather than with their number.
+    `report(path, file_totals)` is called after every file with its rows,
+    rows created, and seconds spent parsing and writing it.
+    Return number of rows read and of rows created in every file.
+    """
+    workers = workers or os.cpu_count() or 1
+    totals = {"rows": 0, "created": 0}
+    remaining = iter(paths)
+    parsing = deque()
+
+    def submit_next(executor) -> None:
+        path = next(remaining, None)
+        if path is not None:
+            parsing.append(
+                (path, executor.submit(parse_students_file, path, chunk_size))
+            )
+
+    # workers set up django, models are imported by this module
+    with ProcessPoolExecutor(workers, initializer=django.setup) as executor:
+        for _ in range(2 * workers):
+            submit_next(executor)
+
+        while parsing:
+            path, future = parsing.popleft()
+            frames, parse_seconds = future.result()
+            submit_next(executor)
+
+            start = time.perf_counter()
+            file_totals = write_students_frames(frames)
+            file_totals["parse_seconds"] = parse_seconds
+            file_totals["write_seconds"] = time.perf_counter() - start
+
+            totals["rows"] += file_totals["rows"]
+            totals["created"] += file_totals["created"]
+            if report is not None:
+                report(path, file_totals)
+
+    print("seed_students_and_responses_files:: completed!")
+    return totals
 
 
 def seed_resources_db() -> None:
@@ -114,5 +475,7 @@ def seed_resources_db() -> None:
     """
 
     processed_data_resources: list[Resource] = prepare_data("resources")
-    Resource.objects.bulk_create(processed_data_resources)
+    # resources already seeded are skipped by their unique url
+    Resource.objects.bulk_create(processed_data_resources, ignore_conflicts=True)
+    resource_pool.invalidate_on_commit()
     print("seed_resources_db:: completed!")
@@ -0,0 +1,285 @@
+"""
+Fit and generate synthetic `data.csv`-shaped datasets
+"""
+
+import time
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from .seed_db_script import (
+    SEED_CHUNK_SIZE,
+    prepare_students_frames,
+    write_students_frames,
+)
+
+CSV_QUESTION_COLUMNS = [f"q{i}" for i in range(1, 10)]
+
+# columns drawn from a gaussian copula fitted per gender
+COPULA_COLUMNS = ["Age", *CSV_QUESTION_COLUMNS]
+
+# columns of generated rows, in the order of `data.csv`
+CSV_COLUMNS = ["Gender", "Age", *CSV_QUESTION_COLUMNS, "PHQ9 score", "Institute"]
+
+# smallest eigenvalue kept when making a fitted correlation matrix positive definite
+MIN_EIGENVALUE = 1e-6
+
+STANDARD_NORMAL = NormalDist()
+
+
+def fit_normal_scores(column: pd.Series) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Return distinct values of a discrete `column`, the standard normal thresholds
+    cutting a normal variable into these values with their observed shares,
+    and the normal score of every value (midpoint of its quantile range)
+    """
+    values, counts = np.unique(column.to_numpy(), return_counts=True)
+    cdf = np.cumsum(counts) / counts.sum()
+    # clipped away from 0 and 1, where the inverse cdf is infinite
+    clip = lambda p: min(max(p, 1e-12), 1 - 1e-12)
+
+    thresholds = np.array([STANDARD_NORMAL.inv_cdf(clip(p)) for p in cdf[:-1]])
+    midpoints = np.array(
+        [STANDARD_NORMAL.inv_cdf(clip(p)) for p in cdf - counts / counts.sum() / 2]
+    )
+
+    return values, thresholds, midpoints
+
+
+def normal_scores_correlation(
+    columns: np.ndarray, values: list, midpoints: list
+) -> np.ndarray:
+    """
+    Return correlation matrix of the normal scores of discrete `columns`
+    """
+    scores = np.column_stack(
+        [
+            score[np.searchsorted(value, column)]
+            for column, value, score in zip(columns.T, values, midpoints)
+        ]
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.nan_to_num(np.corrcoef(scores.T))
+
+
+def positive_definite_cholesky(correlation: np.ndarray) -> np.ndarray:
+    """
+    Return cholesky factor of the nearest positive definite correlation matrix
+    """
+    correlation = correlation.copy()
+    np.fill_diagonal(correlation, 1)
+    eigenvalues, eigenvectors = np.linalg.eigh(correlation)
+    correlation = (
+        eigenvectors * np.maximum(eigenvalues, MIN_EIGENVALUE)
+    ) @ eigenvectors.T
+    scale = np.sqrt(np.diag(correlation))
+
+    return np.linalg.cholesky(correlation / np.outer(scale, scale))
+
+
+def draw_columns(copula: dict, normals: np.ndarray) -> np.ndarray:
+    """
+    Return discrete columns of a fitted `copula` drawn from independent `normals`
+    """
+    correlated = normals @ copula["cholesky"].T
+
+    return np.column_stack(
+        [
+            values[np.searchsorted(thresholds, correlated[:, column])]
+            for column, (values, thresholds) in enumerate(
+                zip(copula["values"], copula["thresholds"])
+            )
+        ]
+    )
+
+
+class SyntheticModel:
+    """
+    Gaussian copula of age and answers to every question, fitted per gender.
+
+    Rows are generated by drawing a gender with its share of the source,
+    correlated normals cut at thresholds reproducing the distribution of
+    age and of every answer for that gender, and an institute with its
+    share within the gender. Scores are the sum of answers, as computed
+    by the API.
+
+    Cutting normals into a few answers weakens their correlation, so the
+    correlation of the normals is calibrated on simulated rows until
+    answers are as correlated as in the source.
+    """
+
+    # calibration passes and simulated rows per pass
+    CALIBRATION_ROUNDS = 4
+    CALIBRATION_SIZE = 50_000
+
+    def __init__(self, genders: list[str], gender_shares: np.ndarray, copulas: dict):
+        self.genders = genders
+        self.gender_cdf = np.cumsum(gender_shares)
+        self.copulas = copulas
+
+    @classmethod
+    def fit(cls, df: pd.DataFrame) -> "SyntheticModel":
+        """
+        Fit model to a `data.csv`-shaped frame
+        """
+        if "Institute" not in df.columns:
+            df = df.assign(Institute="")
+
+        copulas = {}
+        gender_counts = df["Gender"].value_counts().sort_index()
+        calibration_normals = np.random.default_rng(0).standard_normal(
+            (cls.CALIBRATION_SIZE, len(COPULA_COLUMNS))
+        )
+
+        for gender in gender_counts.index:
+            group = df[df["Gender"] == gender]
+            values, thresholds, midpoints = zip(
+                *(fit_normal_scores(group[column]) for column in COPULA_COLUMNS)
+            )
+            institutes = group["Institute"].value_counts().sort_index()
+
+            target = normal_scores_correlation(
+                group[COPULA_COLUMNS].to_numpy(), values, midpoints
+            )
+            correlation = target.copy()
+            copula = {
+                "values": values,
+                "thresholds": thresholds,
+                "cholesky": positive_definite_cholesky(correlation),
+                "institutes": institutes.index.to_numpy(dtype=object),
+                "institute_cdf": np.cumsum(institutes.to_numpy()) / len(group),
+            }
+
+            for _ in range(cls.CALIBRATION_ROUNDS):
+                simulated = normal_scores_correlation(
+                    draw_columns(copula, calibration_normals), values, midpoints
+                )
+                correlation = np.clip(correlation + target - simulated, -1, 1)
+                copula["cholesky"] = positive_definite_cholesky(correlation)
+
+            copulas[gender] = copula
+
+        return cls(
+            list(gender_counts.index),
+            gender_counts.to_numpy() / gender_counts.sum(),
+            copulas,
+        )
+
+    def generate(self, n: int, seed: int = 0, chunk_size: int = SEED_CHUNK_SIZE):
+        """
+        Yield `n` synthetic `data.csv`-shaped rows, `chunk_size` rows at a time.
+
+        Every random stream is consumed in order,
+        so a seed generates the same rows whatever the chunk size.
+        Frames are indexed by row number across chunks.
+        """
+        gender_rng, normal_rng, institute_rng = (
+            np.random.default_rng(child)
+            for child in np.random.SeedSequence(seed).spawn(3)
+        )
+
+        for start in range(0, n, chunk_size):
+            size = min(chunk_size, n - start)
+            gender_index = np.minimum(
+                np.searchsorted(self.gender_cdf, gender_rng.random(size), side="right"),
+                len(self.genders) - 1,
+            )
+            normals = normal_rng.standard_normal((size, len(COPULA_COLUMNS)))
+            institute_draws = institute_rng.random(size)
+
+            columns = np.empty((size, len(COPULA_COLUMNS)), dtype=np.int64)
+            institutes = np.empty(size, dtype=object)
+
+            for index, gender in enumerate(self.genders):
+                rows = gender_index == index
+                copula = self.copulas[gender]
+
+                columns[rows] = draw_columns(copula, normals[rows])
+                institutes[rows] = copula["institutes"][
+                    np.minimum(
+                        np.searchsorted(
+                            copula["institute_cdf"],
+                            institute_draws[rows],
+                            side="right",
+                        ),
+                        len(copula["institutes"]) - 1,
+                    )
+                ]
+
+            frame = pd.DataFrame(
+                columns,
+                columns=COPULA_COLUMNS,
+                index=pd.RangeIndex(start, start + size),
+            )
+            frame.insert(
+                0, "Gender", np.array(self.genders, dtype=object)[gender_index]
+            )
+            frame["PHQ9 score"] = frame[CSV_QUESTION_COLUMNS].sum(axis=1)
+            frame["Institute"] = institutes
+
+            yield frame[CSV_COLUMNS]
+
+
+def write_db(frames, seed: int, progress=None) -> dict[str, int]:
+    """
+    Insert generated frames as students and responses, see `write_students_frames()`.
+    The seed is hashed into ids along with row content, so generating again
+    with the same seed inserts nothing while other seeds add new students.
+    """
+    return write_students_frames(
+        prepare_students_frames(frame.assign(Seed=seed) for frame in frames),
+        progress,
+    )
+
+
+def write_csv(frames, path: str, progress=None) -> int:
+    """
+    Write generated frames to a csv file shaped like `data.csv`, frame by frame.
+    `progress(rows, seconds)` is called after every frame.
+    Return number of rows written.
+    """
+    rows = 0
+    start = time.perf_counter()
+
+    for frame in frames:
+        frame.to_csv(
+            path, mode="w" if rows == 0 else "a", header=rows == 0, index=False
+        )
+        rows += len(frame)
+        if progress is not None:
+            progress(rows, time.perf_counter() - start)
+
+    return rows
+
+
+def write_parquet(frames, path: str, progress=None) -> int:
+    """
+    Write generated frames to a parquet file, one row group per frame.
+    `progress(rows, seconds)` is called after every frame.
+    Return number of rows written.
+
+    Requires `pyarrow`, which is not part of requirements.txt.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    rows = 0
+    writer = None
+    start = time.perf_counter()
+
+    try:
+        for frame in frames:
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+
+            rows += len(frame)
+            if progress is not None:
+                progress(rows, time.perf_counter() - start)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return rows
@@ -3,12 +3,46 @@ Serializer for API
 """
 
 from rest_framework import serializers
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 from .models import Student, StudentResponse, Resource
+from .rollups import record_responses
+from .statistics import QUESTION_FIELDS, SEVERITY_BANDS
+from .verification import verification_worker
 from uuid import uuid4
-import requests as re
 from rest_framework.validators import UniqueValidator
 
 
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    List serializer validating every item with a single child serializer,
+    collecting per-item errors instead of failing the whole list.
+    Invalid items are validated to None, with their errors in `item_errors`.
+    """
+
+    def to_internal_value(self, data):
+        self.item_errors = []
+        return super().to_internal_value(data)
+
+    def run_child_validation(self, data):
+        """
+        Return validated item, or None and record its errors
+        """
+        try:
+            validated = self.child.run_validation(data)
+        except serializers.ValidationError as exc:
+            self.item_errors.append(exc.detail)
+            return None
+
+        self.item_errors.append({})
+        return validated
+
+    def save(self, **kwargs):
+        self.instance = self.create(self.validated_data)
+        return self.instance
+
+
 class GetResourceParamSerializer(serializers.Serializer):
     """
     Serializer to validate parameter passed into GET /api/v1/resources
@@ -40,11 +74,78 @@ class ResourceModelSerializer(serializers.ModelSerializer):
         read_only=True, validators=[UniqueValidator(queryset=Resource.objects.all())]
     )
     type = serializers.CharField(read_only=True)
+    severities = serializers.ListField(read_only=True)
+    weight = serializers.IntegerField(read_only=True)
     created_at_utc = serializers.DateTimeField(read_only=True)
 
     class Meta:
         model = Resource
-        fields = ["url", "type", "created_at_utc"]
+        fields = ["url", "type", "severities", "weight", "created_at_utc"]
+
+
+class BulkCreateResourceRequestBodySerializer(BulkListSerializer):
+    """
+    Serializer to validate request body passed into POST /api/v1/resources/bulk:
+        1. Validate body is a non-empty list of resources
+        2. Validate every resource with a single child serializer,
+           collecting per-item errors instead of failing the whole list
+        3. Skip urls repeated in the list or already in db,
+           checking db with one query per chunk instead of one per resource
+    """
+
+    def get_chunk_size(self) -> int:
+        return self.context.get("chunk_size", settings.RESOURCE_IMPORT_CHUNK_SIZE)
+
+    def create(self, validated_data: list):
+        """
+        Create new resources chunk by chunk, inserting each chunk with one
+        bulk insert. Created resources are pending, their urls are verified
+        in the background like resources created one at a time.
+        Return status of every resource aligned with the list, None for invalid ones:
+            `pending`: created, waiting for its url to be verified
+            `duplicate`: url repeats an earlier resource of the list
+            `exists`: url already in db
+        """
+        statuses = [None] * len(validated_data)
+        first_index = {}
+
+        for index, resource in enumerate(validated_data):
+            if resource is None:
+                continue
+            if resource["url"] in first_index:
+                statuses[index] = "duplicate"
+            else:
+                first_index[resource["url"]] = index
+
+        urls = list(first_index)
+        chunk_size = self.get_chunk_size()
+
+        for start in range(0, len(urls), chunk_size):
+            chunk = urls[start : start + chunk_size]
+            existing = set(
+                Resource.objects.filter(url__in=chunk).values_list("url", flat=True)
+            )
+            new_urls = [url for url in chunk if url not in existing]
+            created = [
+                Resource(**validated_data[first_index[url]], status=Resource.PENDING)
+                for url in new_urls
+            ]
+
+            # resources created concurrently with the same url are skipped,
+            # ids are not returned by inserts ignoring conflicts
+            Resource.objects.bulk_create(created, ignore_conflicts=True)
+            if new_urls:
+                for id, url in Resource.objects.filter(
+                    url__in=new_urls, status=Resource.PENDING
+                ).values_list("id", "url"):
+                    verification_worker.enqueue_on_commit(id, url)
+
+            for url in existing:
+                statuses[first_index[url]] = "exists"
+            for url in new_urls:
+                statuses[first_index[url]] = Resource.PENDING
+
+        return statuses
 
 
 class CreateResourceRequestBodySerializer(serializers.ModelSerializer):
@@ -55,24 +156,31 @@ class CreateResourceRequestBodySerializer(serializers.ModelSerializer):
     id = serializers.IntegerField(read_only=True)
     type = serializers.CharField(required=True)
     url = serializers.URLField(required=True)
+    severities = serializers.ListField(
+        child=serializers.ChoiceField(
+            choices=[value for value, _, _, _ in SEVERITY_BANDS]
+        ),
+        allow_empty=False,
+        required=False,
+    )
+    weight = serializers.IntegerField(min_value=1, max_value=100, required=False)
+    status = serializers.CharField(read_only=True)
     created_at_utc = serializers.DateTimeField(read_only=True)
     updated_at_utc = serializers.DateTimeField(read_only=True)
 
     class Meta:
         model = Resource
-        fields = ["id", "type", "url", "created_at_utc", "updated_at_utc"]
-
-    def check_url_is_valid(self, url: str):
-        """
-        Check url is valid and a valid response is returned within 2.5s
-        """
-        try:
-            status_code = re.get(url=url, timeout=2.5).status_code
-            if status_code != 200:
-                return False, "url is invalid"
-        except Exception:
-            return False, "url is invalid"
-        return url, None
+        list_serializer_class = BulkCreateResourceRequestBodySerializer
+        fields = [
+            "id",
+            "type",
+            "url",
+            "severities",
+            "weight",
+            "status",
+            "created_at_utc",
+            "updated_at_utc",
+        ]
 
     def check_url_is_duplicate(self, urlToCheck: str):
         """
@@ -97,32 +205,41 @@ class CreateResourceRequestBodySerializer(serializers.ModelSerializer):
 
     def validate_url(self, data):
         """
-        Validate url is both valid and not a duplicate
+        Validate url is not a duplicate,
+        whether it is reachable is verified in the background.
+        Resources created in bulk are checked for duplicates by their list.
         """
         url = data
-        isUrlValid = self.check_url_is_valid(data)
-        isUrlDuplicate = self.check_url_is_duplicate(data)
 
-        if not isUrlValid:
-            raise serializers.ValidationError(
-                {"error": "You have provided an invalid url."}
-            )
-
-        if isUrlDuplicate:
+        if self.parent is None and self.check_url_is_duplicate(data):
             raise serializers.ValidationError(
                 {"error": "You have provided a duplicate url."}
             )
 
         return url
 
+    def validate_severities(self, data):
+        """
+        Drop duplicate severity bands while keeping their order
+        """
+        return list(dict.fromkeys(data))
+
     def create(self, validated_data):
         """
         Create record in db
         """
         url = validated_data["url"]
         type = validated_data["type"]
-
-        created_resource = Resource.objects.create(url=url, type=type)
+        optional_fields = {
+            field: validated_data[field]
+            for field in ["severities", "weight"]
+            if field in validated_data
+        }
+
+        created_resource = Resource.objects.create(
+            url=url, type=type, status=Resource.PENDING, **optional_fields
+        )
+        verification_worker.enqueue_on_commit(created_resource.id, url)
         return created_resource
 
 
@@ -181,6 +298,51 @@ class GetStudentParamSerializer(serializers.Serializer):
         return data
 
 
+class GetStudentStatisticsParamSerializer(GetStudentParamSerializer):
+    """
+    Serializer to validate query params of GET /api/v1/students/stats:
+        1. Validate age and gender params as in GetStudentParamSerializer
+        2. Validate createdgte <= createdlte
+    """
+
+    createdgte = serializers.DateTimeField(required=False)
+    createdlte = serializers.DateTimeField(required=False)
+
+    def validate(self, data):
+        data = super().validate(data)
+
+        if "createdgte" in data and "createdlte" in data:
+            if data["createdgte"] > data["createdlte"]:
+                raise serializers.ValidationError(
+                    {"createdgte": "Value must be earlier or equal to 'createdlte'"}
+                )
+
+        return data
+
+
+class GetStudentTrendsParamSerializer(serializers.Serializer):
+    """
+    Serializer to validate query params of GET /api/v1/students/stats/trends:
+        1. Validate granularity is in ['day', 'week', 'month']
+        2. Validate createdgte <= createdlte
+    """
+
+    granularity = serializers.ChoiceField(
+        choices=["day", "week", "month"], required=False, default="day"
+    )
+    createdgte = serializers.DateField(required=False)
+    createdlte = serializers.DateField(required=False)
+
+    def validate(self, data):
+        if "createdgte" in data and "createdlte" in data:
+            if data["createdgte"] > data["createdlte"]:
+                raise serializers.ValidationError(
+                    {"createdgte": "Value must be earlier or equal to 'createdlte'"}
+                )
+
+        return data
+
+
 class StudentModelSerializer(serializers.ModelSerializer):
     """
     Serializer for Student model
@@ -233,6 +395,55 @@ class GetStudentResponseModelSerializer(serializers.ModelSerializer):
         ]
 
 
+class BulkCreateStudentRequestBodySerializer(BulkListSerializer):
+    """
+    Serializer to validate request body passed into POST /api/v1/students/bulk:
+        1. Validate body is a non-empty list of submissions
+        2. Validate every submission with a single child serializer,
+           collecting per-item errors instead of failing the whole list
+    """
+
+    def create(self, validated_data: list):
+        """
+        Create students and responses of valid submissions with one
+        bulk insert per table in a single transaction.
+        Return created responses aligned with submissions, None for invalid ones.
+        """
+        studentResponses = []
+
+        for submission in validated_data:
+            if submission is None:
+                studentResponses.append(None)
+                continue
+
+            age = submission["student"]["age"]
+            gender = submission["student"]["gender"]
+            q_responses = [submission[question] for question in QUESTION_FIELDS]
+
+            studentResponses.append(
+                StudentResponse(
+                    **dict(zip(QUESTION_FIELDS, q_responses)),
+                    score=self.child.calculate_score(q_responses),
+                    student=Student(id=uuid4(), age=age, gender=gender),
+                    age=age,
+                    gender=gender,
+                )
+            )
+
+        created = [s for s in studentResponses if s is not None]
+
+        with transaction.atomic():
+            Student.objects.bulk_create([s.student for s in created])
+            StudentResponse.objects.bulk_create(created)
+
+            record_responses(
+                (s.score, s.gender, s.age, timezone.localdate(s.created_at_utc))
+                for s in created
+            )
+
+        return studentResponses
+
+
 class CreateStudentRequestBodySerializer(serializers.ModelSerializer):
     """
     Serializer to validate request body passed into POST /api/v1/students/create
@@ -254,6 +465,7 @@ class CreateStudentRequestBodySerializer(serializers.ModelSerializer):
 
     class Meta:
         model = StudentResponse
+        list_serializer_class = BulkCreateStudentRequestBodySerializer
         fields = [
             "q1_resp",
             "q2_resp",
@@ -393,23 +605,40 @@ class CreateStudentRequestBodySerializer(serializers.ModelSerializer):
         score = self.calculate_score(q_responses)
         student_id = uuid4()
 
-        # 1. create student
-        created_student = Student.objects.create(age=age, gender=gender, id=student_id)
-
-        # 2. create student response
-        created_studentResponse = StudentResponse.objects.create(
-            q1_resp=q1_resp,
-            q2_resp=q2_resp,
-            q3_resp=q3_resp,
-            q4_resp=q4_resp,
-            q5_resp=q5_resp,
-            q6_resp=q6_resp,
-            q7_resp=q7_resp,
-            q8_resp=q8_resp,
-            q9_resp=q9_resp,
-            score=score,
-            student=created_student,
-        )
+        with transaction.atomic():
+            # 1. create student
+            created_student = Student.objects.create(
+                age=age, gender=gender, id=student_id
+            )
+
+            # 2. create student response
+            created_studentResponse = StudentResponse.objects.create(
+                q1_resp=q1_resp,
+                q2_resp=q2_resp,
+                q3_resp=q3_resp,
+                q4_resp=q4_resp,
+                q5_resp=q5_resp,
+                q6_resp=q6_resp,
+                q7_resp=q7_resp,
+                q8_resp=q8_resp,
+                q9_resp=q9_resp,
+                score=score,
+                student=created_student,
+                age=age,
+                gender=gender,
+            )
+
+            # 3. update statistics rollups
+            record_responses(
+                [
+                    (
+                        score,
+                        gender,
+                        age,
+                        timezone.localdate(created_studentResponse.created_at_utc),
+                    )
+                ]
+            )
 
         return created_studentResponse
 
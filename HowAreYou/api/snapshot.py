@@ -0,0 +1,293 @@
+"""
+In-process columnar snapshot of responses for vectorized analytics
+"""
+
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone as dt_timezone
+from itertools import islice
+
+import numpy as np
+from django.db.models import Count, Q, Sum
+
+from .models import StudentResponse
+from .statistics import GENDER_MAPPING, QUESTION_FIELDS, SEVERITY_BANDS
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+GENDER_CODES = list(GENDER_MAPPING.keys())
+
+AGE_RANGE = range(12, 25)
+
+# lowest score of every severity band after the first, used by np.digitize
+SEVERITY_BINS = np.array([lowest for _, _, lowest, _ in SEVERITY_BANDS[1:]])
+
+SNAPSHOT_FIELDS = [
+    "id",
+    *QUESTION_FIELDS,
+    "score",
+    "age",
+    "gender",
+    "created_at_utc",
+]
+
+
+def to_epoch_us(value: datetime) -> int:
+    """
+    Convert aware datetime to microseconds since epoch
+    """
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+@dataclass(frozen=True)
+class SnapshotColumns:
+    """
+    Columns of `StudentResponse` joined with `Student`:
+        ids: int64
+        answers: int8 (n, 9)
+        scores: uint8
+        ages: uint8
+        genders: uint8 codes into GENDER_CODES
+        created: int64 microseconds since epoch
+    along with the sum of ids and the last (created_at_utc, id) loaded.
+
+    Columns are read-only and never modified, a refresh builds new columns.
+    """
+
+    ids: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+    answers: np.ndarray = field(
+        default_factory=lambda: np.empty((0, len(QUESTION_FIELDS)), dtype=np.int8)
+    )
+    scores: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.uint8))
+    ages: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.uint8))
+    genders: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.uint8))
+    created: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+    id_sum: int = 0
+    last_created_at: datetime | None = None
+    last_id: int | None = None
+
+    def __post_init__(self) -> None:
+        for column in [
+            self.ids,
+            self.answers,
+            self.scores,
+            self.ages,
+            self.genders,
+            self.created,
+        ]:
+            column.flags.writeable = False
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def cohort_mask(self, validated_data: dict) -> np.ndarray:
+        """
+        Return boolean mask of rows matching validated cohort params
+        """
+        mask = np.ones(len(self), dtype=bool)
+
+        if "agegte" in validated_data:
+            mask &= self.ages >= validated_data["agegte"]
+        if "agelte" in validated_data:
+            mask &= self.ages <= validated_data["agelte"]
+        if "gender" in validated_data:
+            mask &= self.genders == GENDER_CODES.index(validated_data["gender"])
+        if "createdgte" in validated_data:
+            mask &= self.created >= to_epoch_us(validated_data["createdgte"])
+        if "createdlte" in validated_data:
+            mask &= self.created <= to_epoch_us(validated_data["createdlte"])
+
+        return mask
+
+    def severities(self) -> np.ndarray:
+        """
+        Return severity band index of every row
+        """
+        return np.digitize(self.scores, SEVERITY_BINS)
+
+
+class ResponseSnapshot:
+    """
+    In-process columnar copy of responses, see `SnapshotColumns`.
+
+    Refreshes append rows created after the last (created_at_utc, id) seen,
+    and fall back to a full reload when rows were deleted.
+    Refreshed columns replace `columns` in a single assignment, so readers
+    get consistent columns by reading `columns` once, without the lock.
+    """
+
+    def __init__(self, chunk_size: int = 50_000):
+        self.chunk_size = chunk_size
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self) -> None:
+        self.columns = SnapshotColumns()
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def load_rows(self, studentResponses, columns: SnapshotColumns) -> SnapshotColumns:
+        """
+        Return `columns` with rows of `studentResponses` appended,
+        ordered by (created_at_utc, id) and converted one chunk at a time
+        """
+        rows = (
+            studentResponses.order_by("created_at_utc", "id")
+            .values_list(*SNAPSHOT_FIELDS)
+            .iterator(chunk_size=self.chunk_size)
+        )
+        gender_codes = {gender: code for code, gender in enumerate(GENDER_CODES)}
+        ids, answers, scores, ages, genders, created = [], [], [], [], [], []
+        last = None
+
+        while chunk := list(islice(rows, self.chunk_size)):
+            columns_of_chunk = list(zip(*chunk))
+            ids.append(np.array(columns_of_chunk[0], dtype=np.int64))
+            answers.append(np.array(columns_of_chunk[1:10], dtype=np.int8).T)
+            scores.append(np.array(columns_of_chunk[10], dtype=np.uint8))
+            ages.append(np.array(columns_of_chunk[11], dtype=np.uint8))
+            genders.append(
+                np.array(
+                    [gender_codes[g] for g in columns_of_chunk[12]], dtype=np.uint8
+                )
+            )
+            created.append(
+                np.array([to_epoch_us(c) for c in columns_of_chunk[13]], dtype=np.int64)
+            )
+            last = chunk[-1]
+
+        if last is None:
+            return columns
+
+        return SnapshotColumns(
+            ids=np.concatenate([columns.ids, *ids]),
+            answers=np.concatenate([columns.answers, *answers]),
+            scores=np.concatenate([columns.scores, *scores]),
+            ages=np.concatenate([columns.ages, *ages]),
+            genders=np.concatenate([columns.genders, *genders]),
+            created=np.concatenate([columns.created, *created]),
+            id_sum=columns.id_sum + sum(int(i.sum()) for i in ids),
+            last_created_at=last[-1],
+            last_id=last[0],
+        )
+
+    def refresh(self) -> int:
+        """
+        Bring the snapshot up to date and return number of rows appended
+        """
+        with self.lock:
+            columns = self.columns
+            studentResponses = StudentResponse.objects.all()
+
+            if columns.last_created_at is not None:
+                studentResponses = studentResponses.filter(
+                    Q(created_at_utc__gt=columns.last_created_at)
+                    | Q(
+                        created_at_utc=columns.last_created_at,
+                        id__gt=columns.last_id,
+                    )
+                )
+
+            refreshed = self.load_rows(studentResponses, columns)
+            appended = len(refreshed) - len(columns)
+
+            # ids are never reused, so (count, sum of ids) changes whenever
+            # rows were deleted or inserted behind the last seen position
+            expected = StudentResponse.objects.aggregate(
+                count=Count("id"), id_sum=Sum("id")
+            )
+            if expected["count"] != len(refreshed) or (expected["id_sum"] or 0) != (
+                refreshed.id_sum
+            ):
+                refreshed = self.load_rows(
+                    StudentResponse.objects.all(), SnapshotColumns()
+                )
+                appended = len(refreshed)
+
+            self.columns = refreshed
+
+            return appended
+
+
+def item_correlations(answers: np.ndarray) -> list[list]:
+    """
+    Pearson correlation matrix between the 9 questions,
+    None where a question has no variance
+    """
+    if len(answers) < 2:
+        return [[None] * answers.shape[1] for _ in range(answers.shape[1])]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        correlations = np.corrcoef(answers.astype(np.float64), rowvar=False)
+
+    return [
+        [None if np.isnan(c) else round(float(c), 4) for c in row]
+        for row in correlations
+    ]
+
+
+def score_percentiles(scores: np.ndarray, percentiles: list[int]) -> dict:
+    """
+    Return score at each percentile
+    """
+    if len(scores) == 0:
+        return {str(p): None for p in percentiles}
+
+    values = np.percentile(scores, percentiles)
+    return {str(p): float(v) for p, v in zip(percentiles, values)}
+
+
+def crosstab(ages: np.ndarray, genders: np.ndarray, severities: np.ndarray) -> list:
+    """
+    Count rows per (age, gender, severity) with a single bincount
+    """
+    n_ages, n_genders, n_severities = (
+        len(AGE_RANGE),
+        len(GENDER_CODES),
+        len(SEVERITY_BANDS),
+    )
+    flat_index = (
+        (ages.astype(np.int64) - AGE_RANGE.start) * n_genders + genders
+    ) * n_severities + severities
+    counts = np.bincount(
+        flat_index, minlength=n_ages * n_genders * n_severities
+    ).reshape(n_ages, n_genders, n_severities)
+
+    output = []
+    for age_index, gender_index, severity_index in zip(*np.nonzero(counts)):
+        output.append(
+            {
+                "age": AGE_RANGE.start + int(age_index),
+                "gender": GENDER_MAPPING[GENDER_CODES[gender_index]],
+                "severity": SEVERITY_BANDS[severity_index][1],
+                "count": int(counts[age_index, gender_index, severity_index]),
+            }
+        )
+
+    return output
+
+
+def compute_analytics(
+    snapshot: ResponseSnapshot, validated_data: dict, percentiles: list[int]
+) -> dict:
+    """
+    Compute item correlations, score percentiles and age x gender x severity
+    cross-tabulation of a cohort from the snapshot
+    """
+    # read once, a concurrent refresh replaces columns as a whole
+    columns = snapshot.columns
+    mask = columns.cohort_mask(validated_data)
+
+    return {
+        "category": "analytics",
+        "total": int(mask.sum()),
+        "item_correlations": item_correlations(columns.answers[mask]),
+        "score_percentiles": score_percentiles(columns.scores[mask], percentiles),
+        "crosstab": crosstab(
+            columns.ages[mask], columns.genders[mask], columns.severities()[mask]
+        ),
+    }
+
+
+response_snapshot = ResponseSnapshot()
@@ -0,0 +1,207 @@
+"""
+Database-side aggregation of depression statistics
+"""
+
+from django.db.models import Case, Count, F, Q, Sum, Value, When, CharField
+from django.db.models.functions import TruncMonth, TruncWeek
+
+# PHQ-9 depression severity bands: (value, label, lowest score, highest score)
+SEVERITY_BANDS = [
+    ("none_minimal", "None - Minimal", 0, 4),
+    ("mild", "Mild", 5, 9),
+    ("moderate", "Moderate", 10, 14),
+    ("moderately_severe", "Moderately Severe", 15, 19),
+    ("severe", "Severe", 20, 27),
+]
+
+SEVERITY_LABELS = {value: label for value, label, _, _ in SEVERITY_BANDS}
+
+GENDER_MAPPING = {"m": "Male", "f": "Female", "o": "Others"}
+
+QUESTION_FIELDS = [f"q{i}_resp" for i in range(1, 10)]
+
+ANSWER_VALUES = [0, 1, 2, 3]
+
+# trend granularity: expression rolling daily buckets up into periods
+TREND_GRANULARITIES = {
+    "day": lambda: F("date"),
+    "week": lambda: TruncWeek("date"),
+    "month": lambda: TruncMonth("date"),
+}
+
+
+def severity_band(score: int) -> str:
+    """
+    Return severity band value of a PHQ-9 score
+    """
+    for value, _, lowest, highest in SEVERITY_BANDS:
+        if lowest <= score <= highest:
+            return value
+
+    raise ValueError(f"score ({score}) is not a valid PHQ-9 score")
+
+
+def severity_band_expression(field: str = "score") -> Case:
+    """
+    Return `Case/When` expression bucketing `field` into severity band values
+    """
+    return Case(
+        *[
+            When(
+                **{f"{field}__gte": lowest, f"{field}__lte": highest}, then=Value(value)
+            )
+            for value, _, lowest, highest in SEVERITY_BANDS
+        ],
+        output_field=CharField(),
+    )
+
+
+def cohort_filters(
+    validated_data: dict,
+    age_field: str = "age",
+    gender_field: str = "gender",
+    created_field: str = "created_at_utc",
+) -> dict:
+    """
+    Translate validated cohort params into queryset filter kwargs
+    """
+    lookups = {
+        "agegte": f"{age_field}__gte",
+        "agelte": f"{age_field}__lte",
+        "gender": gender_field,
+        "createdgte": f"{created_field}__gte",
+        "createdlte": f"{created_field}__lte",
+    }
+
+    return {
+        lookups[param]: value
+        for param, value in validated_data.items()
+        if param in lookups
+    }
+
+
+def statistics_rows(studentResponses):
+    """
+    Return grouped query counting responses per (severity, gender)
+    """
+    return (
+        studentResponses.order_by()
+        .annotate(severity=severity_band_expression())
+        .values("severity", "gender")
+        .annotate(count=Count("id"))
+        .values_list("severity", "gender", "count")
+    )
+
+
+def aggregate_statistics(studentResponses) -> list[tuple]:
+    """
+    Count responses per (severity, gender) in a single grouped query
+    """
+    return list(statistics_rows(studentResponses))
+
+
+def format_statistics(rows) -> dict:
+    """
+    Format (severity, gender, count) rows into the statistics payload
+    """
+    categories = {label: {} for _, label, _, _ in SEVERITY_BANDS}
+
+    for severity, gender, count in rows:
+        if not count:
+            continue
+        category = categories[SEVERITY_LABELS[severity]]
+        category[GENDER_MAPPING[gender]] = (
+            category.get(GENDER_MAPPING[gender], 0) + count
+        )
+
+    return {"category": "depression", "statistics": [categories]}
+
+
+def aggregate_trends(dailyStatistics, granularity: str) -> list[dict]:
+    """
+    Roll daily statistics buckets up into `granularity` periods in a single
+    grouped query, and return counts and mean score per period
+    """
+    rows = (
+        dailyStatistics.order_by()
+        .annotate(period=TREND_GRANULARITIES[granularity]())
+        .values("period", "severity")
+        .annotate(count=Sum("count"), score_sum=Sum("score_sum"))
+        .order_by("period")
+        .values_list("period", "severity", "count", "score_sum")
+    )
+
+    trends = {}
+    for period, severity, count, score_sum in rows:
+        if period not in trends:
+            trends[period] = {
+                "period": period.isoformat(),
+                "count": 0,
+                "score_sum": 0,
+                "statistics": {label: 0 for _, label, _, _ in SEVERITY_BANDS},
+            }
+
+        trend = trends[period]
+        trend["count"] += count
+        trend["score_sum"] += score_sum
+        trend["statistics"][SEVERITY_LABELS[severity]] += count
+
+    output = []
+    for trend in trends.values():
+        if not trend["count"]:
+            continue
+        score_sum = trend.pop("score_sum")
+        trend["mean_score"] = round(score_sum / trend["count"], 2)
+        output.append(trend)
+
+    return output
+
+
+def aggregate_item_statistics(studentResponses) -> dict:
+    """
+    Count answers per question and value in a single query, and derive
+    per-question mean and (population) variance from the answer frequencies
+    """
+    aggregates = studentResponses.order_by().aggregate(
+        total=Count("id"),
+        **{
+            f"{question}_{value}": Count("id", filter=Q(**{question: value}))
+            for question in QUESTION_FIELDS
+            for value in ANSWER_VALUES
+        },
+    )
+
+    total = aggregates["total"]
+    items = []
+
+    for question in QUESTION_FIELDS:
+        frequencies = [aggregates[f"{question}_{value}"] for value in ANSWER_VALUES]
+
+        if total:
+            mean = sum(v * c for v, c in zip(ANSWER_VALUES, frequencies)) / total
+            variance = max(
+                sum(v * v * c for v, c in zip(ANSWER_VALUES, frequencies)) / total
+                - mean**2,
+                0.0,
+            )
+        else:
+            mean, variance = None, None
+
+        items.append(
+            {
+                "question": question,
+                "frequencies": frequencies,
+                "mean": None if mean is None else round(mean, 4),
+                "variance": None if variance is None else round(variance, 4),
+            }
+        )
+
+    q9_positive = total - aggregates["q9_resp_0"]
+
+    return {
+        "category": "items",
+        "total": total,
+        "answer_values": ANSWER_VALUES,
+        "items": items,
+        "q9_positive_share": round(q9_positive / total, 4) if total else None,
+    }
@@ -5,6 +5,8 @@ Test Resources endpoint
 from rest_framework.test import APITestCase
 from ...models import Resource
 from ...scripts.seed_db_script import seed_resources_db
+from ...verification import verify_pending_resources
+from ..stub_server import StubServer
 
 
 class ResourceAPITests(APITestCase):
@@ -16,9 +18,12 @@ class ResourceAPITests(APITestCase):
 
     def setUp(self) -> None:
         seed_resources_db()
+        # local server standing in for reachable and unreachable urls
+        self.server = StubServer().__enter__()
 
     def tearDown(self) -> None:
         Resource.objects.all().delete()
+        self.server.__exit__()
 
     def test_get_resources_no_params_should_return_all_output(self):
         """
@@ -73,7 +78,7 @@ class ResourceAPITests(APITestCase):
             valid request body should create resources successfully and
             return 201 status code
         """
-        valid_request_body = {"type": "article", "url": "https://www.mindline.sg"}
+        valid_request_body = {"type": "article", "url": self.server.url("/ok/mindline")}
         created_resource_status_code = self.client.post(
             self.BASE_URL + "/create", data=valid_request_body
         ).status_code
@@ -127,6 +132,32 @@ class ResourceAPITests(APITestCase):
 
         self.assertNotIn(200, resp_status_codes)
 
+    def test_created_resources_should_be_served_once_verified(self):
+        """
+        Test POST api/v1/resources
+            resource should be created pending without requesting its url,
+            and only be listed once its url is verified in the background
+        """
+        urls = [self.server.url("/ok/1"), self.server.url("/missing/1")]
+
+        for url in urls:
+            response = self.client.post(
+                self.BASE_URL + "/create", data={"url": url, "type": "article"}
+            )
+            self.assertEqual(response.status_code, 201)
+            self.assertEqual(response.data["status"], "pending")
+
+        self.assertEqual(self.server.requests, [])
+        listed_urls = [r["url"] for r in self.client.get(self.BASE_URL).data]
+        self.assertNotIn(urls[0], listed_urls)
+
+        verify_pending_resources(batch_size=10)
+
+        listed_urls = [r["url"] for r in self.client.get(self.BASE_URL).data]
+        self.assertIn(urls[0], listed_urls)
+        self.assertNotIn(urls[1], listed_urls)
+        self.assertEqual(Resource.objects.get(url=urls[1]).status, "broken")
+
     def test_create_resources_with_duplicate_url_value_should_return_400_bad_request(
         self,
     ):
@@ -165,3 +196,174 @@ class ResourceAPITests(APITestCase):
             resp_status_codes.append(resp_status_code)
 
         self.assertNotIn(200, resp_status_codes)
+
+    def test_create_resources_with_severities_and_weight_should_store_them(self):
+        """
+        Test POST api/v1/resources
+            optional 'severities' and 'weight' fields should be stored
+        """
+        response = self.client.post(
+            self.BASE_URL + "/create",
+            data={
+                "type": "video",
+                "url": self.server.url("/ok/severe"),
+                "severities": ["severe", "moderately_severe", "severe"],
+                "weight": 5,
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        resource = Resource.objects.get(url=self.server.url("/ok/severe"))
+        self.assertEqual(resource.severities, ["severe", "moderately_severe"])
+        self.assertEqual(resource.weight, 5)
+
+    def test_create_resources_with_invalid_severities_or_weight_should_return_400(
+        self,
+    ):
+        """
+        Test POST api/v1/resources
+            unknown severity band, empty severities or weight < 1
+            should return 400 status code
+        """
+        invalid_requests = [
+            {"severities": ["critical"]},
+            {"severities": []},
+            {"weight": 0},
+        ]
+
+        resp_status_codes = []
+
+        for invalid_request in invalid_requests:
+            resp_status_code: int = self.client.post(
+                self.BASE_URL + "/create",
+                data={
+                    "type": "article",
+                    "url": self.server.url("/ok/invalid"),
+                    **invalid_request,
+                },
+                format="json",
+            ).status_code
+            resp_status_codes.append(resp_status_code)
+
+        self.assertEqual(resp_status_codes, [400, 400, 400])
+
+    def test_bulk_create_resources_should_skip_duplicate_and_existing_urls(self):
+        """
+        Test POST api/v1/resources/bulk
+            new resources should be created pending without requesting their
+            urls, repeated, existing and invalid resources reported per resource
+        """
+        existing_url = Resource.objects.first().url
+        body = [
+            {"type": "article", "url": self.server.url("/ok/1"), "weight": 5},
+            {"type": "video", "url": self.server.url("/missing/1")},
+            {"type": "video", "url": self.server.url("/ok/1")},
+            {"type": "video", "url": existing_url},
+            {"type": "podcast", "url": self.server.url("/ok/2")},
+        ]
+
+        response = self.client.post(self.BASE_URL + "/bulk", data=body, format="json")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            (response.data["created"], response.data["skipped"]),
+            (2, 2),
+        )
+        self.assertEqual(
+            [result.get("status") for result in response.data["results"]],
+            ["pending", "pending", "duplicate", "exists", None],
+        )
+        self.assertIn("type", response.data["results"][4]["errors"])
+        self.assertEqual(self.server.requests, [])
+
+        verify_pending_resources(batch_size=10)
+
+        resource = Resource.objects.get(url=self.server.url("/ok/1"))
+        self.assertEqual(
+            (resource.type, resource.weight, resource.status),
+            ("article", 5, Resource.VERIFIED),
+        )
+        self.assertEqual(
+            Resource.objects.get(url=self.server.url("/missing/1")).status,
+            Resource.BROKEN,
+        )
+
+        # re-submitting creates nothing
+        response = self.client.post(self.BASE_URL + "/bulk", data=body, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["created"], 0)
+
+    def test_bulk_create_resources_should_check_urls_once_per_chunk(self):
+        """
+        Test POST api/v1/resources/bulk
+            existing urls should be checked with one query per chunk,
+            new resources inserted with one bulk insert per chunk
+            and queued for verification once committed
+        """
+        from unittest import mock
+        from ...verification import verification_worker
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        body = [
+            {"type": "article", "url": self.server.url(f"/ok/{i}")} for i in range(10)
+        ]
+
+        with self.settings(RESOURCE_IMPORT_CHUNK_SIZE=4), CaptureQueriesContext(
+            connection
+        ) as queries, mock.patch.object(verification_worker, "enqueue") as enqueue:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(
+                    self.BASE_URL + "/bulk", data=body, format="json"
+                )
+
+        self.assertEqual(response.data["created"], 10)
+        statements = [query["sql"].split()[0] for query in queries]
+        # existing urls, then ids of created resources
+        self.assertEqual(statements.count("SELECT"), 6)
+        self.assertEqual(statements.count("INSERT"), 3)
+        self.assertEqual(
+            sorted(url for _, url in (call.args for call in enqueue.call_args_list)),
+            sorted(resource["url"] for resource in body),
+        )
+
+    def test_bulk_create_resources_should_accept_csv(self):
+        """
+        Test POST api/v1/resources/bulk
+            csv body with severities separated by '|' should create resources
+        """
+        body = (
+            "url,type,severities,weight\n"
+            f"{self.server.url('/ok/csv-1')},video,severe|moderately_severe,3\n"
+            f"{self.server.url('/ok/csv-2')},article,,\n"
+        )
+
+        response = self.client.post(
+            self.BASE_URL + "/bulk", data=body, content_type="text/csv"
+        )
+
+        self.assertEqual(response.status_code, 201)
+        resource = Resource.objects.get(url=self.server.url("/ok/csv-1"))
+        self.assertEqual(resource.severities, ["severe", "moderately_severe"])
+        self.assertEqual(resource.weight, 3)
+        self.assertEqual(
+            Resource.objects.get(url=self.server.url("/ok/csv-2")).weight, 1
+        )
+
+    def test_bulk_create_resources_with_invalid_body_should_return_400(self):
+        """
+        Test POST api/v1/resources/bulk
+            empty list, non-list body and list of invalid resources
+            should return 400 status code
+        """
+        invalid_bodies = [[], {"type": "video"}, [{"type": "video", "url": "x"}]]
+
+        resp_status_codes = [
+            self.client.post(
+                self.BASE_URL + "/bulk", data=body, format="json"
+            ).status_code
+            for body in invalid_bodies
+        ]
+
+        self.assertEqual(resp_status_codes, [400, 400, 400])
@@ -0,0 +1,54 @@
+"""
+Test async Resources endpoint
+"""
+
+from rest_framework.test import APITestCase
+from ...models import Resource
+from ...scripts.seed_db_script import seed_resources_db
+
+
+class AsyncResourceAPITests(APITestCase):
+    """
+    Test for async Resources API endpoints
+    """
+
+    BASE_URL = "http://127.0.0.1:8000/api/v1"
+
+    def setUp(self) -> None:
+        seed_resources_db()
+
+    def tearDown(self) -> None:
+        Resource.objects.all().delete()
+
+    async def test_async_get_resources_should_match_sync_output(self):
+        """
+        Test GET /api/v1/async/resources
+            output should be the same as GET /api/v1/resources
+        """
+        for params in ["", "?type=video", "?type=article"]:
+            sync_response = await self.async_client.get(
+                f"{self.BASE_URL}/resources{params}"
+            )
+            async_response = await self.async_client.get(
+                f"{self.BASE_URL}/async/resources{params}"
+            )
+
+            self.assertEqual(async_response.status_code, 200)
+            self.assertEqual(async_response.json(), sync_response.json())
+
+    async def test_async_get_resources_invalid_params_should_return_400(self):
+        """
+        Test GET /api/v1/async/resources
+            invalid parameter or value should return 400
+        """
+        invalid_params = ["?typ=video", "?type=video&type=article", "?type=vid"]
+
+        resp_status_codes = []
+
+        for params in invalid_params:
+            response = await self.async_client.get(
+                f"{self.BASE_URL}/async/resources{params}"
+            )
+            resp_status_codes.append(response.status_code)
+
+        self.assertEqual(resp_status_codes, [400, 400, 400])
@@ -0,0 +1,64 @@
+"""
+Test severity-aware resource recommendations
+"""
+
+from collections import Counter
+from random import Random
+from django.test import SimpleTestCase
+from ...recommendations import AliasTable, RecommendationIndex
+
+
+class RecommendationTests(SimpleTestCase):
+    """
+    Test for alias tables and recommendation index
+    """
+
+    def test_alias_table_should_draw_proportionally_to_weights(self):
+        """
+        Test alias table draws every index in proportion to its weight
+        """
+        weights = [1, 2, 3, 4]
+        table = AliasTable(weights)
+        rng = Random(0)
+
+        draws = Counter(table.draw(rng) for _ in range(100_000))
+
+        for index, weight in enumerate(weights):
+            self.assertAlmostEqual(draws[index] / 100_000, weight / 10, delta=0.01)
+
+    def test_recommend_should_return_distinct_resources_of_band(self):
+        """
+        Test recommendations are distinct and targeted at the severity band
+        """
+        resources = tuple(
+            (f"https://www.example.com/{i}", "article", [band], 1)
+            for i, band in enumerate(["mild", "severe"] * 5)
+        )
+        index = RecommendationIndex(resources, rng=Random(0))
+
+        for _ in range(100):
+            recommended = index.recommend("severe", 3)
+            urls = {r["url"] for r in recommended}
+
+            self.assertEqual(len(urls), 3)
+            self.assertTrue(all(int(url.rsplit("/", 1)[1]) % 2 for url in urls))
+
+    def test_recommend_should_top_up_from_other_bands(self):
+        """
+        Test bands with fewer than k candidates are topped up with other resources,
+        and fewer than k resources are returned only when there are fewer resources
+        """
+        resources = (
+            ("https://www.example.com/0", "video", ["severe"], 1),
+            ("https://www.example.com/1", "video", ["mild"], 1),
+            ("https://www.example.com/2", "video", ["mild"], 1),
+            ("https://www.example.com/3", "video", ["mild"], 1),
+        )
+        index = RecommendationIndex(resources, rng=Random(0))
+
+        recommended = [r["url"] for r in index.recommend("severe", 3)]
+        self.assertEqual(recommended[0], "https://www.example.com/0")
+        self.assertEqual(len(set(recommended)), 3)
+
+        self.assertEqual(len(index.recommend("moderate", 10)), 4)
+        self.assertEqual(RecommendationIndex(()).recommend("severe", 3), [])
@@ -0,0 +1,78 @@
+"""
+Test resources pool used for recommendations
+"""
+
+from unittest import mock
+from django.test import TestCase
+from ...models import Resource
+from ...resource_pool import ResourcePool, resource_pool
+from ...serializers import CreateResourceRequestBodySerializer
+from ...views import CreateStudentView
+from ...scripts.seed_db_script import seed_resources_db
+from ...url_checker import url_checker
+from ...verification import verify_resources
+
+
+class ResourcePoolTests(TestCase):
+    """
+    Test for in-process resources pool
+    """
+
+    def setUp(self) -> None:
+        seed_resources_db()
+
+    def test_sample_from_loaded_pool_should_not_query_db(self):
+        """
+        Test sampling resources once the pool is loaded issues no query
+        Pass criteria: get_message returns 3 distinct resources without querying db
+        """
+        resource_pool.get()
+
+        with self.assertNumQueries(0):
+            message = CreateStudentView().get_message(12)
+
+        self.assertEqual(len(message["resources"]), 3)
+        self.assertEqual(len({r["url"] for r in message["resources"]}), 3)
+        for resource in message["resources"]:
+            self.assertTrue(Resource.objects.filter(**resource).exists())
+
+    def test_verified_resource_should_invalidate_pool(self):
+        """
+        Test created resource is only recommended once verified,
+        and verifying it reloads the pool
+        """
+        resource_pool.get()
+
+        serializer = CreateResourceRequestBodySerializer()
+        created = serializer.create(
+            {"url": "https://www.example.com/new", "type": "video"}
+        )
+        self.assertNotIn(
+            "https://www.example.com/new",
+            [url for url, _, _, _ in resource_pool.get().resources],
+        )
+
+        with mock.patch.object(url_checker, "fetch", return_value=True):
+            verify_resources([(created.id, created.url)])
+
+        self.assertIn(
+            "https://www.example.com/new",
+            [url for url, _, _, _ in resource_pool.get().resources],
+        )
+
+    def test_expired_pool_should_reload(self):
+        """
+        Test pool is reloaded once its ttl expired
+        """
+        pool = ResourcePool(ttl=60)
+
+        with mock.patch("time.monotonic", return_value=1000.0):
+            pool.get()
+        Resource.objects.create(
+            url="https://www.example.com/ttl", type="article", status="verified"
+        )
+
+        with mock.patch("time.monotonic", return_value=1030.0):
+            self.assertEqual(len(pool.get()), Resource.objects.count() - 1)
+        with mock.patch("time.monotonic", return_value=1061.0):
+            self.assertEqual(len(pool.get()), Resource.objects.count())
@@ -0,0 +1,178 @@
+"""
+Test url checker used to validate resource urls
+"""
+
+import time
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase
+from ...url_checker import UrlChecker, normalize_url
+from ..stub_server import StubServer
+
+
+class UrlCheckerTests(SimpleTestCase):
+    """
+    Test for url checker against a local stub server
+    """
+
+    def setUp(self) -> None:
+        self.server = StubServer().__enter__()
+        self.checker = UrlChecker(timeout=1, max_workers=8)
+
+    def tearDown(self) -> None:
+        self.server.__exit__()
+
+    def test_check_should_send_head_only(self):
+        """
+        Test reachable url is checked with a single HEAD request,
+        and redirects are followed
+        """
+        self.assertTrue(self.checker.check(self.server.url("/ok/1")))
+        self.assertTrue(self.checker.check(self.server.url("/redirect/2")))
+        self.assertFalse(self.checker.check(self.server.url("/missing/3")))
+
+        self.assertEqual(
+            self.server.requests,
+            [
+                ("HEAD", "/ok/1"),
+                ("HEAD", "/redirect/2"),
+                ("HEAD", "/ok/2"),
+                ("HEAD", "/missing/3"),
+            ],
+        )
+
+    def test_check_should_fall_back_to_get_when_head_not_supported(self):
+        """
+        Test url rejecting HEAD is checked with a GET
+        """
+        self.assertTrue(self.checker.check(self.server.url("/no-head/1")))
+        self.assertEqual(
+            self.server.requests, [("HEAD", "/no-head/1"), ("GET", "/no-head/1")]
+        )
+
+    def test_check_should_reuse_connections(self):
+        """
+        Test sequential checks on a host share one pooled connection
+        """
+        for i in range(5):
+            self.assertTrue(self.checker.check(self.server.url(f"/ok/{i}")))
+
+        self.assertEqual(self.server.connections, 1)
+
+    def test_check_should_fail_once_timeout_budget_is_spent(self):
+        """
+        Test url slower than the timeout budget is invalid,
+        and unreachable url is invalid
+        """
+        checker = UrlChecker(timeout=0.2, max_workers=1)
+
+        start = time.monotonic()
+        self.assertFalse(checker.check(self.server.url("/slow/1/1")))
+        self.assertLess(time.monotonic() - start, 1)
+
+        self.assertFalse(checker.check("http://127.0.0.1:1/ok"))
+
+    def test_check_many_should_check_concurrently(self):
+        """
+        Test urls are checked concurrently and duplicates checked once
+        """
+        urls = [self.server.url(f"/slow/0.3/{i}") for i in range(8)]
+
+        start = time.monotonic()
+        results = self.checker.check_many(urls + urls[:2])
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(results, {url: True for url in urls})
+        self.assertEqual(len(self.server.requests), 8)
+        self.assertLess(elapsed, 8 * 0.3 / 2)
+
+
+class CachedUrlCheckerTests(SimpleTestCase):
+    """
+    Test for url checker caching results by normalized url
+    """
+
+    def setUp(self) -> None:
+        self.server = StubServer().__enter__()
+        self.cache = LocMemCache(
+            "test-url-checks", {"OPTIONS": {"MAX_ENTRIES": 2, "CULL_FREQUENCY": 2}}
+        )
+        self.cache.clear()
+        self.checker = UrlChecker(
+            timeout=1, max_workers=8, cache=self.cache, ttl=60, negative_ttl=0.2
+        )
+
+    def tearDown(self) -> None:
+        self.cache.clear()
+        self.server.__exit__()
+
+    def test_normalize_url(self):
+        """
+        Test equivalent urls normalize to the same url
+        """
+        self.assertEqual(
+            normalize_url(" HTTPS://User:pw@WWW.Example.com:443/a?b=C#top "),
+            "https://User:pw@www.example.com/a?b=C",
+        )
+        self.assertEqual(
+            normalize_url("http://Example.com:8080"), "http://example.com:8080/"
+        )
+
+    def test_check_many_should_mark_unparseable_url_invalid(self):
+        """
+        Test url with a port out of range is invalid,
+        without failing checks of other urls
+        """
+        unparseable, valid = "http://example.com:99999/x", self.server.url("/ok/1")
+
+        self.assertEqual(normalize_url(unparseable), unparseable)
+        self.assertEqual(
+            self.checker.check_many([unparseable, valid]),
+            {unparseable: False, valid: True},
+        )
+        self.assertEqual(self.server.requests, [("HEAD", "/ok/1")])
+
+    def test_check_should_answer_repeated_urls_from_cache(self):
+        """
+        Test url and its equivalent urls are fetched once
+        """
+        url = self.server.url("/ok/1")
+        equivalent = url.replace("http://", "HTTP://") + "#top"
+
+        self.assertTrue(self.checker.check(url))
+        self.assertTrue(self.checker.check(url))
+        self.assertEqual(self.checker.check_many([equivalent]), {equivalent: True})
+
+        self.assertEqual(self.server.requests, [("HEAD", "/ok/1")])
+
+    def test_check_should_expire_invalid_urls_sooner(self):
+        """
+        Test invalid url is re-fetched once its short ttl expired,
+        while valid url is still cached
+        """
+        valid, invalid = self.server.url("/ok/1"), self.server.url("/missing/1")
+        self.checker.check_many([valid, invalid])
+
+        time.sleep(0.3)
+        self.assertEqual(
+            self.checker.check_many([valid, invalid]), {valid: True, invalid: False}
+        )
+        self.assertEqual(
+            sorted(self.server.requests),
+            [("HEAD", "/missing/1"), ("HEAD", "/missing/1"), ("HEAD", "/ok/1")],
+        )
+
+    def test_check_should_evict_least_recently_used_url(self):
+        """
+        Test least recently used url is evicted once the cache is full
+        """
+        a, b, c = (self.server.url(f"/ok/{name}") for name in "abc")
+        self.checker.check(a)
+        self.checker.check(b)
+        self.checker.check(a)
+        self.checker.check(c)
+
+        self.server.requests.clear()
+        self.checker.check(a)
+        self.checker.check(b)
+
+        self.assertEqual(self.server.requests, [("HEAD", "/ok/b")])
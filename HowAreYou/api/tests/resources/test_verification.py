@@ -0,0 +1,72 @@
+"""
+Test background verification of resource urls
+"""
+
+from unittest import mock
+from django.test import SimpleTestCase, TestCase
+from ...models import Resource
+from ...serializers import CreateResourceRequestBodySerializer
+from ...verification import (
+    VerificationWorker,
+    verification_worker,
+    verify_pending_resources,
+)
+from ..stub_server import StubServer
+
+
+class VerificationWorkerTests(SimpleTestCase):
+    """
+    Test for batching of queued resources
+    """
+
+    def test_next_batch_should_collect_up_to_batch_size(self):
+        """
+        Test queued resources are collected in batches of up to `batch_size`
+        """
+        worker = VerificationWorker(batch_size=3, linger=0.01)
+        for i in range(5):
+            worker.queue.put((i, f"https://www.example.com/{i}"))
+
+        self.assertEqual([id for id, _ in worker.next_batch()], [0, 1, 2])
+        self.assertEqual([id for id, _ in worker.next_batch()], [3, 4])
+
+
+class VerificationQueueTests(TestCase):
+    """
+    Test for queueing created resources
+    """
+
+    def test_created_resource_should_be_queued_on_commit(self):
+        """
+        Test creating a resource queues it for verification once committed
+        """
+        serializer = CreateResourceRequestBodySerializer()
+
+        with mock.patch.object(verification_worker, "enqueue") as enqueue:
+            with self.captureOnCommitCallbacks(execute=True):
+                created = serializer.create(
+                    {"url": "https://www.example.com/queued", "type": "video"}
+                )
+                enqueue.assert_not_called()
+
+        enqueue.assert_called_once_with(created.id, "https://www.example.com/queued")
+        self.assertEqual(created.status, "pending")
+
+    def test_verify_pending_resources_should_mark_unparseable_url_broken(self):
+        """
+        Test a resource whose url cannot be parsed is broken,
+        and resources after it in the same batch are still verified
+        """
+        with StubServer() as server:
+            unparseable = Resource.objects.create(
+                url="http://example.com:99999/x", type="video"
+            )
+            reachable = Resource.objects.create(url=server.url("/ok/1"), type="video")
+
+            totals = verify_pending_resources(batch_size=10)
+
+        unparseable.refresh_from_db()
+        reachable.refresh_from_db()
+        self.assertEqual(totals, {"verified": 1, "broken": 1})
+        self.assertEqual(unparseable.status, Resource.BROKEN)
+        self.assertEqual(reachable.status, Resource.VERIFIED)
@@ -0,0 +1,82 @@
+"""
+Local stub HTTP server standing in for resource urls in tests
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """
+    Respond by path:
+        /ok/...: 200
+        /missing/...: 404
+        /no-head/...: 405 to HEAD, 200 with a large body to GET
+        /redirect/...: 301 to /ok/...
+        /slow/<seconds>/...: 200 after sleeping `seconds`
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def respond(self, status: int, body: bytes = b"", headers: dict | None = None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def handle_request(self):
+        self.server.requests.append((self.command, self.path))
+        _, kind, *rest = self.path.split("/")
+
+        if kind == "ok":
+            self.respond(200)
+        elif kind == "no-head":
+            if self.command == "HEAD":
+                self.respond(405)
+            else:
+                self.respond(200, b"x" * 1_000_000)
+        elif kind == "redirect":
+            self.respond(301, headers={"Location": "/ok/" + "/".join(rest)})
+        elif kind == "slow":
+            time.sleep(float(rest[0]))
+            self.respond(200)
+        else:
+            self.respond(404)
+
+    do_HEAD = handle_request
+    do_GET = handle_request
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    Serve `StubRequestHandler` from a thread, recording requests and connections
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubRequestHandler)
+        self.requests = []
+        self.connections = 0
+
+    def get_request(self):
+        self.connections += 1
+        return super().get_request()
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.server_port}{path}"
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
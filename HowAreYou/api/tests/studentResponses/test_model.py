@@ -85,3 +85,21 @@ class ResponsesModelTests(TestCase):
 
         with self.assertRaises(IntegrityError):
             StudentResponse.objects.create(**resp_obj_copy_3, student=created_student)
+
+    def test_create_response_should_copy_student_age_and_gender(self):
+        """
+        Test create response record copies age and gender of its student
+        Pass criteria:
+            - age and gender of response record equal to age and gender of student record
+        """
+        gender = "f"
+        age = 16
+        created_student = Student.objects.create(gender=gender, age=age)
+
+        resp_obj_copy_4 = deepcopy(resp_obj)
+        created_response = StudentResponse.objects.create(
+            **resp_obj_copy_4, student=created_student
+        )
+
+        self.assertEqual(created_response.age, age)
+        self.assertEqual(created_response.gender, gender)
@@ -0,0 +1,109 @@
+"""
+Test responses columnar snapshot
+"""
+
+import numpy as np
+from uuid import uuid4
+from django.test import TestCase
+from ...models import Student, StudentResponse
+from ...snapshot import ResponseSnapshot, compute_analytics
+
+
+def create_response(answer: int, age: int = 20, gender: str = "m"):
+    """
+    Create student answering `answer` to every question
+    """
+    student = Student.objects.create(id=uuid4(), gender=gender, age=age)
+    return StudentResponse.objects.create(
+        **{f"q{i}_resp": answer for i in range(1, 10)},
+        score=answer * 9,
+        student=student,
+    )
+
+
+class ResponseSnapshotTests(TestCase):
+    """
+    Test for responses columnar snapshot
+    """
+
+    def setUp(self) -> None:
+        for answer in [0, 1, 2, 3]:
+            create_response(answer)
+
+    def test_refresh_should_load_all_responses(self):
+        """
+        Test first refresh loads every response as columns
+        """
+        snapshot = ResponseSnapshot()
+
+        self.assertEqual(snapshot.refresh(), 4)
+        self.assertEqual(snapshot.columns.answers.dtype, np.int8)
+        self.assertEqual(snapshot.columns.answers.shape, (4, 9))
+        self.assertEqual(sorted(snapshot.columns.scores.tolist()), [0, 9, 18, 27])
+        self.assertEqual(snapshot.columns.ages.tolist(), [20, 20, 20, 20])
+
+    def test_refresh_should_only_append_new_responses(self):
+        """
+        Test refresh after insert only appends the new response
+        """
+        snapshot = ResponseSnapshot()
+        snapshot.refresh()
+
+        created_response = create_response(1, gender="f")
+
+        with self.assertNumQueries(2):  # new rows + checksum
+            self.assertEqual(snapshot.refresh(), 1)
+        self.assertEqual(len(snapshot), 5)
+        self.assertEqual(snapshot.columns.ids[-1], created_response.id)
+
+    def test_refresh_should_not_modify_columns_being_read(self):
+        """
+        Test refresh replaces columns as a whole, so columns read before
+        a refresh stay consistent while analytics run on them
+        """
+        snapshot = ResponseSnapshot()
+        snapshot.refresh()
+        columns = snapshot.columns
+
+        create_response(2)
+        snapshot.refresh()
+        StudentResponse.objects.filter(id=columns.ids[0]).delete()
+        snapshot.refresh()
+
+        self.assertEqual(
+            [len(c) for c in [columns.ids, columns.scores, columns.ages]], [4, 4, 4]
+        )
+        self.assertFalse(columns.scores.flags.writeable)
+        self.assertEqual(len(snapshot.columns), 4)
+        self.assertIsNot(snapshot.columns, columns)
+
+    def test_refresh_after_delete_should_reload(self):
+        """
+        Test refresh after delete drops the deleted response
+        """
+        snapshot = ResponseSnapshot()
+        snapshot.refresh()
+
+        deleted_id = StudentResponse.objects.first().id
+        StudentResponse.objects.filter(id=deleted_id).delete()
+        snapshot.refresh()
+
+        self.assertEqual(len(snapshot), 3)
+        self.assertNotIn(deleted_id, snapshot.columns.ids.tolist())
+
+    def test_compute_analytics_should_filter_cohort(self):
+        """
+        Test analytics only include the requested cohort
+        """
+        create_response(3, age=14, gender="f")
+        snapshot = ResponseSnapshot()
+        snapshot.refresh()
+
+        analytics = compute_analytics(snapshot, {"gender": "f", "agelte": 15}, [50])
+
+        self.assertEqual(analytics["total"], 1)
+        self.assertEqual(analytics["score_percentiles"], {"50": 27.0})
+        self.assertEqual(
+            analytics["crosstab"],
+            [{"age": 14, "gender": "Female", "severity": "Severe", "count": 1}],
+        )
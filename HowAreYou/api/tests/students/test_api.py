@@ -2,12 +2,25 @@
 Test Students endpoints
 """
 
+from base64 import urlsafe_b64encode
+
+import numpy as np
 from django.test import TestCase, SimpleTestCase
 from rest_framework.test import RequestsClient, APITestCase
 from rest_framework import status
-from ...models import Resource, Student, StudentResponse
+from ...models import (
+    Resource,
+    Student,
+    StudentDailyStatistics,
+    StudentResponse,
+    StudentStatisticsRollup,
+)
 from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from ...scripts.seed_db_script import seed_students_and_responses_db, seed_resources_db
+from ...statistics import severity_band
 
 
 class StudentsAPITests(APITestCase):
@@ -61,6 +74,87 @@ class StudentsAPITests(APITestCase):
 
         self.assertEqual(GLOBAL_PAGE_SIZE, actual_per_page_responses_size)
 
+    def test_get_students_cursor_pagination_should_walk_every_response_once(self):
+        """
+        Test GET /api/v1/students?cursor=
+            following 'next' cursors should return every response once, newest first
+        """
+        response = self.client.get(self.BASE_URL + "?gender=f&cursor=").data
+        student_ids = []
+        created_at_utcs = []
+
+        while True:
+            student_ids += [r["student"]["id"] for r in response["data"]]
+            created_at_utcs += [r["created_at_utc"] for r in response["data"]]
+            if response["links"]["next"] is None:
+                break
+            response = self.client.get(response["links"]["next"]).data
+
+        expected_student_ids = Student.objects.filter(gender="f").values_list(
+            "id", flat=True
+        )
+        self.assertEqual(len(student_ids), len(set(student_ids)))
+        self.assertEqual(set(student_ids), {str(i) for i in expected_student_ids})
+        self.assertEqual(created_at_utcs, sorted(created_at_utcs, reverse=True))
+
+    def test_get_students_cursor_pagination_previous_link(self):
+        """
+        Test GET /api/v1/students?cursor=
+            'previous' cursor of the second page should return the first page
+        """
+        first_page = self.client.get(self.BASE_URL + "?cursor=").data
+        self.assertIsNone(first_page["links"]["previous"])
+
+        second_page = self.client.get(first_page["links"]["next"]).data
+        self.assertNotEqual(second_page["data"], first_page["data"])
+
+        previous_page = self.client.get(second_page["links"]["previous"]).data
+        self.assertEqual(previous_page["data"], first_page["data"])
+
+    def test_get_students_invalid_cursor_should_return_400_bad_request(self):
+        """
+        Test GET /api/v1/students?cursor=
+            malformed cursor, or cursor together with page should return 400
+        """
+        invalid_params = ["?cursor=abc", "?cursor=&page=2"] + [
+            f"?cursor={urlsafe_b64encode(position.encode()).decode()}"
+            for position in [
+                '["2024-01-01T00:00:00+00:00", 1e400, false]',
+                f'["2024-01-01T00:00:00+00:00", {10 ** 400}, false]',
+                '["2024-01-01T00:00:00+00:00", "1", false]',
+                '["2024-01-01T00:00:00+00:00", 1]',
+                '{"2024-01-01T00:00:00+00:00": 1, "id": 1, "reverse": 1}',
+                "[null, 1, false]",
+            ]
+        ]
+
+        for p in invalid_params:
+            response = self.client.get(f"{self.BASE_URL}{p}", format="json")
+            self.assertEqual(response.status_code, 400)
+            if p != "?cursor=&page=2":
+                self.assertEqual(response.data["cursor"], "Invalid cursor.")
+
+    def test_get_students_constant_number_of_queries_for_any_page_size(self):
+        """
+        Test GET /api/v1/students
+            responses and students should be fetched in one joined query
+            (plus one count query for page numbers) whatever the page size
+        """
+        from unittest import mock
+        from ...views import GetStudentView
+        from ...pagination import CreatedAtCursorPagination
+
+        for page_size in [1, 10, 100]:
+            with mock.patch.object(GetStudentView, "page_size", page_size):
+                with self.assertNumQueries(2):
+                    response = self.client.get(self.BASE_URL + "?gender=m")
+                self.assertEqual(len(response.data["data"]), page_size)
+
+            with mock.patch.object(CreatedAtCursorPagination, "page_size", page_size):
+                with self.assertNumQueries(1):
+                    response = self.client.get(self.BASE_URL + "?cursor=")
+                self.assertEqual(len(response.data["data"]), page_size)
+
     def test_get_students_invalid_param_should_return_400_bad_request(self):
         """
         Test GET /api/v1/students
@@ -160,6 +254,52 @@ class StudentsAPITests(APITestCase):
 
         self.assertEqual(response.status_code, 201)
 
+    def test_create_students_should_write_in_one_transaction(self):
+        """
+        Test POST /api/v1/students/create
+            student, response and rollups should be written in one transaction
+            with one statement each, once rollup rows exist
+        """
+        valid_request_body = {
+            "student": {"age": 12, "gender": "f"},
+            **{f"q{i}_resp": 1 for i in range(1, 10)},
+        }
+        self.client.post(self.BASE_URL + "/create", valid_request_body, format="json")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                self.BASE_URL + "/create", valid_request_body, format="json"
+            )
+
+        self.assertEqual(response.status_code, 201)
+        # first and last statements open and close the transaction (or savepoint)
+        statements = [q["sql"].split()[0] for q in queries.captured_queries]
+        self.assertEqual(statements[1:-1], ["INSERT", "INSERT", "UPDATE", "UPDATE"])
+        self.assertIn(statements[0], ["BEGIN", "SAVEPOINT"])
+
+    def test_create_students_failed_response_insert_should_not_leave_student(self):
+        """
+        Test POST /api/v1/students/create
+            failure to insert the response should roll back the student
+        """
+        from unittest import mock
+
+        expected_total_students = Student.objects.count()
+        valid_request_body = {
+            "student": {"age": 12, "gender": "f"},
+            **{f"q{i}_resp": 1 for i in range(1, 10)},
+        }
+
+        with mock.patch.object(
+            StudentResponse.objects, "create", side_effect=IntegrityError
+        ):
+            response = self.client.post(
+                self.BASE_URL + "/create", valid_request_body, format="json"
+            )
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(Student.objects.count(), expected_total_students)
+
     def test_create_students_invalid_request_body_should_return_400_bad_request(self):
         """
         Test POST /api/v1/students
@@ -310,6 +450,95 @@ class StudentsAPITests(APITestCase):
 
         self.assertNotIn(200, invalid_response_status_codes)
 
+    def test_bulk_create_students_should_return_per_item_results(self):
+        """
+        Test POST /api/v1/students/bulk
+            valid submissions should be created and invalid ones
+            reported with their errors, in the order submitted
+        """
+        valid_submission = {
+            "student": {"age": 15, "gender": "f"},
+            **{f"q{i}_resp": 2 for i in range(1, 10)},
+        }
+        invalid_submission = {**valid_submission, "q9_resp": 4}
+        expected_total_students = Student.objects.count() + 2
+
+        response = self.client.post(
+            self.BASE_URL + "/bulk",
+            [valid_submission, invalid_submission, valid_submission, "invalid"],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(response.data["failed"], 2)
+
+        results = response.data["results"]
+        self.assertEqual([r["index"] for r in results], [0, 1, 2, 3])
+        self.assertEqual(results[0]["score"], 18)
+        self.assertIn("q9_resp", results[1]["errors"])
+        self.assertIn("non_field_errors", results[3]["errors"])
+
+        created = StudentResponse.objects.get(student_id=results[2]["id"])
+        self.assertEqual((created.score, created.age, created.gender), (18, 15, "f"))
+        self.assertEqual(Student.objects.count(), expected_total_students)
+
+        statistics = self.client.get(self.BASE_URL + "/stats").data["statistics"]
+        self.assertEqual(
+            sum(sum(v.values()) for s in statistics for v in s.values()),
+            expected_total_students,
+        )
+
+    def test_bulk_create_students_invalid_request_body_should_return_400(self):
+        """
+        Test POST /api/v1/students/bulk
+            body that is not a non-empty list, is too long or has no valid
+            submission should return 400 and create nothing
+        """
+        expected_total_students = Student.objects.count()
+        invalid_request_bodies = [
+            {"student": {"age": 15, "gender": "f"}},
+            [],
+            [{"student": {"age": 30, "gender": "f"}}],
+        ]
+
+        response_status_codes = []
+
+        for body in invalid_request_bodies:
+            response = self.client.post(self.BASE_URL + "/bulk", body, format="json")
+            response_status_codes.append(response.status_code)
+
+        with self.settings(STUDENT_BULK_MAX_ITEMS=1):
+            response = self.client.post(
+                self.BASE_URL + "/bulk", [{}, {}], format="json"
+            )
+            response_status_codes.append(response.status_code)
+
+        self.assertEqual(response_status_codes, [400, 400, 400, 400])
+        self.assertEqual(Student.objects.count(), expected_total_students)
+
+    def test_bulk_create_students_should_use_constant_queries(self):
+        """
+        Test POST /api/v1/students/bulk
+            number of queries should not grow with number of submissions
+            fitting in one batch of inserts
+        """
+        submission = {
+            "student": {"age": 15, "gender": "f"},
+            **{f"q{i}_resp": 1 for i in range(1, 10)},
+        }
+        query_counts = []
+
+        for size in [2, 50]:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(
+                    self.BASE_URL + "/bulk", [submission] * size, format="json"
+                )
+            self.assertEqual(response.data["created"], size)
+            query_counts.append(len(queries))
+
+        self.assertEqual(query_counts[0], query_counts[1])
+
     def test_get_student_statistics_return_correct_total_students(self):
         """
         Test GET /api/v1/students/stats
@@ -331,6 +560,330 @@ class StudentsAPITests(APITestCase):
                     actual_student_counter += _v
         self.assertEqual(actual_student_counter, expected_total_students)
 
+    def test_get_student_statistics_return_correct_counts_per_category(self):
+        """
+        Test GET /api/v1/students/stats
+            Counts per severity and gender should match the stored responses
+        """
+        expected_statistics = {
+            "None - Minimal": {},
+            "Mild": {},
+            "Moderate": {},
+            "Moderately Severe": {},
+            "Severe": {},
+        }
+        gender_mapping = {"m": "Male", "f": "Female", "o": "Others"}
+
+        for score, gender in StudentResponse.objects.values_list(
+            "score", "student__gender"
+        ):
+            if score >= 20:
+                category = "Severe"
+            elif score >= 15:
+                category = "Moderately Severe"
+            elif score >= 10:
+                category = "Moderate"
+            elif score >= 5:
+                category = "Mild"
+            else:
+                category = "None - Minimal"
+
+            counts = expected_statistics[category]
+            counts[gender_mapping[gender]] = counts.get(gender_mapping[gender], 0) + 1
+
+        response = self.client.get(self.BASE_URL + "/stats", format="json")
+
+        self.assertEqual(response.data["category"], "depression")
+        self.assertEqual(response.data["statistics"], [expected_statistics])
+
+    def test_get_student_statistics_constant_number_of_queries(self):
+        """
+        Test GET /api/v1/students/stats
+            Statistics should be aggregated in a single query
+        """
+        with self.assertNumQueries(1):
+            response = self.client.get(self.BASE_URL + "/stats", format="json")
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_get_student_statistics_reflect_created_and_deleted_students(self):
+        """
+        Test GET /api/v1/students/stats
+            Created and deleted students should be reflected in the statistics
+        """
+        valid_request_body = {
+            "student": {"age": 12, "gender": "o"},
+            "q1_resp": 3,
+            "q2_resp": 3,
+            "q3_resp": 3,
+            "q4_resp": 3,
+            "q5_resp": 3,
+            "q6_resp": 3,
+            "q7_resp": 3,
+            "q8_resp": 0,
+            "q9_resp": 0,
+        }
+
+        self.client.post(self.BASE_URL + "/create", valid_request_body, format="json")
+        response = self.client.get(self.BASE_URL + "/stats", format="json")
+        self.assertEqual(response.data["statistics"][0]["Severe"]["Others"], 1)
+
+        created_student_id = Student.objects.get(gender="o").id
+        self.client.delete(f"{self.BASE_URL}/delete/{created_student_id}")
+        response = self.client.get(self.BASE_URL + "/stats", format="json")
+        self.assertNotIn("Others", response.data["statistics"][0]["Severe"])
+
+    def test_get_student_statistics_cached_response_should_not_query_db(self):
+        """
+        Test GET /api/v1/students/stats
+            Repeated requests should be served from cache without queries
+        """
+        self.client.get(self.BASE_URL + "/stats", format="json")
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.BASE_URL + "/stats", format="json")
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_get_student_statistics_matching_etag_should_return_304_not_modified(
+        self,
+    ):
+        """
+        Test GET /api/v1/students/stats
+            If-None-Match with the current ETag should return 304 Not Modified,
+            and the ETag should change once a student is created
+        """
+        etag = self.client.get(self.BASE_URL + "/stats", format="json")["ETag"]
+
+        response = self.client.get(
+            self.BASE_URL + "/stats", format="json", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 304)
+
+        valid_request_body = {
+            "student": {"age": 12, "gender": "f"},
+            "q1_resp": 0,
+            "q2_resp": 0,
+            "q3_resp": 0,
+            "q4_resp": 0,
+            "q5_resp": 0,
+            "q6_resp": 0,
+            "q7_resp": 0,
+            "q8_resp": 0,
+            "q9_resp": 0,
+        }
+        self.client.post(self.BASE_URL + "/create", valid_request_body, format="json")
+
+        response = self.client.get(
+            self.BASE_URL + "/stats", format="json", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_get_student_statistics_filtered_by_age_and_gender(self):
+        """
+        Test GET /api/v1/students/stats?agegte=&agelte=&gender=
+            The sum of students should be equal to the number of students in the cohort
+        """
+        expected_total_students = Student.objects.filter(
+            age__gte=18, age__lte=20, gender="m"
+        ).count()
+
+        response = self.client.get(
+            self.BASE_URL + "/stats?agegte=18&agelte=20&gender=m", format="json"
+        )
+        statistics = response.data["statistics"][0]
+
+        actual_student_counter = sum(
+            count for genders in statistics.values() for count in genders.values()
+        )
+        self.assertEqual(actual_student_counter, expected_total_students)
+        self.assertTrue(
+            all(set(genders) <= {"Male"} for genders in statistics.values())
+        )
+
+    def test_get_student_statistics_filtered_by_created_at_utc_window(self):
+        """
+        Test GET /api/v1/students/stats?createdgte=&createdlte=
+            Only responses created in the window should be counted
+        """
+        response = self.client.get(
+            self.BASE_URL + "/stats?createdgte=2000-01-01T00:00:00Z", format="json"
+        )
+        statistics = response.data["statistics"][0]
+        actual_student_counter = sum(
+            count for genders in statistics.values() for count in genders.values()
+        )
+        self.assertEqual(actual_student_counter, StudentResponse.objects.count())
+
+        response = self.client.get(
+            self.BASE_URL + "/stats?createdlte=2000-01-01T00:00:00Z", format="json"
+        )
+        statistics = response.data["statistics"][0]
+        self.assertTrue(all(genders == {} for genders in statistics.values()))
+
+    def test_get_student_statistics_invalid_params_should_return_400_bad_request(
+        self,
+    ):
+        """
+        Test GET /api/v1/students/stats
+            invalid params should return 400 Bad Request
+        """
+        invalid_params = [
+            "?page=2",  # 'page' is invalid
+            "?gender=a",  # invalid gender
+            "?agegte=20&agelte=14",  # agegte > agelte
+            "?createdgte=2024-01-02T00:00:00Z&createdlte=2024-01-01T00:00:00Z",
+            "?createdgte=yesterday",  # invalid datetime
+        ]
+
+        for p in invalid_params:
+            response = self.client.get(f"{self.BASE_URL}/stats{p}", format="json")
+            self.assertEqual(response.status_code, 400)
+
+    def test_get_student_trends_should_return_counts_and_mean_score_per_period(self):
+        """
+        Test GET /api/v1/students/stats/trends
+            Every granularity should count every response once with its mean score
+        """
+        expected_total_responses = StudentResponse.objects.count()
+        expected_mean_score = round(
+            sum(StudentResponse.objects.values_list("score", flat=True))
+            / expected_total_responses,
+            2,
+        )
+
+        for granularity in ["day", "week", "month"]:
+            response = self.client.get(
+                self.BASE_URL + f"/stats/trends?granularity={granularity}",
+                format="json",
+            )
+            trends = response.data["trends"]
+
+            self.assertEqual(response.data["granularity"], granularity)
+            self.assertEqual(len(trends), 1)  # seeded data is created on the same day
+            self.assertEqual(trends[0]["count"], expected_total_responses)
+            self.assertEqual(trends[0]["mean_score"], expected_mean_score)
+            self.assertEqual(
+                sum(trends[0]["statistics"].values()), expected_total_responses
+            )
+
+    def test_get_student_trends_reflect_created_and_deleted_students(self):
+        """
+        Test GET /api/v1/students/stats/trends
+            Created and deleted students should be reflected in the daily bucket
+        """
+        expected_total_responses = StudentResponse.objects.count()
+        valid_request_body = {
+            "student": {"age": 12, "gender": "o"},
+            "q1_resp": 0,
+            "q2_resp": 0,
+            "q3_resp": 0,
+            "q4_resp": 0,
+            "q5_resp": 0,
+            "q6_resp": 0,
+            "q7_resp": 0,
+            "q8_resp": 0,
+            "q9_resp": 0,
+        }
+
+        self.client.post(self.BASE_URL + "/create", valid_request_body, format="json")
+        response = self.client.get(self.BASE_URL + "/stats/trends", format="json")
+        self.assertEqual(
+            response.data["trends"][0]["count"], expected_total_responses + 1
+        )
+
+        created_student_id = Student.objects.get(gender="o").id
+        self.client.delete(f"{self.BASE_URL}/delete/{created_student_id}")
+        response = self.client.get(self.BASE_URL + "/stats/trends", format="json")
+        self.assertEqual(response.data["trends"][0]["count"], expected_total_responses)
+
+    def test_get_student_trends_invalid_params_should_return_400_bad_request(self):
+        """
+        Test GET /api/v1/students/stats/trends
+            invalid params should return 400 Bad Request
+        """
+        invalid_params = [
+            "?granularity=year",  # invalid granularity
+            "?gender=m",  # 'gender' is invalid
+            "?createdgte=2024-01-02&createdlte=2024-01-01",  # createdgte > createdlte
+        ]
+
+        for p in invalid_params:
+            response = self.client.get(
+                f"{self.BASE_URL}/stats/trends{p}", format="json"
+            )
+            self.assertEqual(response.status_code, 400)
+
+    def test_get_student_item_statistics_should_return_answer_distribution(self):
+        """
+        Test GET /api/v1/students/stats/items
+            Answer frequencies, mean and variance should match the stored responses
+        """
+        questions = [f"q{i}_resp" for i in range(1, 10)]
+        answers = np.array(StudentResponse.objects.values_list(*questions))
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.BASE_URL + "/stats/items", format="json")
+        items = response.data["items"]
+
+        self.assertEqual(response.data["total"], len(answers))
+        self.assertEqual(len(items), 9)
+
+        for i, item in enumerate(items):
+            self.assertEqual(item["question"], questions[i])
+            self.assertEqual(
+                item["frequencies"],
+                [int((answers[:, i] == v).sum()) for v in range(4)],
+            )
+            self.assertAlmostEqual(item["mean"], answers[:, i].mean(), places=3)
+            self.assertAlmostEqual(item["variance"], answers[:, i].var(), places=3)
+
+        self.assertAlmostEqual(
+            response.data["q9_positive_share"], (answers[:, 8] > 0).mean(), places=3
+        )
+
+    def test_get_student_item_statistics_filtered_by_gender(self):
+        """
+        Test GET /api/v1/students/stats/items?gender=
+            Only responses of the cohort should be analysed
+        """
+        response = self.client.get(
+            self.BASE_URL + "/stats/items?gender=f", format="json"
+        )
+
+        self.assertEqual(
+            response.data["total"],
+            StudentResponse.objects.filter(student__gender="f").count(),
+        )
+        for item in response.data["items"]:
+            self.assertEqual(sum(item["frequencies"]), response.data["total"])
+
+    def test_get_student_analytics_should_match_responses(self):
+        """
+        Test GET /api/v1/students/stats/analytics
+            Correlations, percentiles and cross-tab should match the stored responses
+        """
+        questions = [f"q{i}_resp" for i in range(1, 10)]
+        answers = np.array(StudentResponse.objects.values_list(*questions))
+        scores = np.array(StudentResponse.objects.values_list("score", flat=True))
+
+        response = self.client.get(self.BASE_URL + "/stats/analytics", format="json")
+        analytics = response.data
+
+        self.assertEqual(analytics["total"], len(scores))
+        np.testing.assert_allclose(
+            np.array(analytics["item_correlations"], dtype=float),
+            np.corrcoef(answers, rowvar=False),
+            atol=1e-4,
+        )
+        self.assertEqual(
+            analytics["score_percentiles"]["50"], np.percentile(scores, 50)
+        )
+        self.assertEqual(
+            sum(c["count"] for c in analytics["crosstab"]), Student.objects.count()
+        )
+
     def test_delete_students_valid_student_id_should_return_204_no_content(self):
         """
         Test DELETE /api/v1/students/<student_id>
@@ -346,6 +899,59 @@ class StudentsAPITests(APITestCase):
 
         self.assertEqual(response_status_code, 204)
 
+    def test_delete_students_undercounted_rollups_should_return_204_no_content(self):
+        """
+        Test DELETE /api/v1/students/<student_id>
+            students of a bucket whose rollups count fewer responses
+            should be deleted and their rollups floored at 0
+        """
+        valid_request_body = {
+            "student": {"age": 12, "gender": "o"},
+            "q1_resp": 3,
+            "q2_resp": 3,
+            "q3_resp": 3,
+            "q4_resp": 3,
+            "q5_resp": 3,
+            "q6_resp": 3,
+            "q7_resp": 3,
+            "q8_resp": 0,
+            "q9_resp": 0,
+        }
+        for _ in range(2):
+            self.client.post(
+                self.BASE_URL + "/create", valid_request_body, format="json"
+            )
+
+        StudentStatisticsRollup.objects.filter(gender="o", age=12).update(
+            count=1, score_sum=1
+        )
+        StudentDailyStatistics.objects.filter(severity=severity_band(21)).update(
+            count=1, score_sum=1
+        )
+
+        response_status_codes = [
+            self.client.delete(f"{self.BASE_URL}/delete/{student.id}").status_code
+            for student in Student.objects.filter(gender="o")
+        ]
+
+        self.assertEqual([204, 204], response_status_codes)
+        self.assertEqual(
+            [(0, 0)],
+            list(
+                StudentStatisticsRollup.objects.filter(gender="o", age=12).values_list(
+                    "count", "score_sum"
+                )
+            ),
+        )
+        self.assertEqual(
+            [0],
+            list(
+                StudentDailyStatistics.objects.filter(
+                    date=timezone.localdate(), severity=severity_band(21)
+                ).values_list("count", flat=True)
+            ),
+        )
+
     def test_delete_students_invalid_UUID_student_id_should_return_400_bad_request(
         self,
     ):
@@ -0,0 +1,187 @@
+"""
+Test async Students endpoint
+"""
+
+from rest_framework.test import APITestCase
+from ...models import Resource, Student, StudentResponse
+from ...scripts.seed_db_script import seed_students_and_responses_db, seed_resources_db
+
+
+class AsyncStudentsAPITests(APITestCase):
+    """
+    Test for async Students API endpoints
+    """
+
+    BASE_URL = "http://127.0.0.1:8000/api/v1"
+
+    def setUp(self) -> None:
+        seed_students_and_responses_db()
+        seed_resources_db()
+
+    def tearDown(self) -> None:
+        Student.objects.all().delete()
+        StudentResponse.objects.all().delete()
+        Resource.objects.all().delete()
+
+    async def assert_matches_sync_output(self, path: str):
+        sync_response = await self.async_client.get(f"{self.BASE_URL}/{path}")
+        async_response = await self.async_client.get(f"{self.BASE_URL}/async/{path}")
+
+        self.assertEqual(async_response.status_code, sync_response.status_code)
+
+        # links are absolute urls of each endpoint
+        sync_output, async_output = sync_response.json(), async_response.json()
+        sync_output.pop("links", None)
+        async_output.pop("links", None)
+        self.assertEqual(async_output, sync_output)
+
+        return async_response
+
+    async def test_async_get_students_should_match_sync_output(self):
+        """
+        Test GET /api/v1/async/students
+            pages should be the same as GET /api/v1/students
+        """
+        for params in ["", "?page=2", "?gender=f&agegte=14", "?cursor="]:
+            response = await self.assert_matches_sync_output(f"students{params}")
+            self.assertEqual(response.status_code, 200)
+
+        response = await self.async_client.get(f"{self.BASE_URL}/async/students?page=2")
+        self.assertIn("/async/students?page=3", response.json()["links"]["next"])
+        self.assertTrue(
+            response.json()["links"]["previous"].endswith("/async/students")
+        )
+
+    async def test_async_get_students_should_walk_cursor_pages(self):
+        """
+        Test GET /api/v1/async/students
+            following next links should return every response once
+        """
+        url = f"{self.BASE_URL}/async/students?cursor="
+        seen = 0
+
+        while url:
+            response = (await self.async_client.get(url)).json()
+            seen += len(response["data"])
+            url = response["links"]["next"]
+
+        self.assertEqual(seen, await StudentResponse.objects.acount())
+
+    async def test_async_get_students_invalid_params_should_return_4xx(self):
+        """
+        Test GET /api/v1/async/students
+            invalid parameter, value, page or cursor should return 400 or 404
+        """
+        invalid_params = [
+            "?age=12",
+            "?page=1&cursor=",
+            "?agegte=30",
+            "?cursor=invalid",
+            "?cursor=WyIyMDI0LTAxLTAxVDAwOjAwOjAwKzAwOjAwIiwgMWU0MDAsIGZhbHNlXQ==",
+            "?page=1000",
+        ]
+
+        resp_status_codes = []
+
+        for params in invalid_params:
+            response = await self.async_client.get(
+                f"{self.BASE_URL}/async/students{params}"
+            )
+            resp_status_codes.append(response.status_code)
+
+        self.assertEqual(resp_status_codes, [400, 400, 400, 400, 400, 404])
+
+    async def test_async_get_student_statistics_should_match_sync_output(self):
+        """
+        Test GET /api/v1/async/students/stats
+            output should be the same as GET /api/v1/students/stats
+        """
+        for params in ["", "?gender=m", "?createdgte=2000-01-01T00:00:00Z"]:
+            response = await self.assert_matches_sync_output(f"students/stats{params}")
+            self.assertEqual(response.status_code, 200)
+
+        etag = response["ETag"]
+        response = await self.async_client.get(
+            f"{self.BASE_URL}/async/students/stats", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status_code, 304)
+
+    async def test_async_create_students_should_return_message_and_resources(self):
+        """
+        Test POST /api/v1/async/students/create
+            valid request body should create the student, return message,
+            3 resources and update statistics
+        """
+        expected_total_students = await Student.objects.acount() + 1
+        valid_request_body = {
+            "student": {"age": 12, "gender": "f"},
+            **{f"q{i}_resp": 3 for i in range(1, 10)},
+        }
+
+        response = await self.async_client.post(
+            f"{self.BASE_URL}/async/students/create",
+            valid_request_body,
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["score"], 27)
+        self.assertIn("seek immediate help", response.json()["message"])
+        self.assertEqual(len(response.json()["resources"]), 3)
+        self.assertEqual(await Student.objects.acount(), expected_total_students)
+
+        statistics = (
+            await self.async_client.get(f"{self.BASE_URL}/async/students/stats")
+        ).json()["statistics"]
+        self.assertEqual(
+            sum(sum(v.values()) for s in statistics for v in s.values()),
+            expected_total_students,
+        )
+
+    async def test_async_create_students_should_not_require_csrf_token(self):
+        """
+        Test POST /api/v1/async/students/create
+            API clients without a csrf token should be served like
+            the sync endpoint
+        """
+        from django.test import AsyncClient
+
+        client = AsyncClient(enforce_csrf_checks=True)
+        valid_request_body = {
+            "student": {"age": 12, "gender": "f"},
+            **{f"q{i}_resp": 1 for i in range(1, 10)},
+        }
+
+        resp_status_codes = []
+
+        for path in ["students/create", "async/students/create"]:
+            response = await client.post(
+                f"{self.BASE_URL}/{path}",
+                valid_request_body,
+                content_type="application/json",
+            )
+            resp_status_codes.append(response.status_code)
+
+        self.assertEqual(resp_status_codes, [201, 201])
+
+    async def test_async_create_students_invalid_request_body_should_return_400(self):
+        """
+        Test POST /api/v1/async/students/create
+            invalid or malformed request body should return 400
+        """
+        invalid_request_bodies = [
+            '{"student": {"age": 12, "gender": "f"}}',
+            "not json",
+        ]
+
+        resp_status_codes = []
+
+        for body in invalid_request_bodies:
+            response = await self.async_client.post(
+                f"{self.BASE_URL}/async/students/create",
+                body,
+                content_type="application/json",
+            )
+            resp_status_codes.append(response.status_code)
+
+        self.assertEqual(resp_status_codes, [400, 400])
@@ -5,8 +5,18 @@ Test seeding students db
 from unittest import TestCase
 from pathlib import Path as p
 import pandas as pd
-from ...scripts.seed_db_script import seed_students_and_responses_db
-from ...models import Student, StudentResponse
+from ...rollups import find_rollup_drift
+from ...scripts.seed_db_script import (
+    prepare_students_frame,
+    prepare_students_frames,
+    seed_students_and_responses_db,
+)
+from ...models import (
+    Student,
+    StudentResponse,
+    StudentStatisticsRollup,
+    StudentDailyStatistics,
+)
 
 CURRENT_PATH = p.cwd()
 DATA_PATH = str(CURRENT_PATH.parent) + "/data"
@@ -28,6 +38,8 @@ class StudentSeedTests(TestCase):
     def tearDown(self) -> None:
         Student.objects.all().delete()
         StudentResponse.objects.all().delete()
+        StudentStatisticsRollup.objects.all().delete()
+        StudentDailyStatistics.objects.all().delete()
 
     def test_relative_data_csv_file_exists(self):
         """
@@ -48,3 +60,87 @@ class StudentSeedTests(TestCase):
         actual_students_records_in_db = len(Student.objects.all())
 
         self.assertEqual(expected_students_rows, actual_students_records_in_db)
+
+    def test_seed_students_should_record_rollups(self):
+        """
+        Test seeding script records rollups of every inserted response
+        Pass criteria: stored rollups match rollups recomputed from responses
+        """
+        self.assertEqual(find_rollup_drift(), [])
+        self.assertEqual(
+            sum(StudentDailyStatistics.objects.values_list("count", flat=True)),
+            StudentResponse.objects.count(),
+        )
+
+    def test_prepare_students_frame(self):
+        """
+        Test csv rows are prepared on whole columns
+        Pass criteria:
+        - genders are mapped
+        - ids are derived from row content, identical rows get different ids
+          numbered across chunks
+        - unknown genders fail
+        """
+        df = pd.read_csv(RELATIVE_CSV_PATHS["data"]).head(100)
+        df = pd.concat([df, df.head(10)], ignore_index=True)
+        frame = prepare_students_frame(df)
+
+        self.assertEqual(set(frame["gender"]), {"f", "m"})
+        self.assertEqual(frame["id"].nunique(), 110)
+        self.assertEqual(
+            frame["id"].tolist(), prepare_students_frame(df.copy())["id"].tolist()
+        )
+        chunks = [df.iloc[start : start + 7] for start in range(0, len(df), 7)]
+        self.assertEqual(
+            frame["id"].tolist(),
+            pd.concat(prepare_students_frames(chunks))["id"].tolist(),
+        )
+
+        changed = df.assign(Institute="Other")
+        self.assertFalse(set(prepare_students_frame(changed)["id"]) & set(frame["id"]))
+
+        with self.assertRaises(ValueError):
+            prepare_students_frame(df.assign(Gender="Unknown"))
+
+    def test_reseed_students_should_skip_seeded_rows(self):
+        """
+        Test re-seeding an unchanged file
+        Pass criteria: no row is created and rollups still match responses
+        """
+        expected_students_rows = Student.objects.count()
+
+        totals = seed_students_and_responses_db(chunk_size=1000)
+
+        self.assertEqual(totals["created"], 0)
+        self.assertEqual(totals["rows"], expected_students_rows)
+        self.assertEqual(Student.objects.count(), expected_students_rows)
+        self.assertEqual(StudentResponse.objects.count(), expected_students_rows)
+        self.assertEqual(find_rollup_drift(), [])
+
+    def test_reseed_students_after_editing_file_should_only_add_new_rows(self):
+        """
+        Test re-seeding a file with a row inserted then a row removed mid-file
+        Pass criteria:
+        - only the inserted row is created, even when identical to other rows
+        - removing a row creates nothing
+        """
+        import tempfile
+
+        df = pd.read_csv(RELATIVE_CSV_PATHS["data"])
+        middle = len(df) // 2
+        expected_students_rows = Student.objects.count() + 1
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = p(directory) / "data.csv"
+            pd.concat([df.iloc[:middle], df.iloc[[0]], df.iloc[middle:]]).to_csv(
+                path, index=False
+            )
+            inserted = seed_students_and_responses_db(str(path), chunk_size=1000)
+
+            df.drop(index=middle).to_csv(path, index=False)
+            removed = seed_students_and_responses_db(str(path), chunk_size=1000)
+
+        self.assertEqual(inserted["created"], 1)
+        self.assertEqual(removed["created"], 0)
+        self.assertEqual(Student.objects.count(), expected_students_rows)
+        self.assertEqual(find_rollup_drift(), [])
@@ -0,0 +1,66 @@
+"""
+Test generating synthetic students
+"""
+
+from unittest import TestCase
+from pathlib import Path as p
+import numpy as np
+import pandas as pd
+from ...scripts.synthetic_script import CSV_QUESTION_COLUMNS, SyntheticModel
+
+CURRENT_PATH = p.cwd()
+DATA_PATH = str(CURRENT_PATH.parent) + "/data"
+
+RELATIVE_CSV_PATHS = {
+    "data": DATA_PATH + "/data.csv",
+}
+
+
+class SyntheticModelTests(TestCase):
+    """
+    Test model fitted to data.csv generating synthetic students
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.source = pd.read_csv(RELATIVE_CSV_PATHS["data"])
+        cls.synthetic = pd.concat(
+            SyntheticModel.fit(cls.source).generate(200_000, seed=3, chunk_size=30_000)
+        )
+
+    def test_generate_should_match_distributions(self):
+        """
+        Test synthetic rows follow distributions of data.csv
+        Pass criteria: shares of genders, ages, answers and institutes per gender
+        are within 1 point of data.csv
+        """
+        for columns in [["Gender"], ["Gender", "Age"], ["Gender", "Institute"]] + [
+            ["Gender", question] for question in CSV_QUESTION_COLUMNS
+        ]:
+            expected = self.source.value_counts(columns, normalize=True)
+            actual = self.synthetic.value_counts(columns, normalize=True)
+
+            self.assertLess(
+                (expected - actual.reindex(expected.index, fill_value=0)).abs().max(),
+                0.01,
+                columns,
+            )
+
+    def test_generate_should_match_correlations(self):
+        """
+        Test synthetic rows are correlated like data.csv
+        Pass criteria:
+        - correlations between answers and age are within 0.05 of data.csv
+        - mean and spread of scores are within 0.2 of data.csv
+        """
+        columns = ["Age", *CSV_QUESTION_COLUMNS]
+        expected = self.source[columns].corr().to_numpy()
+        actual = self.synthetic[columns].corr().to_numpy()
+
+        self.assertLess(np.abs(expected - actual).max(), 0.05)
+        for statistic in ["mean", "std"]:
+            self.assertAlmostEqual(
+                self.synthetic["PHQ9 score"].agg(statistic),
+                self.source["PHQ9 score"].agg(statistic),
+                delta=0.2,
+            )
@@ -3,10 +3,18 @@ Test custom management commands
 """
 
 from django.core.management import call_command
+from django.core.management.base import CommandError
 from unittest import TestCase
 import pandas as pd
 from pathlib import Path as p
-from ..models import Student, StudentResponse, Resource
+from ..models import (
+    Student,
+    StudentResponse,
+    Resource,
+    StudentStatisticsRollup,
+    StudentDailyStatistics,
+)
+from .stub_server import StubServer
 
 CURRENT_PATH = p.cwd()
 DATA_PATH = str(CURRENT_PATH.parent) + "/data"
@@ -29,6 +37,8 @@ class CustomCommandTest(TestCase):
         Resource.objects.all().delete()
         Student.objects.all().delete()
         StudentResponse.objects.all().delete()
+        StudentStatisticsRollup.objects.all().delete()
+        StudentDailyStatistics.objects.all().delete()
 
     def test_seed_db_command(self):
         """
@@ -56,3 +66,315 @@ class CustomCommandTest(TestCase):
             expected_students_and_responses_rows, actual_responses_created_records
         )
         self.assertEqual(expected_resources_rows, actual_resources_created_records)
+
+    def test_seed_db_command_with_path(self):
+        """
+        Test `seed_db --path --chunk-size` management command
+
+        Pass criteria:
+        - every row of the file is ingested, chunk by chunk
+        - rows of data.csv already seeded are skipped
+        - progress and throughput are reported
+        - resources are not seeded again
+        - file with invalid values fails without inserting any row
+        """
+        import tempfile
+        from io import StringIO
+
+        expected_students_rows = Student.objects.count() + len(
+            pd.read_csv(RELATIVE_CSV_PATHS["data"])
+        )
+        expected_resources_rows = Resource.objects.count()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = p(directory) / "data.csv"
+            df = pd.read_csv(RELATIVE_CSV_PATHS["data"])
+            pd.concat([df, df]).to_csv(path, index=False)
+
+            out = StringIO()
+            call_command(
+                "seed_db", "--path", str(path), "--chunk-size", "1000", stdout=out
+            )
+
+            df.loc[5, "q3"] = 7
+            df.to_csv(path, index=False)
+            with self.assertRaisesRegex(CommandError, "line.s.: 7$"):
+                call_command("seed_db", "--path", str(path), stdout=StringIO())
+
+        self.assertIn(f"{2 * len(df)} rows seeded in", out.getvalue())
+        self.assertIn(f"{len(df)} new, {len(df)} already seeded", out.getvalue())
+        self.assertEqual(Student.objects.count(), expected_students_rows)
+        self.assertEqual(StudentResponse.objects.count(), expected_students_rows)
+        self.assertEqual(Resource.objects.count(), expected_resources_rows)
+
+    def test_seed_db_command_with_directory(self):
+        """
+        Test `seed_db --path --workers` management command with several files
+
+        Pass criteria:
+        - every file of a directory or glob pattern is seeded, in order
+        - per-file timing and totals are reported
+        - file with invalid values fails naming the file
+        """
+        import tempfile
+        from io import StringIO
+
+        # rows of an institute file can be rows of data.csv already seeded
+        Student.objects.all().delete()
+
+        df = pd.read_csv(RELATIVE_CSV_PATHS["data"])
+        institutes = sorted(df["Institute"].unique())[:3]
+        expected_students_rows = sum(
+            (df["Institute"] == institute).sum() for institute in institutes
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            for institute in institutes:
+                df[df["Institute"] == institute].to_csv(
+                    p(directory) / f"{institute}.csv", index=False
+                )
+
+            out = StringIO()
+            call_command("seed_db", "--path", directory, "--workers", "2", stdout=out)
+            call_command("seed_db", "--path", f"{directory}/*.csv", stdout=StringIO())
+
+            (p(directory) / "invalid.csv").write_text(
+                "Gender,Age,q1,q2,q3,q4,q5,q6,q7,q8,q9,PHQ9 score\n"
+                "Female,99,1,1,1,1,1,1,1,1,1,9\n"
+            )
+            with self.assertRaisesRegex(CommandError, "invalid.csv"):
+                call_command("seed_db", "--path", directory, stdout=StringIO())
+
+        reported_files = [
+            line.split(": ")[1].split("/")[-1]
+            for line in out.getvalue().splitlines()
+            if "parsed in" in line
+        ]
+        self.assertEqual(reported_files, [f"{i}.csv" for i in institutes])
+        self.assertIn(f"of {len(institutes)} files seeded", out.getvalue())
+        self.assertEqual(Student.objects.count(), expected_students_rows)
+        self.assertEqual(StudentResponse.objects.count(), expected_students_rows)
+
+    def test_seed_db_command_twice(self):
+        """
+        Test running `seed_db` management command again
+
+        Pass criteria:
+        - no student, response or resource is duplicated
+        """
+        expected_students_rows = Student.objects.count()
+        expected_resources_rows = Resource.objects.count()
+
+        call_command("seed_db")
+
+        self.assertEqual(Student.objects.count(), expected_students_rows)
+        self.assertEqual(StudentResponse.objects.count(), expected_students_rows)
+        self.assertEqual(Resource.objects.count(), expected_resources_rows)
+
+    def test_rebuild_rollups_command(self):
+        """
+        Test `rebuild_rollups` management command
+
+        Pass criteria:
+        - `--check` fails when stored rollups drifted from responses
+        - rebuilt rollups count every response exactly once
+        """
+        StudentStatisticsRollup.objects.filter(severity="severe").update(count=0)
+
+        with self.assertRaises(CommandError):
+            call_command("rebuild_rollups", "--check")
+
+        call_command("rebuild_rollups")
+        call_command("rebuild_rollups", "--check")
+
+        actual_rollup_responses = sum(
+            StudentStatisticsRollup.objects.values_list("count", flat=True)
+        )
+        self.assertEqual(actual_rollup_responses, StudentResponse.objects.count())
+
+    def test_backfill_trends_command(self):
+        """
+        Test `backfill_trends` management command
+
+        Pass criteria:
+        - backfilled daily buckets count every response exactly once
+        """
+        StudentDailyStatistics.objects.all().delete()
+
+        call_command("backfill_trends")
+
+        actual_daily_responses = sum(
+            StudentDailyStatistics.objects.values_list("count", flat=True)
+        )
+        self.assertEqual(actual_daily_responses, StudentResponse.objects.count())
+
+    def test_verify_resources_command(self):
+        """
+        Test `verify_resources` management command
+
+        Pass criteria:
+        - pending resources with a reachable url are verified
+        - pending resources with an unreachable url are broken
+        - resources already checked are left alone
+        """
+        with StubServer() as server:
+            Resource.objects.bulk_create(
+                [Resource(url=server.url(f"/ok/{i}"), type="article") for i in range(3)]
+                + [Resource(url=server.url("/missing/1"), type="video")]
+            )
+            expected_verified_rows = Resource.objects.exclude(
+                status=Resource.PENDING
+            ).count()
+
+            call_command("verify_resources", "--batch-size", "2")
+
+        self.assertEqual(
+            Resource.objects.filter(status=Resource.VERIFIED).count(),
+            expected_verified_rows + 3,
+        )
+        self.assertEqual(
+            list(
+                Resource.objects.filter(status=Resource.BROKEN).values_list(
+                    "url", flat=True
+                )
+            ),
+            [server.url("/missing/1")],
+        )
+        self.assertEqual(len(server.requests), 4)
+
+    def test_import_resources_command(self):
+        """
+        Test `import_resources` management command
+
+        Pass criteria:
+        - new resources of csv and json files are created verified or broken
+        - urls repeated in the file or already in db are skipped
+        - file of unknown format fails
+        """
+        import json
+        import tempfile
+
+        existing_url = Resource.objects.first().url
+        expected_resources_rows = Resource.objects.count()
+
+        with StubServer() as server, tempfile.TemporaryDirectory() as directory:
+            csv_path = p(directory) / "resources.csv"
+            csv_path.write_text(
+                "url,type,severities\n"
+                f"{server.url('/ok/1')},video,severe|mild\n"
+                f"{server.url('/ok/1')},video,\n"
+                f"{existing_url},article,\n"
+            )
+            json_path = p(directory) / "resources.json"
+            json_path.write_text(
+                json.dumps(
+                    [
+                        {"url": server.url("/missing/1"), "type": "article"},
+                        {"url": server.url("/ok/1"), "type": "video"},
+                    ]
+                )
+            )
+
+            call_command("import_resources", str(csv_path), "--chunk-size", "1")
+            call_command("import_resources", str(json_path))
+
+            with self.assertRaises(CommandError):
+                call_command("import_resources", str(p(directory) / "resources.txt"))
+
+        self.assertEqual(Resource.objects.count(), expected_resources_rows + 2)
+        self.assertEqual(
+            Resource.objects.get(url=server.url("/ok/1")).severities,
+            ["severe", "mild"],
+        )
+        self.assertEqual(
+            Resource.objects.get(url=server.url("/missing/1")).status,
+            Resource.BROKEN,
+        )
+
+    def test_generate_synthetic_command(self):
+        """
+        Test `generate_synthetic` management command
+
+        Pass criteria:
+        - csv output is shaped like data.csv, with valid values and summed scores
+        - the same seed generates the same rows whatever the chunk size
+        - rows generated into db are seeded once per seed, rollups follow
+        - output of unknown format fails
+        """
+        import tempfile
+        from io import StringIO
+        from ..rollups import find_rollup_drift
+        from ..scripts.seed_db_script import prepare_students_frame
+
+        expected_students_rows = Student.objects.count()
+
+        with tempfile.TemporaryDirectory() as directory:
+            paths = [p(directory) / f"synthetic-{i}.csv" for i in range(3)]
+            for path, seed, chunk_size in zip(paths, [7, 7, 8], [1000, 5000, 5000]):
+                call_command(
+                    "generate_synthetic",
+                    "5000",
+                    "--seed",
+                    str(seed),
+                    "--chunk-size",
+                    str(chunk_size),
+                    "--output",
+                    str(path),
+                    stdout=StringIO(),
+                )
+            synthetic = pd.read_csv(paths[0])
+
+            self.assertEqual(paths[0].read_text(), paths[1].read_text())
+            self.assertNotEqual(paths[0].read_text(), paths[2].read_text())
+
+            with self.assertRaises(CommandError):
+                call_command(
+                    "generate_synthetic",
+                    "10",
+                    "--output",
+                    str(p(directory) / "synthetic.txt"),
+                )
+
+            parquet_path = p(directory) / "synthetic.parquet"
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                with self.assertRaisesRegex(CommandError, "pyarrow"):
+                    call_command(
+                        "generate_synthetic", "10", "--output", str(parquet_path)
+                    )
+            else:
+                call_command(
+                    "generate_synthetic",
+                    "5000",
+                    "--seed",
+                    "7",
+                    "--output",
+                    str(parquet_path),
+                    stdout=StringIO(),
+                )
+                self.assertTrue(pd.read_parquet(parquet_path).equals(synthetic))
+
+        self.assertEqual(
+            list(synthetic.columns),
+            list(pd.read_csv(RELATIVE_CSV_PATHS["data"]).columns),
+        )
+        self.assertEqual(len(synthetic), 5000)
+        self.assertEqual(len(prepare_students_frame(synthetic)), 5000)
+        self.assertTrue(
+            (
+                synthetic["PHQ9 score"]
+                == synthetic[[f"q{i}" for i in range(1, 10)]].sum(axis=1)
+            ).all()
+        )
+
+        out = StringIO()
+        call_command("generate_synthetic", "2000", "--chunk-size", "300", stdout=out)
+        call_command("generate_synthetic", "2000", "--chunk-size", "700", stdout=out)
+        call_command("generate_synthetic", "1000", "--seed", "1", stdout=out)
+
+        self.assertIn("2000 rows seeded, 2000 new", out.getvalue())
+        self.assertIn("2000 rows seeded, 0 new, 2000 already seeded", out.getvalue())
+        self.assertEqual(Student.objects.count(), expected_students_rows + 3000)
+        self.assertEqual(StudentResponse.objects.count(), expected_students_rows + 3000)
+        self.assertEqual(find_rollup_drift(), [])
@@ -0,0 +1,180 @@
+"""
+Pooled, concurrent checks that resource urls are reachable
+"""
+
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from requests.adapters import HTTPAdapter
+
+# HEAD is not supported by the server, retry with a streamed GET
+HEAD_NOT_SUPPORTED = {400, 403, 405, 501}
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Return `url` with lowercase scheme and host, without default port
+    or fragment, so that equivalent urls share one cached result.
+    Urls that cannot be parsed, like urls with a port out of range,
+    are returned stripped but otherwise unchanged.
+    """
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url.strip()
+
+    scheme = parts.scheme.lower()
+    netloc = (parts.hostname or "").lower()
+
+    if parts.username is not None:
+        userinfo = parts.username
+        if parts.password is not None:
+            userinfo += ":" + parts.password
+        netloc = f"{userinfo}@{netloc}"
+    if port is not None and port != DEFAULT_PORTS.get(scheme):
+        netloc += f":{port}"
+
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+class UrlChecker:
+    """
+    Check urls return 200 within a `timeout` budget (seconds) per url.
+
+    Sends HEAD first and only falls back to a GET whose body is never read.
+    Connections are kept alive in a pool per thread, and `check_many()`
+    checks up to `max_workers` urls at once.
+
+    When a `cache` is given, results are cached by normalized url,
+    valid urls for `ttl` seconds and invalid urls for `negative_ttl` seconds.
+    """
+
+    def __init__(
+        self,
+        timeout: float,
+        max_workers: int,
+        cache: BaseCache | None = None,
+        ttl: float | None = None,
+        negative_ttl: float | None = None,
+    ):
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.cache = cache
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.local = threading.local()
+        # long-lived workers, so their pooled connections are reused across calls
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix="url-check")
+
+    def get_session(self) -> requests.Session:
+        session = getattr(self.local, "session", None)
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=1)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self.local.session = session
+
+        return session
+
+    def request_status(self, method: str, url: str, deadline: float) -> int:
+        """
+        Return status code of `method` on `url` without reading the body
+        """
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise requests.Timeout(f"timeout budget exceeded for {url}")
+
+        # a HEAD response has no body and returns its connection to the pool,
+        # a streamed GET is closed without downloading the body
+        with self.get_session().request(
+            method,
+            url,
+            timeout=remaining,
+            allow_redirects=True,
+            stream=method != "HEAD",
+        ) as response:
+            return response.status_code
+
+    def fetch(self, url: str) -> bool:
+        """
+        Check `url` returns 200 within the timeout budget, bypassing the cache
+        """
+        deadline = time.monotonic() + self.timeout
+
+        try:
+            status_code = self.request_status("HEAD", url, deadline)
+            if status_code in HEAD_NOT_SUPPORTED:
+                status_code = self.request_status("GET", url, deadline)
+        except Exception:
+            return False
+
+        return status_code == 200
+
+    def cache_key(self, url: str) -> str:
+        digest = hashlib.sha256(normalize_url(url).encode()).hexdigest()
+        return f"url-check:{digest}"
+
+    def store(self, results: dict[str, bool]) -> None:
+        """
+        Cache `results` keyed by url, with a short timeout for invalid urls
+        """
+        for valid, timeout in ((True, self.ttl), (False, self.negative_ttl)):
+            entries = {key: valid for key, result in results.items() if result is valid}
+            if entries:
+                self.cache.set_many(entries, timeout=timeout)
+
+    def check(self, url: str) -> bool:
+        """
+        Check `url` returns 200 within the timeout budget,
+        answering from the cache when possible
+        """
+        return self.check_many([url])[url]
+
+    def check_many(self, urls) -> dict[str, bool]:
+        """
+        Check distinct `urls` concurrently and return validity of each url.
+        Urls normalizing to the same url are checked once.
+        A url failing to be checked is invalid, without failing other urls.
+        """
+        urls = list(dict.fromkeys(urls))
+        if self.cache is None:
+            return dict(zip(urls, self.executor.map(self.fetch, urls)))
+
+        keys, uncached = {}, []
+        for url in urls:
+            try:
+                keys[url] = self.cache_key(url)
+            except Exception:
+                uncached.append(url)
+
+        results = self.cache.get_many(set(keys.values()))
+
+        # one url per uncached key is fetched
+        missing = {key: url for url, key in keys.items() if key not in results}
+        fetched = dict(zip(missing, self.executor.map(self.fetch, missing.values())))
+        self.store(fetched)
+        results.update(fetched)
+
+        results.update(zip(uncached, self.executor.map(self.fetch, uncached)))
+
+        return {url: results[keys.get(url, url)] for url in urls}
+
+
+url_checker = UrlChecker(
+    timeout=settings.URL_CHECK_TIMEOUT,
+    max_workers=settings.URL_CHECK_WORKERS,
+    cache=caches["url_checks"],
+    ttl=settings.URL_CHECK_CACHE_TIMEOUT,
+    negative_ttl=settings.URL_CHECK_NEGATIVE_CACHE_TIMEOUT,
+)
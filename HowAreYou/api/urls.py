@@ -3,23 +3,69 @@ Api endpoint urls
 """
 
 from django.urls import path
-from . import views
+from . import async_views, views
 
 urlpatterns = [
     path("resources", views.GetResourceView.as_view(), name="get-resources"),
     path(
         "resources/create", views.CreateResourceView.as_view(), name="create-resources"
     ),
+    path(
+        "resources/bulk",
+        views.BulkCreateResourceView.as_view(),
+        name="bulk-create-resources",
+    ),
     path("students", views.GetStudentView.as_view(), name="get-students"),
     path("students/create", views.CreateStudentView.as_view(), name="create-students"),
+    path(
+        "students/bulk",
+        views.BulkCreateStudentView.as_view(),
+        name="bulk-create-students",
+    ),
     path(
         "students/stats",
         views.GetStudentStatisticsView.as_view(),
         name="get-student-statistics",
     ),
+    path(
+        "students/stats/items",
+        views.GetStudentItemStatisticsView.as_view(),
+        name="get-student-item-statistics",
+    ),
+    path(
+        "students/stats/analytics",
+        views.GetStudentAnalyticsView.as_view(),
+        name="get-student-analytics",
+    ),
+    path(
+        "students/stats/trends",
+        views.GetStudentTrendsView.as_view(),
+        name="get-student-trends",
+    ),
     path(
         "students/delete/<str:student_id>",
         views.DeleteStudentView.as_view(),
         name="delete-student",
     ),
+    # async (ASGI) views
+    path(
+        "async/resources",
+        async_views.AsyncGetResourceView.as_view(),
+        name="async-get-resources",
+    ),
+    path(
+        "async/students",
+        async_views.AsyncGetStudentView.as_view(),
+        name="async-get-students",
+    ),
+    path(
+        "async/students/create",
+        async_views.AsyncCreateStudentView.as_view(),
+        name="async-create-students",
+    ),
+    path(
+        "async/students/stats",
+        async_views.AsyncGetStudentStatisticsView.as_view(),
+        name="async-get-student-statistics",
+    ),
 ]
@@ -0,0 +1,132 @@
+"""
+Background verification of resource urls
+"""
+
+import logging
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .models import Resource
+from .resource_pool import resource_pool
+from .url_checker import url_checker
+
+logger = logging.getLogger(__name__)
+
+
+def verify_resources(resources: list[tuple]) -> dict[str, int]:
+    """
+    Check urls of (id, url) `resources` concurrently and mark every
+    resource verified or broken with one update per status
+    """
+    valid = url_checker.check_many(url for _, url in resources)
+    verified = [id for id, url in resources if valid[url]]
+    broken = [id for id, url in resources if not valid[url]]
+    now = timezone.now()
+
+    with transaction.atomic():
+        Resource.objects.filter(id__in=verified).update(
+            status=Resource.VERIFIED, checked_at_utc=now
+        )
+        Resource.objects.filter(id__in=broken).update(
+            status=Resource.BROKEN, checked_at_utc=now
+        )
+        resource_pool.invalidate_on_commit()
+
+    return {"verified": len(verified), "broken": len(broken)}
+
+
+def verify_pending_resources(batch_size: int) -> dict[str, int]:
+    """
+    Verify every pending resource, `batch_size` resources at a time
+    """
+    totals = {"verified": 0, "broken": 0}
+    last_id = 0
+
+    while batch := list(
+        Resource.objects.filter(status=Resource.PENDING, id__gt=last_id)
+        .order_by("id")
+        .values_list("id", "url")[:batch_size]
+    ):
+        for status, count in verify_resources(batch).items():
+            totals[status] += count
+        last_id = batch[-1][0]
+
+    return totals
+
+
+class VerificationWorker:
+    """
+    Daemon thread verifying resources created in this process.
+
+    Queued resources are verified in batches of up to `batch_size`,
+    waiting at most `linger` seconds for a batch to fill.
+    Resources left pending by a stopped process are picked up
+    by the `verify_resources` command.
+    """
+
+    def __init__(self, batch_size: int, linger: float):
+        self.batch_size = batch_size
+        self.linger = linger
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.thread: threading.Thread | None = None
+
+    def enqueue(self, id: int, url: str) -> None:
+        """
+        Queue resource for verification, starting the worker if needed
+        """
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(
+                    target=self.run, name="resource-verification", daemon=True
+                )
+                self.thread.start()
+
+        self.queue.put((id, url))
+
+    def enqueue_on_commit(self, id: int, url: str) -> None:
+        """
+        Queue resource once the transaction creating it commits
+        """
+        transaction.on_commit(lambda: self.enqueue(id, url))
+
+    def next_batch(self) -> list[tuple]:
+        """
+        Block until a resource is queued, then collect a batch
+        """
+        batch = [self.queue.get()]
+        deadline = time.monotonic() + self.linger
+
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def run(self) -> None:
+        while True:
+            batch = self.next_batch()
+            try:
+                verify_resources(batch)
+            except Exception:
+                logger.exception("failed to verify %d resource(s)", len(batch))
+            finally:
+                close_old_connections()
+                for _ in batch:
+                    self.queue.task_done()
+
+
+verification_worker = VerificationWorker(
+    batch_size=settings.RESOURCE_VERIFICATION_BATCH_SIZE,
+    linger=settings.RESOURCE_VERIFICATION_LINGER,
+)
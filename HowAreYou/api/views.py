@@ -4,7 +4,12 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.parsers import JSONParser
 from django.http import JsonResponse
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from urllib.parse import urlencode
 
 # swagger
 from drf_spectacular.utils import extend_schema, OpenApiParameter
@@ -18,12 +23,39 @@ from .serializers import (
     GetStudentResponseModelSerializer,
     CreateStudentRequestBodySerializer,
     StudentDeleteSerializer,
+    GetStudentStatisticsParamSerializer,
+    GetStudentTrendsParamSerializer,
 )
 
 # models
-from .models import Resource, Student, StudentResponse
+from .models import (
+    Resource,
+    Student,
+    StudentResponse,
+    StudentStatisticsRollup,
+    StudentDailyStatistics,
+)
 
-from random import randint
+# statistics
+from .statistics import (
+    aggregate_item_statistics,
+    aggregate_statistics,
+    aggregate_trends,
+    cohort_filters,
+    format_statistics,
+)
+from .resource_import import ResourceCSVParser
+from .rollups import record_responses
+from .snapshot import compute_analytics, response_snapshot
+from .pagination import CreatedAtCursorPagination
+from .resource_pool import resource_pool
+from .cache import (
+    bump_statistics_generation,
+    etag_matches,
+    get_cached_statistics,
+    get_statistics_generation,
+    statistics_etag,
+)
 
 #  ----------- Resource ------------ #
 
@@ -66,7 +98,7 @@ class GetResourceView(APIView):
     @extend_schema(
         request=GetResourceParamSerializer,
         methods=["GET"],
-        description="Return a list of all resources. Accept optional `type` parameter, values: [`video`, `article`]",
+        description="Return a list of all verified resources. Accept optional `type` parameter, values: [`video`, `article`]",
         parameters=[
             OpenApiParameter(name="type", description="Filter by type", required=False)
         ],
@@ -108,7 +140,9 @@ class GetResourceView(APIView):
         # Check value passed to 'type' field is either 'article' or 'video'
         if resourceParamSerializer.is_valid():
             try:
-                resources = Resource.objects.all().order_by("-created_at_utc")
+                resources = Resource.objects.filter(status=Resource.VERIFIED).order_by(
+                    "-created_at_utc"
+                )
                 acceptable_param = request.query_params.get("type")
 
                 if acceptable_param:
@@ -135,15 +169,24 @@ class GetResourceView(APIView):
 @extend_schema(request=CreateResourceRequestBodySerializer, methods=["POST"])
 class CreateResourceView(APIView):
     """
-    Create new resource
+    Create new resource.
+
+    The resource is created `pending` and its url is verified in the background.
+    Only `verified` resources are listed and recommended.
     """
 
     def validate_postResourcesValidParams(self, data: dict):
         """
         Validate that accepted optional parameter.
-        Fail if any thing other than 'type', 'url', 'csrfmiddlewaretoken'  is used.
+        Fail if any thing other than 'type', 'url', 'severities', 'weight', 'csrfmiddlewaretoken'  is used.
         """
-        ACCEPTABLE_PARAMS = ["type", "url", "csrfmiddlewaretoken"]
+        ACCEPTABLE_PARAMS = [
+            "type",
+            "url",
+            "severities",
+            "weight",
+            "csrfmiddlewaretoken",
+        ]
         provided_param_keys: list[str] = list(data.keys())
         unacceptable_params = []
 
@@ -189,11 +232,89 @@ class CreateResourceView(APIView):
             )
 
 
+@extend_schema(
+    request=CreateResourceRequestBodySerializer(many=True),
+    methods=["POST"],
+    description=f"Create resources from a json list or csv of up to {settings.RESOURCE_BULK_MAX_ITEMS} resources. Urls repeated in the list or already in db are skipped, and urls of new resources are checked before they are created `verified` or `broken`. A status or errors is returned for every resource",
+)
+class BulkCreateResourceView(APIView):
+    """
+    Create resources in bulk and return per-resource results.
+
+    Every resource has the body accepted by POST /api/v1/resources/create,
+    a csv has a header row naming these fields, with severities separated by `|`.
+    """
+
+    parser_classes = [JSONParser, ResourceCSVParser]
+
+    def get_results(self, serializer, statuses: list) -> list[dict]:
+        """
+        Return result of every resource, in the order submitted
+        """
+        results = []
+
+        for index, (resource_status, errors) in enumerate(
+            zip(statuses, serializer.item_errors)
+        ):
+            if resource_status is None:
+                results.append({"index": index, "errors": errors})
+            else:
+                results.append(
+                    {
+                        "index": index,
+                        "url": serializer.validated_data[index]["url"],
+                        "status": resource_status,
+                    }
+                )
+
+        return results
+
+    def post(self, request, format=None):
+        serializer = CreateResourceRequestBodySerializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=settings.RESOURCE_BULK_MAX_ITEMS,
+        )
+
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            statuses = serializer.save()
+        except Exception:
+            return Response(
+                "Something wrong happened. Please try again.",
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+        created = statuses.count(Resource.PENDING)
+        failed = statuses.count(None)
+
+        if created:
+            response_status = status.HTTP_201_CREATED
+        elif failed == len(statuses):
+            response_status = status.HTTP_400_BAD_REQUEST
+        else:
+            # every valid resource already exists
+            response_status = status.HTTP_200_OK
+
+        return Response(
+            {
+                "created": created,
+                "skipped": len(statuses) - created - failed,
+                "failed": failed,
+                "results": self.get_results(serializer, statuses),
+            },
+            status=response_status,
+        )
+
+
 #  ----------- Students ------------ #
 @extend_schema(
     request=GetStudentParamSerializer,
     methods=["GET"],
-    description="Return information and responses to questions of all students. Accept optional `gender`, `agegte`, `agelte` parameter",
+    description="Return information and responses to questions of all students. Accept optional `gender`, `agegte`, `agelte`, `page`, `cursor` parameter",
     parameters=[
         OpenApiParameter(
             name="gender",
@@ -210,6 +331,11 @@ class CreateResourceView(APIView):
             description="Must be between 12(inclusive) and 24(inclusive). `agegte` must be lesser or equal to `agelte`",
             required=False,
         ),
+        OpenApiParameter(
+            name="cursor",
+            description="Paginate with cursors instead of page numbers. Pass an empty value for the first page, then follow `links.next` and `links.previous`. Cannot be used with `page`",
+            required=False,
+        ),
     ],
 )
 class GetStudentView(APIView, PageNumberPagination):
@@ -217,12 +343,29 @@ class GetStudentView(APIView, PageNumberPagination):
     View to get student and response
     """
 
+    serialized_fields = [
+        "q1_resp",
+        "q2_resp",
+        "q3_resp",
+        "q4_resp",
+        "q5_resp",
+        "q6_resp",
+        "q7_resp",
+        "q8_resp",
+        "q9_resp",
+        "score",
+        "created_at_utc",
+        "student__id",
+        "student__age",
+        "student__gender",
+    ]
+
     def validate_getStudentsAllowedParams(self, queryDict):
         """
-        validate allowed optional params are in ['agelte', 'agegte', 'gender', 'page']
+        validate allowed optional params are in ['agelte', 'agegte', 'gender', 'page', 'cursor']
         """
         unacceptable_params = []
-        allowed_params = ["agelte", "agegte", "gender", "page"]
+        allowed_params = ["agelte", "agegte", "gender", "page", "cursor"]
         params = queryDict.keys()
 
         for p in params:
@@ -245,48 +388,48 @@ class GetStudentView(APIView, PageNumberPagination):
             and "gender" in validated_data
         ):
             filtered = studentResponses.filter(
-                student__age__gte=validated_data["agegte"],
-                student__age__lte=validated_data["agelte"],
-                student__gender=validated_data["gender"],
+                age__gte=validated_data["agegte"],
+                age__lte=validated_data["agelte"],
+                gender=validated_data["gender"],
             )
 
         ## if agelt, agegt are present
         elif "agelte" in validated_data and "agegte" in validated_data:
             filtered = studentResponses.filter(
-                student__age__gte=validated_data["agegte"],
-                student__age__lte=validated_data["agelte"],
+                age__gte=validated_data["agegte"],
+                age__lte=validated_data["agelte"],
             )
 
         ## if agelt, gender are present
         elif "agelte" in validated_data and "gender" in validated_data:
             filtered = studentResponses.filter(
-                student__gender=validated_data["gender"],
-                student__age__lte=validated_data["agelte"],
+                gender=validated_data["gender"],
+                age__lte=validated_data["agelte"],
             )
 
         ## if agegt, gender are present
         elif "agegte" in validated_data and "gender" in validated_data:
             filtered = studentResponses.filter(
-                student__gender=validated_data["gender"],
-                student__age__gte=validated_data["agegte"],
+                gender=validated_data["gender"],
+                age__gte=validated_data["agegte"],
             )
 
         ## if only agelt is present
         elif "agelte" in validated_data:
             filtered = studentResponses.filter(
-                student__age__lte=validated_data["agelte"],
+                age__lte=validated_data["agelte"],
             )
 
         ## if only agegt is present
         elif "agegte" in validated_data:
             filtered = studentResponses.filter(
-                student__age__gte=validated_data["agegte"],
+                age__gte=validated_data["agegte"],
             )
 
         ## if only gender is present
         elif "gender" in validated_data:
             filtered = studentResponses.filter(
-                student__gender=validated_data["gender"],
+                gender=validated_data["gender"],
             )
 
         return filtered
@@ -294,8 +437,9 @@ class GetStudentView(APIView, PageNumberPagination):
     def get(self, request, format=None):
         """
         Get student and student response records.
-        Allowed optional parameters: [age_gte, age_lte, gender, page]
+        Allowed optional parameters: [age_gte, age_lte, gender, page, cursor]
         Eg: http://127.0.0.1:8000/api/v1/students?agegte=14&agelte=14&gender=m&page=2
+        Eg: http://127.0.0.1:8000/api/v1/students?agegte=14&cursor=
         """
         # 1. validate query params is in [age_gt, age_lt, gender]
         query_params = request.query_params
@@ -312,6 +456,12 @@ class GetStudentView(APIView, PageNumberPagination):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        elif "page" in query_params and "cursor" in query_params:
+            return Response(
+                {"error": "You have passed in both 'page' and 'cursor' parameter"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
         else:
 
             getstudentParamSerializer = GetStudentParamSerializer(data=query_params)
@@ -319,29 +469,36 @@ class GetStudentView(APIView, PageNumberPagination):
             if getstudentParamSerializer.is_valid():
                 validated_data = getstudentParamSerializer.validated_data
 
-                studentResponses = StudentResponse.objects.all()
-                ordered_studentResponses = studentResponses.order_by("-created_at_utc")
+                # join students and only load serialized columns
+                studentResponses = StudentResponse.objects.select_related(
+                    "student"
+                ).only(*self.serialized_fields)
+                ordered_studentResponses = studentResponses.order_by(
+                    "-created_at_utc", "-id"
+                )
 
-                # if no param is passed in
-                # or if 'page' is the only param
+                # if no filter param is passed in
                 # return unfiltered responses
-                if len(query_params.keys()) == 0 or (
-                    len(query_params.keys()) == 1 and "page" in query_params.keys()
-                ):
-                    results = self.paginate_queryset(
-                        ordered_studentResponses, request, view=self
-                    )
+                if not any(p in query_params for p in ["agelte", "agegte", "gender"]):
+                    paginated_studentResponses = ordered_studentResponses
 
-                # if any one of accepted param is passed in
+                # if any one of accepted filter param is passed in
                 # return filtered responses
-                elif len(query_params.keys()) > 0:
-                    filtered_studentResponses = self.return_filtered_data(
+                else:
+                    paginated_studentResponses = self.return_filtered_data(
                         validated_data, ordered_studentResponses
                     )
 
-                    results = self.paginate_queryset(
-                        filtered_studentResponses, request, view=self
-                    )
+                # 'cursor' param selects keyset pagination,
+                # otherwise paginate by page number
+                if "cursor" in query_params:
+                    paginator = CreatedAtCursorPagination()
+                else:
+                    paginator = self
+
+                results = paginator.paginate_queryset(
+                    paginated_studentResponses, request, view=self
+                )
 
                 serializer = GetStudentResponseModelSerializer(results, many=True)
 
@@ -349,8 +506,8 @@ class GetStudentView(APIView, PageNumberPagination):
                     {
                         "data": serializer.data,
                         "links": {
-                            "next": self.get_next_link(),
-                            "previous": self.get_previous_link(),
+                            "next": paginator.get_next_link(),
+                            "previous": paginator.get_previous_link(),
                         },
                     },
                     status=status.HTTP_200_OK,
@@ -388,9 +545,7 @@ class CreateStudentView(APIView):
 
     """
 
-    def get_message(self, score: int) -> dict[str, str]:
-        resources: list[str] = []
-
+    def get_score_message(self, score: int) -> str:
         if score >= 20:
             message = "Thanks for sharing what you are feeling. Given your current emotional state, we would ask that you seek immediate help"
 
@@ -406,18 +561,13 @@ class CreateStudentView(APIView):
         if score <= 4:
             message = "Thanks for sharing what you are feeling. You seem to be coping well. Remember to take time to relax during the day."
 
-        num_resource = len(Resource.objects.all())
-        resource_ids = Resource.objects.values_list("id", flat=True)
-        for i in range(3):
-            random_index = randint(0, num_resource - 1)
-            random_resource_id = resource_ids[random_index]
+        return message
 
-            random_url = Resource.objects.get(pk=random_resource_id).url
-            random_type = Resource.objects.get(pk=random_resource_id).type
-            resources.append({"url": random_url, "type": random_type})
+    def get_message(self, score: int) -> dict[str, str]:
+        resources = resource_pool.recommend(score, 3)
 
         return {
-            "message": message,
+            "message": self.get_score_message(score),
             "resources": resources,
         }
 
@@ -429,11 +579,11 @@ class CreateStudentView(APIView):
         if studentRequestBodySerializer.is_valid():
 
             try:
-                studentRequestBodySerializer.save()
-
-                score = studentRequestBodySerializer.data["score"]
+                # student, response and rollups are written in one transaction
+                created_studentResponse = studentRequestBodySerializer.save()
+                bump_statistics_generation()
 
-                message = self.get_message(score)
+                message = self.get_message(created_studentResponse.score)
 
                 return Response(
                     {
@@ -454,9 +604,114 @@ class CreateStudentView(APIView):
             )
 
 
+@extend_schema(
+    request=CreateStudentRequestBodySerializer(many=True),
+    methods=["POST"],
+    description=f"Create students from a list of up to {settings.STUDENT_BULK_MAX_ITEMS} submissions. Valid submissions are created in a single transaction, and a result or errors is returned for every submission",
+)
+class BulkCreateStudentView(APIView):
+    """
+    Create students in bulk, evaluate responses to questions, and return per-submission results.
+
+    Every submission has the body accepted by POST /api/v1/students/create.
+    Resources are not recommended for bulk submissions.
+    """
+
+    def get_results(self, serializer, studentResponses: list) -> list[dict]:
+        """
+        Return result of every submission, in the order submitted
+        """
+        results = []
+
+        for index, (studentResponse, errors) in enumerate(
+            zip(studentResponses, serializer.item_errors)
+        ):
+            if studentResponse is None:
+                results.append({"index": index, "errors": errors})
+            else:
+                results.append(
+                    {
+                        "index": index,
+                        "id": str(studentResponse.student.id),
+                        "score": studentResponse.score,
+                        "created_at_utc": studentResponse.created_at_utc,
+                    }
+                )
+
+        return results
+
+    def post(self, request, format=None):
+        serializer = CreateStudentRequestBodySerializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=settings.STUDENT_BULK_MAX_ITEMS,
+        )
+
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            studentResponses = serializer.save()
+        except Exception:
+            return Response(
+                "Something wrong happened. Please try again.",
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+        created = sum(s is not None for s in studentResponses)
+        if created:
+            bump_statistics_generation()
+
+        return Response(
+            {
+                "created": created,
+                "failed": len(studentResponses) - created,
+                "results": self.get_results(serializer, studentResponses),
+            },
+            status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST,
+        )
+
+
+# optional cohort parameters accepted by statistics endpoints
+STATISTICS_COHORT_PARAMETERS = [
+    OpenApiParameter(
+        name="gender",
+        description="Filter by gender. Accepted values: [`m`, `f`, `o`]",
+        required=False,
+    ),
+    OpenApiParameter(
+        name="agelte",
+        description="Must be between 12(inclusive) and 24(inclusive). `agelte` must be greater or equal to `agegte`",
+        required=False,
+    ),
+    OpenApiParameter(
+        name="agegte",
+        description="Must be between 12(inclusive) and 24(inclusive). `agegte` must be lesser or equal to `agelte`",
+        required=False,
+    ),
+    OpenApiParameter(
+        name="createdgte",
+        description="Only count responses created at or after this ISO 8601 datetime",
+        required=False,
+    ),
+    OpenApiParameter(
+        name="createdlte",
+        description="Only count responses created at or before this ISO 8601 datetime",
+        required=False,
+    ),
+]
+
+
+@extend_schema(
+    request=GetStudentStatisticsParamSerializer,
+    methods=["GET"],
+    parameters=STATISTICS_COHORT_PARAMETERS,
+)
 class GetStudentStatisticsView(APIView):
     """
     Generate statistics of the range of depression among students and return statistics.
+    Accept optional `gender`, `agegte`, `agelte`, `createdgte`, `createdlte` parameter
 
     <h3>Depression Score interpretation (PHQ-9):</h3>
 
@@ -471,53 +726,238 @@ class GetStudentStatisticsView(APIView):
     Severe: 20 - 27
     """
 
+    def validate_getStudentStatisticsAllowedParams(self, queryDict):
+        """
+        validate allowed optional params are in ['agelte', 'agegte', 'gender', 'createdgte', 'createdlte']
+        """
+        allowed_params = ["agelte", "agegte", "gender", "createdgte", "createdlte"]
+        unacceptable_params = [p for p in queryDict.keys() if p not in allowed_params]
+
+        if len(unacceptable_params) > 0:
+            return False, unacceptable_params
+
+        return True, None
+
+    statistics_name = "depression"
+
+    def compute_statistics(self, validated_data: dict) -> dict:
+        """
+        Build statistics payload for the requested cohort.
+
+        Age and gender cohorts are served from the rollup table,
+        date windows are aggregated from the responses table.
+        """
+        if "createdgte" in validated_data or "createdlte" in validated_data:
+            rows = aggregate_statistics(
+                StudentResponse.objects.filter(**cohort_filters(validated_data))
+            )
+        else:
+            rows = StudentStatisticsRollup.objects.filter(
+                count__gt=0, **cohort_filters(validated_data)
+            ).values_list("severity", "gender", "count")
+
+        return format_statistics(rows)
+
     def get(self, request, format=None):
-        categories = {
-            "None - Minimal": {},
-            "Mild": {},
-            "Moderate": {},
-            "Moderately Severe": {},
-            "Severe": {},
+        query_params = request.query_params
+
+        isParamValid, unaccepted_params = (
+            self.validate_getStudentStatisticsAllowedParams(query_params)
+        )
+
+        if not isParamValid:
+            return Response(
+                {
+                    "error": f"You have passed in invalid parameter: ({', '.join(unaccepted_params)})"
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        statisticsParamSerializer = GetStudentStatisticsParamSerializer(
+            data=query_params
+        )
+
+        if not statisticsParamSerializer.is_valid():
+            return Response(
+                statisticsParamSerializer.errors, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        validated_data = statisticsParamSerializer.validated_data
+        cache_name = f"{self.statistics_name}?" + urlencode(
+            sorted((k, str(v)) for k, v in validated_data.items())
+        )
+
+        generation = get_statistics_generation()
+        etag = statistics_etag(self.statistics_name, generation)
+
+        if etag_matches(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        statistics_output = get_cached_statistics(
+            cache_name, generation, lambda: self.compute_statistics(validated_data)
+        )
+
+        return Response(
+            statistics_output, status=status.HTTP_200_OK, headers={"ETag": etag}
+        )
+
+
+@extend_schema(
+    request=GetStudentStatisticsParamSerializer,
+    methods=["GET"],
+    parameters=STATISTICS_COHORT_PARAMETERS,
+)
+class GetStudentItemStatisticsView(GetStudentStatisticsView):
+    """
+    Generate item analysis of the answers to each PHQ-9 question and return statistics.
+    Accept optional `gender`, `agegte`, `agelte`, `createdgte`, `createdlte` parameter
+
+    For each question, return number of students answering 0, 1, 2 and 3,
+    and the mean and variance of the answers.
+    Also return the share of students answering Q9 (thoughts of self-harm) above 0.
+
+    <h3>Answer values:</h3>
+
+    0: Not at all
+
+    1: Several days
+
+    2: More than half the days
+
+    3: Nearly every day
+    """
+
+    statistics_name = "items"
+
+    def compute_statistics(self, validated_data: dict) -> dict:
+        """
+        Build item analysis payload for the requested cohort in a single query
+        """
+        return aggregate_item_statistics(
+            StudentResponse.objects.filter(**cohort_filters(validated_data))
+        )
+
+
+@extend_schema(
+    request=GetStudentStatisticsParamSerializer,
+    methods=["GET"],
+    parameters=STATISTICS_COHORT_PARAMETERS,
+)
+class GetStudentAnalyticsView(GetStudentStatisticsView):
+    """
+    Generate analytics of the responses and return statistics.
+    Accept optional `gender`, `agegte`, `agelte`, `createdgte`, `createdlte` parameter
+
+    Return correlation matrix between the answers to the 9 PHQ-9 questions,
+    PHQ-9 score percentiles (10, 25, 50, 75, 90),
+    and number of students per age, gender and severity.
+    """
+
+    statistics_name = "analytics"
+    percentiles = [10, 25, 50, 75, 90]
+
+    def compute_statistics(self, validated_data: dict) -> dict:
+        """
+        Build analytics payload for the requested cohort from the columnar snapshot
+        """
+        response_snapshot.refresh()
+        return compute_analytics(response_snapshot, validated_data, self.percentiles)
+
+
+@extend_schema(
+    request=GetStudentTrendsParamSerializer,
+    methods=["GET"],
+    parameters=[
+        OpenApiParameter(
+            name="granularity",
+            description="Period of each trend point. Accepted values: [`day`, `week`, `month`]. Default: `day`",
+            required=False,
+        ),
+        OpenApiParameter(
+            name="createdgte",
+            description="Only count responses created on or after this date (YYYY-MM-DD)",
+            required=False,
+        ),
+        OpenApiParameter(
+            name="createdlte",
+            description="Only count responses created on or before this date (YYYY-MM-DD)",
+            required=False,
+        ),
+    ],
+)
+class GetStudentTrendsView(APIView):
+    """
+    Generate depression severity trends over time.
+    Return number of responses, mean PHQ-9 score and count per severity for every day, week or month.
+    Weeks start on Monday. Accept optional `granularity`, `createdgte`, `createdlte` parameter
+    """
+
+    def validate_getStudentTrendsAllowedParams(self, queryDict):
+        """
+        validate allowed optional params are in ['granularity', 'createdgte', 'createdlte']
+        """
+        allowed_params = ["granularity", "createdgte", "createdlte"]
+        unacceptable_params = [p for p in queryDict.keys() if p not in allowed_params]
+
+        if len(unacceptable_params) > 0:
+            return False, unacceptable_params
+
+        return True, None
+
+    def compute_trends(self, validated_data: dict) -> dict:
+        """
+        Build trends payload by rolling up daily statistics buckets
+        """
+        dailyStatistics = StudentDailyStatistics.objects.filter(
+            **cohort_filters(validated_data, created_field="date")
+        )
+
+        return {
+            "category": "depression",
+            "granularity": validated_data["granularity"],
+            "trends": aggregate_trends(dailyStatistics, validated_data["granularity"]),
         }
 
-        gender_mapping = {"m": "Male", "f": "Female", "o": "Others"}
+    def get(self, request, format=None):
+        query_params = request.query_params
 
-        for o in StudentResponse.objects.all():
-            gender = o.student.gender  # m, f, o
-            score = o.score
-            if score >= 20:
-                if gender_mapping[gender] not in categories["Severe"]:
-                    categories["Severe"][gender_mapping[gender]] = 1
-                else:
-                    categories["Severe"][gender_mapping[gender]] += 1
+        isParamValid, unaccepted_params = self.validate_getStudentTrendsAllowedParams(
+            query_params
+        )
 
-            if score >= 15 and score <= 19:
-                if gender_mapping[gender] not in categories["Moderately Severe"]:
-                    categories["Moderately Severe"][gender_mapping[gender]] = 1
-                else:
-                    categories["Moderately Severe"][gender_mapping[gender]] += 1
+        if not isParamValid:
+            return Response(
+                {
+                    "error": f"You have passed in invalid parameter: ({', '.join(unaccepted_params)})"
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-            if score >= 10 and score <= 14:
-                if gender_mapping[gender] not in categories["Moderate"]:
-                    categories["Moderate"][gender_mapping[gender]] = 1
-                else:
-                    categories["Moderate"][gender_mapping[gender]] += 1
+        trendsParamSerializer = GetStudentTrendsParamSerializer(data=query_params)
 
-            if score >= 5 and score <= 9:
-                if gender_mapping[gender] not in categories["Mild"]:
-                    categories["Mild"][gender_mapping[gender]] = 1
-                else:
-                    categories["Mild"][gender_mapping[gender]] += 1
+        if not trendsParamSerializer.is_valid():
+            return Response(
+                trendsParamSerializer.errors, status=status.HTTP_400_BAD_REQUEST
+            )
 
-            if score <= 4:
-                if gender_mapping[gender] not in categories["None - Minimal"]:
-                    categories["None - Minimal"][gender_mapping[gender]] = 1
-                else:
-                    categories["None - Minimal"][gender_mapping[gender]] += 1
+        validated_data = trendsParamSerializer.validated_data
+        cache_name = "trends?" + urlencode(
+            sorted((k, str(v)) for k, v in validated_data.items())
+        )
+
+        generation = get_statistics_generation()
+        etag = statistics_etag("trends", generation)
 
-        statistics_output = {"category": "depression", "statistics": [categories]}
+        if etag_matches(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
 
-        return Response(statistics_output, status=status.HTTP_200_OK)
+        trends_output = get_cached_statistics(
+            cache_name, generation, lambda: self.compute_trends(validated_data)
+        )
+
+        return Response(
+            trends_output, status=status.HTTP_200_OK, headers={"ETag": etag}
+        )
 
 
 class DeleteStudentView(APIView):
@@ -545,7 +985,25 @@ class DeleteStudentView(APIView):
 
             if student_id_exists:
                 try:
-                    Student.objects.get(pk=validated_student_id).delete()
+                    with transaction.atomic():
+                        student = Student.objects.get(pk=validated_student_id)
+                        responses = student.student.values_list(
+                            "score", "created_at_utc"
+                        )
+                        record_responses(
+                            [
+                                (
+                                    score,
+                                    student.gender,
+                                    student.age,
+                                    timezone.localdate(created_at_utc),
+                                )
+                                for score, created_at_utc in responses
+                            ],
+                            sign=-1,
+                        )
+                        student.delete()
+                    bump_statistics_generation()
                     return Response(None, status=status.HTTP_204_NO_CONTENT)
                 except Exception as e:
                     return Response(